@@ -0,0 +1,92 @@
+"""
+Microbenchmark of memory allocations per event routed through a three-level model tree.
+
+A fired event at a leaf model is wrapped in a request, scaled up to the root, scaled down back to the leaf,
+and disclosed back to the root. The list-based representation used before slotted elements is kept here
+as a reference.
+
+Usage: python benchmark/bench_elements.py [n_events]
+"""
+import sys
+import time
+import tracemalloc
+from complexism.element import Event, Request, Disclosure
+
+__author__ = 'TimeWz667'
+
+
+class ListEvent:
+    def __init__(self, td, ti, msg=None):
+        self.Time = ti
+        self.Todo = td
+        self.__message = msg if msg else str(td)
+
+    @property
+    def Message(self):
+        return self.__message
+
+
+class ListRequest:
+    def __init__(self, evt, who, where):
+        self.Who = who
+        self.Where = [where] if isinstance(where, str) else where
+        self.Event = evt
+
+    def up_scale(self, adr):
+        return ListRequest(self.Event, self.Who, self.Where + [adr])
+
+    def down_scale(self):
+        return self.Where[-1], ListRequest(self.Event, self.Who, self.Where[:-1])
+
+    def to_disclosure(self):
+        return ListDisclosure(self.Event.Message, self.Who, self.Where)
+
+
+class ListDisclosure:
+    def __init__(self, what, who, where, **kwargs):
+        self.What = str(what)
+        self.Who = who
+        self.Where = [where] if isinstance(where, str) else where
+        self.Arguments = dict(kwargs)
+
+    def up_scale(self, adr):
+        return ListDisclosure(self.What, self.Who, self.Where + [adr], **self.Arguments)
+
+    def down_scale(self):
+        return self.Where[-1], ListDisclosure(self.What, self.Who, self.Where[:-1], **self.Arguments)
+
+
+def route(n, event, request):
+    kept = list()
+    for i in range(n):
+        req = request(event('Step', i), 'Ag{}'.format(i % 100), 'Leaf')
+        req = req.up_scale('Mid').up_scale('Root')
+        _, req = req.down_scale()
+        _, req = req.down_scale()
+        dis = req.to_disclosure().up_scale('Mid').up_scale('Root')
+        kept.append(dis)
+    return kept
+
+
+def measure(n, event, request):
+    route(10, event, request)
+    t0 = time.perf_counter()
+    route(n, event, request)
+    dt = time.perf_counter() - t0
+
+    tracemalloc.start()
+    kept = route(n, event, request)
+    size, _ = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(st.count for st in snapshot.statistics('filename'))
+    del kept
+    return dt, blocks / n, size / n
+
+
+if __name__ == '__main__':
+    n_events = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print('{:<10}{:>12}{:>18}{:>16}'.format('Elements', 'Time (s)', 'Live blocks/evt', 'Bytes/evt'))
+    for name, evt, req in [('list', ListEvent, ListRequest), ('slotted', Event, Request)]:
+        res = measure(n_events, evt, req)
+        print('{:<10}{:>12.3f}{:>18.2f}{:>16.1f}'.format(name, *res))
@@ -8,5 +8,6 @@ from complexism.multimodel import *
 from .fn import *
 from .director import *
 from .fitter import *
+from .ensemble import *
 
 __author__ = 'TimeWz667'
@@ -1,3 +1,4 @@
+from .parameters import *
 from .agent import *
 from .be import *
 from .pop import *
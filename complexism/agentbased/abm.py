@@ -1,8 +1,9 @@
 from abc import ABCMeta, abstractmethod
-from collections import namedtuple, OrderedDict
-from complexism.misc.counter import count
+from collections import namedtuple, OrderedDict, Counter
+import numpy as np
+from complexism.misc.counter import count, tick
 from complexism.mcore import Observer, LeafModel
-from complexism.element import Request
+from complexism.element import Request, DefaultScheduler
 
 
 __author__ = 'TimeWz667'
@@ -11,16 +12,60 @@ __all__ = ['GenericAgentBasedModel', 'ObsABM', 'AgentBasedModel']
 Record = namedtuple('Record', ('Ag', 'Todo', 'Time'))
 
 
+def _summarise_attributes(ags):
+    """
+    Summarise attributes of agents; means of numeric attributes and counts of the others
+    :param ags: list of agents
+    :return: dict of attribute and summary
+    """
+    summary = dict()
+    for k in dict.fromkeys(k for ag in ags for k in ag.Attributes):
+        vs = [ag.Attributes[k] for ag in ags if k in ag.Attributes]
+        if all(isinstance(v, (int, float, np.number)) and not isinstance(v, (bool, np.bool_)) for v in vs):
+            summary[k] = float(np.mean(vs))
+        else:
+            try:
+                summary[k] = dict(Counter(vs))
+            except TypeError:
+                continue
+    return summary
+
+
 class ObsABM(Observer):
-    def __init__(self):
+    def __init__(self, keep_records=False):
         Observer.__init__(self)
         self.Events = list()
         self.Behaviours = list()
         self.Functions = list()
         self.Records = list()
+        self.KeepRecords = keep_records
+        self.FlowIndex = dict()
+        self.FlowCounts = list()
+
+    def keep_records(self, on=True):
+        """
+        Retain a record of every executed event between observations, which is off by default
+        :param on: True if records should be kept in Records
+        """
+        self.KeepRecords = on
+        self.Records.clear()
+
+    def _index_flow(self, todo):
+        if todo not in self.FlowIndex:
+            self.FlowIndex[todo] = len(self.FlowCounts)
+            self.FlowCounts.append(0)
+
+    def _count_flow(self, todo):
+        i = self.FlowIndex.get(todo)
+        return self.FlowCounts[i] if i is not None else 0
+
+    def _reset_flows(self):
+        self.FlowCounts = [0] * len(self.FlowCounts)
+        self.Records.clear()
 
     def add_observing_event(self, todo):
         self.Events.append(todo)
+        self._index_flow(todo)
 
     def add_observing_behaviour(self, beh):
         self.Behaviours.append(beh)
@@ -30,8 +75,8 @@ class ObsABM(Observer):
 
     def update_dynamic_observations(self, model, flow, ti):
         for todo in self.Events:
-            flow[todo] = sum([rec.Todo == todo for rec in self.Records])
-        self.Records.clear()
+            flow[todo] = self._count_flow(todo)
+        self._reset_flows()
 
     def read_statics(self, model, tab, ti):
         for be in self.Behaviours:
@@ -41,18 +86,33 @@ class ObsABM(Observer):
             func(model, tab, ti)
 
     def record(self, ag, evt, ti):
-        self.Records.append(Record(ag, evt, ti))
+        i = self.FlowIndex.get(evt)
+        if i is not None:
+            self.FlowCounts[i] += 1
+        if self.KeepRecords:
+            self.Records.append(Record(ag.Name, evt, ti))
 
 
 class GenericAgentBasedModel(LeafModel, metaclass=ABCMeta):
-    def __init__(self, name, pars, population, obs=None, y0_class=None):
+    def __init__(self, name, pars, population, obs=None, y0_class=None, scheduler=DefaultScheduler):
         obs = obs if obs else ObsABM()
-        LeafModel.__init__(self, name, pars=pars, obs=obs, y0_class=y0_class)
+        LeafModel.__init__(self, name, pars=pars, obs=obs, y0_class=y0_class, scheduler=scheduler)
         self.Population = population
+        self.Population.set_rng(self.RNG)
         self.Behaviours = OrderedDict()
 
+    def set_seed(self, seed=None):
+        ss = LeafModel.set_seed(self, seed)
+        self.Population.set_rng(self.RNG)
+        return ss
+
+    def name_of(self, who):
+        if isinstance(who, int):
+            return self.Population.Eve.name_of(who)
+        return who
+
     def add_observing_event(self, todo):
-        self.Observer.Events.append(todo)
+        self.Observer.add_observing_event(todo)
 
     def add_observing_behaviour(self, be):
         if be in self.Behaviours:
@@ -70,10 +130,9 @@ class GenericAgentBasedModel(LeafModel, metaclass=ABCMeta):
 
     def _make_agent(self, n, ti, **kwargs):
         ags = self.Population.add_agent(n, **kwargs)
-        for ag in ags:
-            self.Scheduler.add_atom(ag)
-            for be in self.Behaviours.values():
-                be.register(ag, ti)
+        self.Scheduler.add_atoms(ags)
+        for be in self.Behaviours.values():
+            be.register_many(ags, ti)
 
     def add_behaviour(self, be):
         self.Behaviours[be.Name] = be
@@ -89,8 +148,7 @@ class GenericAgentBasedModel(LeafModel, metaclass=ABCMeta):
         self.disclose('initialise', '*')
         for be in self.Behaviours.values():
             be.initialise(ti=ti, model=self)
-        for ag in self.Population.Agents.values():
-            ag.initialise(ti=ti, model=self)
+        self.Population.Eve.initialise_many(list(self.Population.Agents.values()), ti, self)
         self.Scheduler.reschedule_all()
 
     def reset(self, ti):
@@ -159,14 +217,68 @@ class GenericAgentBasedModel(LeafModel, metaclass=ABCMeta):
 
         return ags
 
+    def birth_many(self, n, ti, **kwargs):
+        """
+        Add agents in bulk. Behaviours register the new agents and respond to their entering once,
+        and the agents are scheduled together.
+        :param n: number of agents
+        :param ti: time
+        :param kwargs: status or attributes of new agents
+        :return: a list of new agents
+        """
+        ags = self.Population.add_agent(n, **kwargs)
+        if not ags:
+            return ags
+
+        bes = list(self.Behaviours.values())
+        for be in bes:
+            be.register_many(ags, ti)
+        enters = [be.check_enters(ags) for be in bes]
+        self.Population.Eve.initialise_many(ags, ti)
+        for be, chks in zip(bes, enters):
+            entries = [(ag, chk) for ag, chk in zip(ags, chks) if chk]
+            if entries:
+                be.impulse_enters(self, entries, ti)
+        self.Scheduler.add_scheduler_atoms(ags)
+
+        kwargs['n'] = len(ags)
+        self.disclose('add {} agents'.format(len(ags)), self.Name, **kwargs)
+        return ags
+
     def kill(self, i, ti, actor=None):
         ag = self.Population[i]
         bes = self.check_exit(ag)
         self.Scheduler.remove_atom(ag)
-        self.Population.remove_agent(i)
+        self.Population.remove_agent(i, ti)
         self.impulse_exit(bes, ag, ti)
         self.disclose('remove agent', who=actor if actor else self.Name, Name=ag.Name, **ag.Attributes)
 
+    def kill_many(self, ids, ti, actor=None):
+        """
+        Remove agents in bulk. Behaviours respond to their exiting once, and a disclosure summarises the removal.
+        :param ids: names of agents
+        :param ti: time
+        :param actor: source of the removal
+        :return: the removed agents
+        """
+        ags = [self.Population[i] for i in ids]
+        if not ags:
+            return ags
+
+        bes = list(self.Behaviours.values())
+        exits = [be.check_exits(ags) for be in bes]
+        self.Scheduler.remove_atoms(ags)
+        self.Population.remove_agents([ag.Id for ag in ags], ti)
+        for be, chks in zip(bes, exits):
+            entries = [(ag, chk) for ag, chk in zip(ags, chks) if chk]
+            if entries:
+                be.impulse_exits(self, entries, ti)
+
+        kw = _summarise_attributes(ags)
+        kw['n'] = len(ags)
+        self.disclose('remove {} agents'.format(len(ags)), who=actor if actor else self.Name, **kw)
+        return ags
+
     @count()
     def do_request(self, req: Request):
         nod, evt, time = req.Who, req.Event, req.When
@@ -179,7 +291,7 @@ class GenericAgentBasedModel(LeafModel, metaclass=ABCMeta):
                 ag = self.Population[nod]
                 ag.approve_event(evt)
                 pre = self.check_pre_change(ag)
-                self.Observer.record(ag.Name, evt.Todo, time)
+                self.Observer.record(ag, evt.Todo, time)
                 ag.execute_event()
                 ag.drop_next()
                 post = self.check_post_change(ag)
@@ -191,6 +303,46 @@ class GenericAgentBasedModel(LeafModel, metaclass=ABCMeta):
             except KeyError:
                 pass
 
+    def do_requests(self, requests):
+        """
+        Execute requests of the same time in a batch. Requests of behaviours are executed first, one by one;
+        events of agents are then executed together, and each behaviour responds to all the changes once.
+        :param requests: requests at the same time
+        """
+        ags, evts = list(), list()
+        for req in requests:
+            nod = req.Who
+            if nod in self.Behaviours:
+                self.do_request(req)
+            else:
+                try:
+                    ags.append(self.Population[nod])
+                    evts.append(req.Event)
+                except KeyError:
+                    pass
+        if not ags:
+            return
+
+        time = evts[0].Time
+        bes = list(self.Behaviours.values())
+        pres = [[be.check_pre_change(ag) for ag in ags] for be in bes]
+        for ag, evt in zip(ags, evts):
+            ag.approve_event(evt)
+            self.Observer.record(ag, evt.Todo, time)
+            ag.execute_event()
+            ag.drop_next()
+        tick(self.Name, n=len(ags))
+
+        posts = [[be.check_post_change(ag) for ag in ags] for be in bes]
+        changes = [[(ag, f, t) for ag, f, t in zip(ags, pre, post) if be.check_change(f, t)]
+                   for be, pre, post in zip(bes, pres, posts)]
+        for be, chs in zip(bes, changes):
+            if chs:
+                be.impulse_changes(self, chs, time)
+
+        for ag in ags:
+            ag.update_time(time)
+
     def shock(self, time, action, **values):
         try:
             be = self.Behaviours[action]
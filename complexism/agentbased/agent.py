@@ -1,5 +1,8 @@
-from complexism.misc import NameGenerator
+from collections import ChainMap
+from epidag.bayesnet.loci import ExoValueLoci
+from complexism.misc import NameGenerator, sample_loci
 from complexism.mcore import ModelAtom
+from .parameters import SharedParameterCore, AgentParameters
 from abc import ABCMeta, abstractmethod
 
 __author__ = 'TimeWz667'
@@ -8,7 +11,33 @@ __all__ = ['GenericAgent', 'GenericBreeder']
 
 class GenericAgent(ModelAtom, metaclass=ABCMeta):
     def __init__(self, name, pars=None):
+        """
+        :param name: name, or integer id of an agent named by its breeder
+        :param pars: parameters
+        """
+        self.Prefix = None
         ModelAtom.__init__(self, name, pars)
+        self.RNG = None
+        self.Indices = None
+
+    @property
+    def Id(self):
+        return self.__id
+
+    @property
+    def Name(self):
+        if self.Prefix is None:
+            return self.__id
+        return '{}{}'.format(self.Prefix, self.__id)
+
+    @Name.setter
+    def Name(self, name):
+        self.__id = name
+
+    def __setitem__(self, key, value):
+        if self.Indices is not None:
+            self.Indices.reassign(self, key, value)
+        self.Attributes[key] = value
 
     def __repr__(self):
         s = 'ID: {}, '.format(self.Name)
@@ -33,6 +62,33 @@ class GenericBreeder(metaclass=ABCMeta):
         self.GenName = NameGenerator(name, 1, 1)
         self.PCore = pc_parent.get_prototype(group)
         self.Exo = kwargs
+        self.RNG = None
+        self.Shared = None
+
+    def share_parameters(self, on=True, batch=0):
+        """
+        Breed agents on a parameter core built once, instead of a parameter core for each agent.
+        Agent-level random nodes are drawn when firstly used by an agent.
+        :param on: True if the parameter core is shared
+        :param batch: number of values of an agent-level random node drawn at once; drawn one by one if 0
+        """
+        if not on:
+            self.Shared = None
+            return
+        proto = self.PCore
+        if self.Exo and proto.Parent is not None:
+            proto = proto.Parent.get_prototype(self.Group, self.Exo)
+        self.Shared = SharedParameterCore(proto, self.Name, batch, rng=self.RNG)
+
+    def set_rng(self, rng):
+        """
+        Draw the parameters of new agents from a random number generator
+        :param rng: random number generator
+        :type rng: numpy.random.Generator
+        """
+        self.RNG = rng
+        if self.Shared is not None:
+            self.Shared.set_rng(rng)
 
     def breed(self, n=1, **kwargs):
         """
@@ -45,14 +101,88 @@ class GenericBreeder(metaclass=ABCMeta):
         sts, ats = self._filter_attributes(kwargs)
 
         ags = list()
-        for i in range(int(n)):
-            name = self.GenName.get_next()
-            pars = self.PCore.get_sibling(name, self.Exo)
-            ag = self._new_agent(name, pars, **sts)
+        for _ in range(int(n)):
+            i = self.GenName.get_next_index()
+            if self.Shared is None:
+                pars = self.PCore.get_sibling('{}{}'.format(self.Name, i), self._draw_exo())
+            else:
+                pars = AgentParameters(self.Shared, i)
+            ag = self._new_agent(i, pars, **sts)
+            ag.Prefix = self.Name
             ag.Attributes.update(ats)
+            ag.RNG = self.RNG
             ags.append(ag)
         return ags
 
+    def _draw_exo(self):
+        """
+        Draw the agent-level nodes of a new agent with the random number generator of the breeder
+        :return: exogenous variables of the parameter core of the agent
+        :rtype: dict
+        """
+        exo = dict(self.Exo)
+        sg = getattr(self.PCore, 'SG', None)
+        if self.RNG is None or sg is None:
+            return exo
+        pas = ChainMap(exo) if self.PCore.Parent is None else ChainMap(exo, self.PCore.Parent)
+        for loci in sg.FixedChain:
+            if not isinstance(loci, ExoValueLoci) and loci.Name not in exo:
+                exo[loci.Name] = sample_loci(loci, pas, self.RNG)
+        return exo
+
+    def attach(self, ag):
+        """
+        Called when an agent joins the population
+        :param ag: agent
+        """
+        pass
+
+    def detach(self, ag, ti=None):
+        """
+        Called when an agent leaves the population
+        :param ag: agent
+        :param ti: time of leaving, if known
+        """
+        pass
+
+    def find_id(self, name):
+        """
+        Id of an agent bred from its name
+        :param name: name of agent
+        :return: id
+        :rtype: int
+        """
+        return self.GenName.find_index(name)
+
+    def name_of(self, i):
+        """
+        Name of an agent bred from its id
+        :param i: id of agent
+        :return: name
+        :rtype: str
+        """
+        return '{}{}'.format(self.Name, i)
+
+    def initialise_many(self, ags, ti=0, model=None):
+        """
+        Initialise agents bred
+        :param ags: agents
+        :param ti: time
+        :param model: model where the agents live
+        """
+        for ag in ags:
+            ag.initialise(ti=ti, model=model)
+
+    def count_population(self, ags, **kwargs):
+        """
+        Count agents of the whole population
+        :param ags: all agents in the population
+        :param kwargs: criteria for selecting agents
+        :return: count number
+        :rtype: int
+        """
+        return self.count(ags, **kwargs)
+
     @abstractmethod
     def _filter_attributes(self, kw):
         """
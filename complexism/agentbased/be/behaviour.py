@@ -16,6 +16,15 @@ class AbsBehaviour(ModelAtom, metaclass=ABCMeta):
     def register(self, ag, ti):
         pass
 
+    def register_many(self, ags, ti):
+        """
+        Register agents added at the same time
+        :param ags: list of agents
+        :param ti: time
+        """
+        for ag in ags:
+            self.register(ag, ti)
+
     def check_event(self, ag, evt):
         return self.Trigger.check_event(ag, evt)
 
@@ -31,18 +40,54 @@ class AbsBehaviour(ModelAtom, metaclass=ABCMeta):
     def impulse_change(self, model, ag, ti, args_pre=None, args_post=None):
         pass
 
+    def impulse_changes(self, model, changes, ti):
+        """
+        Respond to changes of agents occurred at the same time
+        :param model: source model
+        :param changes: list of (agent, args_pre, args_post)
+        :param ti: time
+        """
+        for ag, f, t in changes:
+            self.impulse_change(model, ag, ti, f, t)
+
     def check_enter(self, ag):
         return self.Trigger.check_enter(ag)
 
+    def check_enters(self, ags):
+        return self.Trigger.check_enters(ags)
+
     def impulse_enter(self, model, ag, ti, args=None):
         pass
 
+    def impulse_enters(self, model, entries, ti):
+        """
+        Respond to agents entering at the same time
+        :param model: source model
+        :param entries: list of (agent, args)
+        :param ti: time
+        """
+        for ag, args in entries:
+            self.impulse_enter(model, ag, ti, args)
+
     def check_exit(self, ag):
         return self.Trigger.check_exit(ag)
 
+    def check_exits(self, ags):
+        return self.Trigger.check_exits(ags)
+
     def impulse_exit(self, model, ag, ti, args=None):
         pass
 
+    def impulse_exits(self, model, entries, ti):
+        """
+        Respond to agents leaving at the same time
+        :param model: source model
+        :param entries: list of (agent, args)
+        :param ti: time
+        """
+        for ag, args in entries:
+            self.impulse_exit(model, ag, ti, args)
+
     def fill(self, obs: dict, model, ti):
         pass
 
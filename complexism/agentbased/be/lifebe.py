@@ -1,5 +1,4 @@
 import numpy as np
-import numpy.random as rd
 from complexism.element import StepTicker, Event
 from complexism.agentbased import ActiveBehaviour, PassiveBehaviour
 from .trigger import AttributeEnterTrigger
@@ -25,7 +24,7 @@ class Reincarnation(PassiveBehaviour):
         pass
 
     def impulse_change(self, model, ag, ti, args_pre=None, args_post=None):
-        model.kill(ag.Name, ti)
+        model.kill(ag.Id, ti)
         model.birth(n=1, ti=ti, **self.Atr_birth)
         self.BirthN += 1
 
@@ -56,7 +55,7 @@ class Cohort(PassiveBehaviour):
         pass
 
     def impulse_change(self, model, ag, ti, args_pre=None, args_post=None):
-        model.kill(ag.Name, ti)
+        model.kill(ag.Id, ti)
         self.DeathN += 1
 
     def fill(self, obs, model, ti):
@@ -88,7 +87,7 @@ class LifeRate(ActiveBehaviour):
         if n <= 0:
             return
         prob = 1 - np.exp(-self.BirthRate * self.Dt)
-        n = rd.binomial(n, prob)
+        n = model.RNG.binomial(n, prob)
 
         self.BirthN += n
         model.birth(n=n, ti=ti, **self.Atr_birth)
@@ -97,7 +96,7 @@ class LifeRate(ActiveBehaviour):
         pass
 
     def impulse_change(self, model, ag, ti, args_pre=None, args_post=None):
-        model.kill(ag.Name, ti)
+        model.kill(ag.Id, ti)
 
     def fill(self, obs, model, ti):
         obs[self.Name] = self.BirthN
@@ -131,7 +130,7 @@ class LifeS(ActiveBehaviour):
         rate = self.Rate * (1 - n / self.Cap)
         prob = 1 - np.exp(-rate * self.Dt)
 
-        n = rd.binomial(n, prob)
+        n = model.RNG.binomial(n, prob)
 
         self.BirthN += n
         model.birth(n=n, ti=ti, **self.Atr_birth)
@@ -140,7 +139,7 @@ class LifeS(ActiveBehaviour):
         pass
 
     def impulse_change(self, model, ag, ti, args_pre=None, args_post=None):
-        model.kill(ag.Name, ti)
+        model.kill(ag.Id, ti)
 
     def fill(self, obs, model, ti):
         obs[self.Name] = self.BirthN
@@ -23,9 +23,15 @@ class Trigger:
     def check_enter(self, ag):
         return False
 
+    def check_enters(self, ags):
+        return [self.check_enter(ag) for ag in ags]
+
     def check_exit(self, ag):
         return False
 
+    def check_exits(self, ags):
+        return [self.check_exit(ag) for ag in ags]
+
 
 Trigger.NullTrigger = Trigger()
 
@@ -0,0 +1,140 @@
+from epidag.bayesnet.loci import DistributionLoci, ExoValueLoci
+from epidag.simulation.actor import Sampler
+from complexism.misc import sample_distribution, sample_loci
+
+__author__ = 'TimeWz667'
+__all__ = ['SharedParameterCore', 'AgentParameters']
+
+
+class SharedParameterCore:
+    def __init__(self, proto, prefix, batch=0, rng=None):
+        """
+        Parameters shared by the agents of a breeder. The nodes of the agent group which are (or depend on)
+        random variables are drawn for each agent when firstly accessed; the others are taken from the prototype.
+        :param proto: prototype parameter core of the agent group
+        :param prefix: prefix of names of agents
+        :param batch: number of values of a random node drawn at once for the agents; drawn one by one if 0
+        :param rng: random number generator, the global state used if None
+        """
+        self.Prototype = proto
+        self.Prefix = prefix
+        self.Batch = int(batch)
+        self.RNG = rng
+        self.Private = dict()
+        self.Buffers = dict()
+
+        chain = proto.SG.FixedChain if getattr(proto, 'SG', None) is not None else list()
+        for loci in chain:
+            if isinstance(loci, ExoValueLoci):
+                continue
+            if isinstance(loci, DistributionLoci) or any(pa in self.Private for pa in loci.Parents):
+                self.Private[loci.Name] = loci
+
+        if self.Batch > 1:
+            for k, loci in self.Private.items():
+                if isinstance(loci, DistributionLoci) and not any(pa in self.Private for pa in loci.Parents):
+                    self.Buffers[k] = [loci.get_distribution(proto), list()]
+
+    def set_rng(self, rng):
+        """
+        Draw agent-level nodes from a random number generator, discarding the values buffered
+        :param rng: random number generator
+        """
+        self.RNG = rng
+        for buf in self.Buffers.values():
+            buf[1] = list()
+
+    def __getitem__(self, item):
+        return self.Prototype[item]
+
+    def __iter__(self):
+        for k, v in self.Prototype:
+            if k not in self.Private:
+                yield k, v
+
+    def draw(self, pars, key):
+        """
+        Draw the value of an agent-level node for an agent
+        :param pars: parameters of the agent
+        :param key: name of the node
+        :return: value drawn
+        """
+        try:
+            dist, buf = self.Buffers[key]
+        except KeyError:
+            v = sample_loci(self.Private[key], pars, self.RNG)
+        else:
+            if not buf:
+                buf.extend(sample_distribution(dist, self.RNG, self.Batch).tolist()[::-1])
+            v = buf.pop()
+        if pars.Locus is None:
+            pars.Locus = dict()
+        pars.Locus[key] = v
+        return v
+
+    def get_sampler(self, s, pars):
+        return Sampler(self.Prototype.get_sampler(s).Actor, pars)
+
+
+class AgentParameters:
+    __slots__ = ('Shared', 'Id', 'Locus')
+
+    def __init__(self, shared, i):
+        """
+        Parameters of an agent bred on a shared parameter core
+        :param shared: shared parameter core
+        :type shared: SharedParameterCore
+        :param i: id of the agent
+        """
+        self.Shared = shared
+        self.Id = i
+        self.Locus = None
+
+    @property
+    def Nickname(self):
+        return '{}{}'.format(self.Shared.Prefix, self.Id)
+
+    @property
+    def Group(self):
+        return self.Shared.Prototype.Group
+
+    def __getitem__(self, item):
+        if self.Locus is not None:
+            try:
+                return self.Locus[item]
+            except KeyError:
+                pass
+        if item in self.Shared.Private:
+            return self.Shared.draw(self, item)
+        return self.Shared[item]
+
+    def __setitem__(self, key, value):
+        if self.Locus is None:
+            self.Locus = dict()
+        self.Locus[key] = value
+
+    def __contains__(self, item):
+        try:
+            self[item]
+            return True
+        except KeyError:
+            return False
+
+    def __iter__(self):
+        for k in self.Shared.Private:
+            self[k]
+        own = self.Locus if self.Locus is not None else dict()
+        for k, v in self.Shared:
+            if k not in own:
+                yield k, v
+        for v in own.items():
+            yield v
+
+    def get_sampler(self, s):
+        return self.Shared.get_sampler(s, self)
+
+    def get_samplers(self):
+        return self.Shared.Prototype.get_samplers()
+
+    def __repr__(self):
+        return '{} ({})'.format(self.Nickname, ', '.join('{}: {}'.format(k, v) for k, v in self))
@@ -1,4 +1,5 @@
 from .network import *
+from .index import *
 from .population import *
 
 __author__ = 'TimeWz667'
\ No newline at end of file
@@ -0,0 +1,193 @@
+from abc import ABCMeta, abstractmethod
+from collections import Counter
+import numpy as np
+
+__author__ = 'TimeWz667'
+__all__ = ['HashIndex', 'SortedIndex', 'AttributeIndexSet']
+
+
+class AbsAttributeIndex(metaclass=ABCMeta):
+    def __init__(self, key):
+        self.Key = key
+
+    @abstractmethod
+    def add(self, ag, value):
+        pass
+
+    @abstractmethod
+    def remove(self, ag, value):
+        pass
+
+    @abstractmethod
+    def find(self, value):
+        """
+        Find agents with a value of the attribute
+        :param value: value of the attribute
+        :return: list of agents
+        """
+        pass
+
+    @abstractmethod
+    def count(self, value):
+        pass
+
+    def has(self, ag, value):
+        return ag.Attributes.get(self.Key, _Missing) == value
+
+
+class _Missing:
+    pass
+
+
+class HashIndex(AbsAttributeIndex):
+    def __init__(self, key):
+        """
+        Index of a categorical attribute, agents are grouped by values
+        :param key: name of attribute
+        """
+        AbsAttributeIndex.__init__(self, key)
+        self.Buckets = dict()
+
+    def add(self, ag, value):
+        try:
+            self.Buckets[value][ag.Id] = ag
+        except KeyError:
+            self.Buckets[value] = {ag.Id: ag}
+
+    def remove(self, ag, value):
+        bucket = self.Buckets[value]
+        del bucket[ag.Id]
+        if not bucket:
+            del self.Buckets[value]
+
+    def find(self, value):
+        try:
+            return list(self.Buckets[value].values())
+        except KeyError:
+            return list()
+
+    def count(self, value):
+        try:
+            return len(self.Buckets[value])
+        except KeyError:
+            return 0
+
+    def has(self, ag, value):
+        try:
+            return ag.Id in self.Buckets[value]
+        except KeyError:
+            return False
+
+
+class SortedIndex(AbsAttributeIndex):
+    def __init__(self, key):
+        """
+        Index of a numeric attribute. Counts of values are kept up to date,
+        and agents are sorted by values when a range is queried after changes.
+        :param key: name of attribute
+        """
+        AbsAttributeIndex.__init__(self, key)
+        self.Agents = dict()
+        self.Counts = Counter()
+        self.Sorted = None
+
+    def add(self, ag, value):
+        self.Agents[ag.Id] = ag, value
+        self.Counts[value] += 1
+        self.Sorted = None
+
+    def remove(self, ag, value):
+        del self.Agents[ag.Id]
+        self.Counts[value] -= 1
+        if not self.Counts[value]:
+            del self.Counts[value]
+        self.Sorted = None
+
+    def __sort(self):
+        if self.Sorted is None:
+            ags = sorted(self.Agents.values(), key=lambda x: x[1])
+            self.Sorted = np.array([v for _, v in ags]), [ag for ag, _ in ags]
+        return self.Sorted
+
+    def find(self, value):
+        return self.find_range(value, value, right=True)
+
+    def count(self, value):
+        return self.Counts.get(value, 0)
+
+    def find_range(self, lower=-np.inf, upper=np.inf, right=False):
+        """
+        Find agents with values of the attribute in [lower, upper)
+        :param lower: lower bound
+        :param upper: upper bound
+        :param right: True if the upper bound is included
+        :return: list of agents in order of values
+        """
+        vs, ags = self.__sort()
+        i = np.searchsorted(vs, lower, side='left')
+        j = np.searchsorted(vs, upper, side='right' if right else 'left')
+        return ags[i:j]
+
+    def count_range(self, lower=-np.inf, upper=np.inf, right=False):
+        vs, _ = self.__sort()
+        i = np.searchsorted(vs, lower, side='left')
+        j = np.searchsorted(vs, upper, side='right' if right else 'left')
+        return int(j - i)
+
+
+IndexTypes = {'hash': HashIndex, 'sorted': SortedIndex}
+
+
+class AttributeIndexSet(dict):
+    def declare(self, key, kind, ags):
+        """
+        Declare an index of an attribute
+        :param key: name of attribute
+        :param kind: 'hash' for categorical attributes; 'sorted' for numeric attributes
+        :param ags: agents to be indexed
+        """
+        try:
+            index = self[key] = IndexTypes[kind](key)
+        except KeyError:
+            raise KeyError('Unknown index type {}'.format(kind))
+        for ag in ags:
+            if key in ag.Attributes:
+                index.add(ag, ag.Attributes[key])
+
+    def add_agent(self, ag):
+        for key, index in self.items():
+            if key in ag.Attributes:
+                index.add(ag, ag.Attributes[key])
+
+    def remove_agent(self, ag):
+        for key, index in self.items():
+            if key in ag.Attributes:
+                index.remove(ag, ag.Attributes[key])
+
+    def reassign(self, ag, key, value):
+        """
+        Move an agent to the new value of an attribute, before the attribute is assigned
+        """
+        index = self.get(key)
+        if index is None:
+            return
+        if key in ag.Attributes:
+            index.remove(ag, ag.Attributes[key])
+        index.add(ag, value)
+
+    def covers(self, kwargs):
+        return any(k in self for k in kwargs)
+
+    def choose(self, kwargs):
+        """
+        Find the most selective index for criteria
+        :param kwargs: criteria for selecting agents
+        :return: name of the indexed attribute, the other criteria
+        """
+        keys = [k for k in kwargs if k in self]
+        key = min(keys, key=lambda k: self[k].count(kwargs[k]))
+        rest = {k: v for k, v in kwargs.items() if k != key}
+        return key, rest
+
+    def match(self, ag, kwargs):
+        return all(self[k].has(ag, v) for k, v in kwargs.items())
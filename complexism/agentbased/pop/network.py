@@ -1,5 +1,5 @@
 import networkx as nx
-from numpy.random import random, choice, shuffle
+import numpy.random as rd
 from epidag.factory import get_workshop
 import epidag.factory.arguments as vld
 from abc import ABCMeta, abstractmethod
@@ -13,6 +13,17 @@ class INetwork(metaclass=ABCMeta):
     def __init__(self):
         self.Name = 'Network'
         self.json = None
+        self.RNG = rd
+
+    def _draw_seed(self):
+        """
+        Draw a seed for the random graph generators of networkx
+        :return: seed
+        :rtype: int
+        """
+        if isinstance(self.RNG, rd.Generator):
+            return int(self.RNG.integers(2 ** 31))
+        return int(self.RNG.randint(2 ** 31))
 
     @abstractmethod
     def initialise(self):
@@ -26,6 +37,10 @@ class INetwork(metaclass=ABCMeta):
     def remove_agent(self, ag):
         pass
 
+    def remove_agents(self, ags):
+        for ag in ags:
+            self.remove_agent(ag)
+
     @abstractmethod
     def reform(self):
         pass
@@ -75,7 +90,7 @@ class Network(INetwork, metaclass=ABCMeta):
 
     def match(self, net_src, ags_new):
         for f, t in net_src.Graph.edges():
-            self.Graph.add_edge(ags_new[f.Name], ags_new[t.Name])
+            self.Graph.add_edge(ags_new[f.Id], ags_new[t.Id])
 
 
 class NetworkGNP(Network):
@@ -84,15 +99,15 @@ class NetworkGNP(Network):
         self.P = p
 
     def add_agent(self, ag):
+        nes = [ne for ne in self.Graph.nodes() if ne is not ag]
         self.Graph.add_node(ag)
-        for ne in self.Graph.nodes():
-            if ne is not ag and random() < self.P:
-                self.Graph.add_edge(ag, ne)
+        links = self.RNG.random(len(nes)) < self.P
+        self.Graph.add_edges_from((ag, ne) for ne, link in zip(nes, links) if link)
 
     def reform(self):
         new = nx.Graph()
         new.add_nodes_from(self.Graph.node)
-        g = nx.gnp_random_graph(len(self.Graph), self.P, directed=False)
+        g = nx.gnp_random_graph(len(self.Graph), self.P, seed=self._draw_seed(), directed=False)
 
         idmap = {i: ag for i, ag in enumerate(new.nodes.data().keys())}
         for u, v in g.edges():
@@ -111,8 +126,9 @@ class NetworkGNP(Network):
 class NetworkProb(INetwork):
     def __init__(self, p):
         INetwork.__init__(self)
-        self.Outside = list()
-        self.Inside = list()
+        # insertion-ordered dicts as sets, so agents leave in O(1)
+        self.Outside = dict()
+        self.Inside = dict()
         self.P = p
 
     def __getitem__(self, ag):
@@ -121,10 +137,10 @@ class NetworkProb(INetwork):
         return []
 
     def add_agent(self, ag):
-        if random() < self.P:
-            self.Inside.append(ag)
+        if self.RNG.random() < self.P:
+            self.Inside[ag] = None
         else:
-            self.Outside.append(ag)
+            self.Outside[ag] = None
 
     def cluster(self, ag):
         # todo
@@ -137,19 +153,20 @@ class NetworkProb(INetwork):
             return len(self.Inside) - 1
 
     def initialise(self):
-        self.Outside = list()
-        self.Inside = list()
+        self.Outside = dict()
+        self.Inside = dict()
 
     def match(self, net_src, ags_new):
-        self.Outside = [ags_new[ag.Name] for ag in net_src.Outside]
-        self.Inside = [ags_new[ag.Name] for ag in net_src.Inside]
+        self.Outside = {ags_new[ag.Id]: None for ag in net_src.Outside}
+        self.Inside = {ags_new[ag.Id]: None for ag in net_src.Inside}
 
     def remove_agent(self, ag):
-        self.Outside.remove(ag)
-        self.Inside.remove(ag)
+        self.Outside.pop(ag, None)
+        self.Inside.pop(ag, None)
 
     def reform(self):
         ags = list(self.Outside) + list(self.Inside)
+        self.initialise()
         for ag in ags:
             self.add_agent(ag)
 
@@ -168,6 +185,22 @@ class NetworkBA(Network):
         Network.__init__(self)
         self.M = m
         self.__repeat = list()
+        self.__at = dict()
+
+    def __append(self, ags):
+        for a in ags:
+            self.__at.setdefault(a, set()).add(len(self.__repeat))
+            self.__repeat.append(a)
+
+    def __discard(self, ag):
+        # swap the entries of the agent with the tails, highest position first
+        rep, at = self.__repeat, self.__at
+        for i in sorted(at.pop(ag, ()), reverse=True):
+            last = rep.pop()
+            if i < len(rep):
+                rep[i] = last
+                at[last].discard(len(rep))
+                at[last].add(i)
 
     def add_agent(self, ag):
         """
@@ -179,31 +212,36 @@ class NetworkBA(Network):
         self.Graph.add_node(ag)
         num = len(self.Graph)
         if num < self.M:
-            self.__repeat.append(ag)
+            self.__append([ag])
             return
         elif num is self.M:
             agl = [ag] * int(self.M)
             self.Graph.add_edges_from(zip(agl, self.__repeat))
-            self.__repeat.extend(agl)
+            self.__append(agl)
             return
 
         targets = set()
         while len(targets) < self.M:
-            targets.add(choice(self.__repeat))
+            targets.add(self.RNG.choice(self.__repeat))
         agl = [ag] * self.M
         self.Graph.add_edges_from(zip(agl, targets))
-        self.__repeat.extend(agl)
+        self.__append(agl)
 
     def remove_agent(self, ag):
-        self.__repeat = [a for a in self.__repeat if a is not ag]
+        self.__discard(ag)
         Network.remove_agent(self, ag)
 
+    def remove_agents(self, ags):
+        for ag in ags:
+            self.__discard(ag)
+        self.Graph.remove_nodes_from(ags)
+
     def reform(self):
         new = nx.Graph()
         new.add_nodes_from(self.Graph.node)
-        g = nx.barabasi_albert_graph(len(self.Graph), self.M)
+        g = nx.barabasi_albert_graph(len(self.Graph), self.M, seed=self._draw_seed())
         ids = list(new.node.keys())
-        shuffle(ids)
+        self.RNG.shuffle(ids)
         idmap = {i: ag for i, ag in enumerate(ids)}
         for u, v in g.edges():
             new.add_edge(idmap[u], idmap[v])
@@ -211,7 +249,8 @@ class NetworkBA(Network):
 
     def match(self, net_src, ags_new):
         Network.match(self, net_src, ags_new)
-        self.__repeat = [ags_new[a.Name] for a in net_src.__repeat]
+        self.__repeat, self.__at = list(), dict()
+        self.__append(ags_new[a.Id] for a in net_src.__repeat)
 
     def __repr__(self):
         return 'Barabasi_Albert(N={}, M={})'.format(len(self.Graph), self.M)
@@ -271,6 +310,14 @@ class NetworkSet:
         for net in self.Nets.values():
             net.remove_agent(ag)
 
+    def remove_agents(self, ags):
+        for net in self.Nets.values():
+            net.remove_agents(ags)
+
+    def set_rng(self, rng):
+        for net in self.Nets.values():
+            net.RNG = rng
+
     def neighbours_of(self, ag, net=None):
         if net:
             try:
@@ -1,5 +1,8 @@
 from collections import OrderedDict
+import numpy as np
+from complexism.agentbased.agent import GenericAgent
 from .network import NetworkSet
+from .index import AttributeIndexSet
 
 __author__ = 'TimeWz667'
 __all__ = ['Population']
@@ -10,13 +13,39 @@ class Population:
         self.Eve = breeder
         self.Agents = OrderedDict()
         self.Networks = NetworkSet()
+        self.Indices = AttributeIndexSet()
+        self.RNG = None
+
+    def set_rng(self, rng):
+        """
+        Share a random number generator with the breeder, the agents and the networks
+        :param rng: random number generator
+        :type rng: numpy.random.Generator
+        """
+        self.RNG = rng
+        self.Eve.set_rng(rng)
+        for ag in self.Agents.values():
+            ag.RNG = rng
+        self.Networks.set_rng(rng)
 
     def __getitem__(self, item):
         try:
             return self.Agents[item]
+        except KeyError:
+            pass
+        try:
+            return self.Agents[self.Eve.find_id(item)]
         except KeyError:
             raise KeyError('Agent not found')
 
+    def add_index(self, key, kind='hash'):
+        """
+        Index an attribute of agents for counting and selecting. The index follows attributes assigned by ag[key] = value
+        :param key: name of attribute
+        :param kind: 'hash' for categorical attributes such as Sex; 'sorted' for numeric attributes such as Age
+        """
+        self.Indices.declare(key, kind, self.Agents.values())
+
     def count(self, **kwargs):
         """
         Count how many agents are included in certain criteria
@@ -24,7 +53,28 @@ class Population:
         :return: count number
         :rtype: int
         """
-        return self.Eve.count(self.Agents.values(), **kwargs)
+        if self.Indices.covers(kwargs):
+            key, rest = self.Indices.choose(kwargs)
+            if not rest:
+                return self.Indices[key].count(kwargs[key])
+            return self.Eve.count(self.Indices[key].find(kwargs[key]), **rest)
+        return self.Eve.count_population(self.Agents.values(), **kwargs)
+
+    def select(self, **kwargs):
+        """
+        Find agents included in certain criteria
+        :param kwargs: criteria for selecting agents
+        :return: a list of agents
+        :rtype: list
+        """
+        if self.Indices.covers(kwargs):
+            key, rest = self.Indices.choose(kwargs)
+            ags = self.Indices[key].find(kwargs[key])
+        else:
+            ags, rest = self.Agents.values(), kwargs
+        if not rest:
+            return list(ags)
+        return [ag for ag in ags if self.Eve.count([ag], **rest)]
 
     def add_agent(self, n=1, **kwargs):
         """
@@ -38,27 +88,65 @@ class Population:
         n = round(n)
         ags = self.Eve.breed(n, **kwargs)
         for ag in ags:
-            self.Agents[ag.Name] = ag
+            self.Agents[ag.Id] = ag
+            self.Eve.attach(ag)
+            ag.Indices = self.Indices
+            self.Indices.add_agent(ag)
             self.Networks.add_agent(ag)
         return ags
 
-    def remove_agent(self, name):
+    def remove_agent(self, name, ti=None):
         """
         Remove agent from population, disconnecting all social links around it
         :param name: name of agent
         :type name: str
+        :param ti: time of removal
         :return: the deleted agent
         """
         try:
             ag = self[name]
             self.Networks.remove_agent(ag)
-            del self.Agents[name]
+            self._release(ag, ti)
         except KeyError:
             raise KeyError('Agent not found')
         return ag
 
-    def first(self, n=5):
-        for v in self.Agents.values():
+    def remove_agents(self, names, ti=None):
+        """
+        Remove agents from population at once
+        :param names: names of agents
+        :param ti: time of removal
+        :return: the deleted agents
+        :rtype: list
+        """
+        ags = [self[name] for name in names]
+        self.Networks.remove_agents(ags)
+        for ag in ags:
+            self._release(ag, ti)
+        return ags
+
+    def _release(self, ag, ti=None):
+        self.Eve.detach(ag, ti)
+        self.Indices.remove_agent(ag)
+        ag.Indices = None
+        del self.Agents[ag.Id]
+
+    def column(self, key):
+        """
+        Values of an attribute over the agents holding it
+        :param key: name of attribute
+        :return: array of values
+        :rtype: np.ndarray
+        """
+        return np.array([ag.Attributes[key] for ag in self.Agents.values() if key in ag.Attributes])
+
+    def first(self, n=5, **kwargs):
+        """
+        Iterate the first n agents, of which included in certain criteria if any
+        :param n: number of agents
+        :param kwargs: criteria for selecting agents
+        """
+        for v in (self.select(**kwargs) if kwargs else self.Agents.values()):
             if n > 0:
                 yield v
             else:
@@ -66,6 +154,8 @@ class Population:
             n -= 1
 
     def add_network(self, net):
+        if self.RNG is not None:
+            net.RNG = self.RNG
         self.Networks[net.Name] = net
 
     def neighbours(self, ag, net='|'):
@@ -76,9 +166,9 @@ class Population:
         :param net: name of network; '|' for all networks in dict; '*' for neighbours in all networks
         :return:
         """
-        if isinstance(ag, str):
+        if not isinstance(ag, GenericAgent):
             try:
-                ag = self.Agents[ag]
+                ag = self[ag]
             except KeyError:
                 raise KeyError('No this agent')
 
@@ -92,12 +182,17 @@ class Population:
             except KeyError:
                 raise KeyError('No this net')
 
+    def __count_among(self, ags, kwargs):
+        if kwargs and all(k in self.Indices for k in kwargs):
+            return sum(1 for ag in ags if self.Indices.match(ag, kwargs))
+        return self.Eve.count(ags, **kwargs)
+
     def count_neighbours(self, ag, net=None, **kwargs):
         nes = self.neighbours(ag, net=net)
         if isinstance(nes, list):
-            return self.Eve.count(nes, **kwargs)
+            return self.__count_among(nes, kwargs)
         elif isinstance(nes, dict):
-            return {k: self.Eve.count(v, **kwargs) for k, v in nes.items()}
+            return {k: self.__count_among(v, kwargs) for k, v in nes.items()}
         else:
             return 0
 
@@ -113,3 +208,4 @@ class Population:
 
     def __repr__(self):
         return "Population Size: {}".format(len(self.Agents))
+
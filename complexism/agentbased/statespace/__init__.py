@@ -1,5 +1,7 @@
 from .modifier import *
 from .agent import *
+from .hazard import *
+from .gillespie import *
 from .breeder import *
 from .be import *
 from .abmstsp import *
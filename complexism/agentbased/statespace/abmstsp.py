@@ -1,17 +1,17 @@
-from collections import namedtuple, Counter
-from complexism.dcore import Transition
+from complexism.element import DefaultScheduler
 from complexism.agentbased.abm import GenericAgentBasedModel, ObsABM
 from complexism.mcore.y0 import LeafY0
+from .modifier import GloRateModifier
+from .hazard import HazardClock
+from .gillespie import GillespieEngine, find_obstacles
 
 __author__ = 'TimeWz667'
 __all__ = ['StSpAgentBasedModel', 'StSpY0']
 
-Record = namedtuple('Record', ('Ag', 'Todo', 'Time'))
-
 
 class ObsStSpABM(ObsABM):
-    def __init__(self):
-        ObsABM.__init__(self)
+    def __init__(self, keep_records=False):
+        ObsABM.__init__(self, keep_records)
         self.States = list()
         self.Transitions = list()
         self.LazySnapshot = dict()
@@ -21,26 +21,16 @@ class ObsStSpABM(ObsABM):
 
     def add_observing_transition(self, tr):
         self.Transitions.append(tr)
+        self._index_flow(tr)
 
     def update_dynamic_observations(self, model, flow, ti):
-        tds = [rec.Todo for rec in self.Records]
-        count = Counter(tds)
-        trs = {k: v for k, v in count.items() if isinstance(k, Transition)}
-        es = {k: v for k, v in count.items() if not isinstance(k, Transition)}
-
         for tr in self.Transitions:
-            try:
-                flow[tr.Name] = trs[tr]
-            except KeyError:
-                flow[tr.Name] = 0
+            flow[tr.Name] = self._count_flow(tr)
 
         for evt in self.Events:
-            try:
-                flow[str(evt)] = es[evt]
-            except KeyError:
-                flow[str(evt)] = 0
+            flow[str(evt)] = self._count_flow(evt)
 
-        self.Records.clear()
+        self._reset_flows()
 
     def read_statics(self, model, tab, ti):
         ObsABM.read_statics(self, model, tab, ti)
@@ -93,9 +83,6 @@ class ObsStSpABM(ObsABM):
             for k, v in tab.items():
                 self.LazySnapshot[k] = ('Fn', fn)
 
-    def record(self, ag, evt, ti):
-        self.Records.append(Record(ag, evt, ti))
-
 
 class StSpY0(LeafY0):
     def __init__(self):
@@ -137,9 +124,92 @@ class StSpY0(LeafY0):
 
 
 class StSpAgentBasedModel(GenericAgentBasedModel):
-    def __init__(self, name, pc, population):
-        GenericAgentBasedModel.__init__(self, name, pc, population, ObsStSpABM(), StSpY0)
+    def __init__(self, name, pc, population, scheduler=DefaultScheduler):
+        GenericAgentBasedModel.__init__(self, name, pc, population, ObsStSpABM(), StSpY0, scheduler)
         self.DCore = population.Eve.DCore
+        self.Hazards = dict()
+        self.Engine = None
+
+    def set_seed(self, seed=None):
+        ss = GenericAgentBasedModel.set_seed(self, seed)
+        if self.Engine is not None:
+            self.Engine.RNG = self.RNG
+        return ss
+
+    def set_aggregate_rates(self, on=True):
+        """
+        Simulate the transitions of agents by an aggregate-rate (Gillespie) engine instead of scheduling each agent.
+        Agents are grouped by states and rates, so every transition has to be exponential with a fixed rate,
+        and modifiers have to scale the rates
+        :param on: True for the engine; False for scheduling agents one by one
+        """
+        if on is (self.Engine is not None):
+            return
+        ti = self.TimeEnd if self.TimeEnd is not None else 0
+        if on:
+            obs = find_obstacles(self)
+            if obs:
+                raise ValueError('Aggregate rates not applicable: ' + '; '.join(obs))
+            for be in list(self.Hazards):
+                self.set_lazy_shock(be, False)
+            eng = self.Engine = GillespieEngine('{}.Gillespie'.format(self.Name), self.RNG)
+            eng.initialise(ti, self)
+            for be in self.Behaviours.values():
+                if isinstance(getattr(be, 'ProtoModifier', None), GloRateModifier):
+                    eng.attach_modifier(be.ProtoModifier)
+            self.Scheduler.add_scheduler_atom(eng)
+        else:
+            eng, self.Engine = self.Engine, None
+            eng.detach_modifiers()
+        self.Population.Eve.Engine = self.Engine
+        for ag in self.agents:
+            ag.use_engine(self.Engine, ti)
+        if not on:
+            self.Scheduler.remove_atom(eng)
+
+    def set_lazy_shock(self, be, on=True):
+        """
+        Time the transition under the global rate modifier of a behaviour by a shared hazard clock.
+        An update of the value then re-times all the agents at once, without drawing again for each agent,
+        which holds only if the transition is exponential with a fixed rate.
+        :param be: name of the behaviour
+        :param on: True for the hazard clock; False for re-timing agents one by one
+        """
+        mod = self.Behaviours[be].ProtoModifier
+        if not isinstance(mod, GloRateModifier):
+            raise TypeError('Behaviour {} does not have a global rate modifier'.format(be))
+        if self.Engine is not None:
+            raise ValueError('Rates are aggregated by the engine')
+        if on and mod.Target.get_rate() is None:
+            raise ValueError('Transition {} is not exponential with a fixed rate'.format(mod.Target.Name))
+        if on is (be in self.Hazards):
+            return
+        ti = self.TimeEnd if self.TimeEnd is not None else 0
+        if on:
+            hz = self.Hazards[be] = HazardClock('{}.Hazard'.format(be), mod, ti)
+            mod.Hazard = hz
+            self.Scheduler.add_scheduler_atom(hz)
+        else:
+            hz = self.Hazards.pop(be)
+            mod.Hazard = None
+        for ag in self.agents:
+            ag.modify(be, ti)
+        if not on:
+            self.Scheduler.remove_atom(hz)
+
+    def preset(self, ti):
+        for hz in self.Hazards.values():
+            hz.initialise(ti, self)
+        if self.Engine is not None:
+            self.Engine.initialise(ti, self)
+        GenericAgentBasedModel.preset(self, ti)
+
+    def reset(self, ti):
+        for hz in self.Hazards.values():
+            hz.reset(ti, self)
+        if self.Engine is not None:
+            self.Engine.reset(ti, self)
+        GenericAgentBasedModel.reset(self, ti)
 
     def read_y0(self, y0, ti):
         for y in y0:
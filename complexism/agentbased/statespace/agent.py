@@ -4,14 +4,65 @@ from .modifier import ModifierSet
 
 
 __author__ = 'TimeWz667'
-__all__ = ['StSpAgent']
+__all__ = ['StSpAgent', 'TransitionQueue']
+
+
+class TransitionQueue(dict):
+    __slots__ = ('Earliest',)
+
+    def __init__(self):
+        """
+        Times of the enabled transitions of an agent, with the earliest one kept at hand.
+        The earliest one is searched again only if it is removed or postponed.
+        """
+        dict.__init__(self)
+        self.Earliest = None
+
+    def __reduce__(self):
+        return self.__class__, (), None, None, iter(self.items())
+
+    def __setitem__(self, tr, ti):
+        dict.__setitem__(self, tr, ti)
+        ear = self.Earliest
+        if ear is not None:
+            if ti < ear[1]:
+                self.Earliest = tr, ti
+            elif ear[0] is tr or ti == ear[1]:
+                self.Earliest = None
+
+    def __delitem__(self, tr):
+        dict.__delitem__(self, tr)
+        if self.Earliest is not None and self.Earliest[0] is tr:
+            self.Earliest = None
+
+    def pop(self, tr, *args):
+        if self.Earliest is not None and self.Earliest[0] is tr:
+            self.Earliest = None
+        return dict.pop(self, tr, *args)
+
+    def clear(self):
+        dict.clear(self)
+        self.Earliest = None
+
+    def peek(self):
+        """
+        :return: the earliest transition and its time; None if no transition
+        """
+        if self.Earliest is None and self:
+            self.Earliest = min(self.items(), key=lambda x: x[1])
+        return self.Earliest
 
 
 class StSpAgent(GenericAgent):
     def __init__(self, name, st, pars=None):
         GenericAgent.__init__(self, name, pars)
-        self.State = st
-        self.Transitions = dict()
+        self.Tally = None
+        self.Buffers = None
+        self.__state = st
+        self.__enabled = None
+        self.Transitions = TransitionQueue()
+        self.Clocked = None
+        self.Engine = None
         self.Modifiers = ModifierSet()
 
     def __getitem__(self, item):
@@ -23,20 +74,34 @@ class StSpAgent(GenericAgent):
             else:
                 raise e
 
+    @property
+    def State(self):
+        return self.__state
+
+    @State.setter
+    def State(self, st):
+        if self.Tally is not None:
+            self.Tally.move(self.__state, st)
+        self.__state = st
+
     def initialise(self, ti=0, model=None):
         self.Transitions.clear()
+        self.leave_hazards()
+        self.__enabled = None
         self.update_time(ti)
 
     def reset(self, ti=0, model=None):
         self.Transitions.clear()
+        self.leave_hazards()
+        self.__enabled = None
         self.update_time(ti)
 
     def find_next(self):
-        if self.Transitions:
-            tr, ti = min(self.Transitions.items(), key=lambda x: x[1])
-            return Event(tr, ti, tr.Name)
-        else:
+        nxt = self.Transitions.peek()
+        if nxt is None:
             return Event.NullEvent
+        tr, ti = nxt
+        return Event(tr, ti, tr.Name)
 
     def execute_event(self):
         nxt = self.Next
@@ -44,17 +109,79 @@ class StSpAgent(GenericAgent):
             self.State = self.State.execute(nxt)
 
     def update_time(self, ti):
-        self.Transitions = {k: v for k, v in self.Transitions.items() if v >= ti}
-        new_trs = self.State.next_transitions()
-        ad = list(set(new_trs) - set(self.Transitions.keys()))
-        self.Transitions = {k: v for k, v in self.Transitions.items() if k in new_trs}
+        st, trs = self.State, self.Transitions
+        if self.Engine is not None:
+            self.__enabled = st
+            self.Engine.place(self, ti)
+            return
+        if self.__enabled is None:
+            new_trs = st.next_transitions()
+            for tr in [k for k, v in trs.items() if v < ti or k not in new_trs]:
+                del trs[tr]
+            clocked = self.Clocked or dict()
+            for tr in [k for k in clocked if k not in new_trs]:
+                self.__unclock(tr)
+            ad = [tr for tr in dict.fromkeys(new_trs) if tr not in trs and tr not in clocked]
+        elif self.__enabled is not st:
+            rm, ad = st.Model.get_transition_diff(self.__enabled, st)
+            for tr in rm:
+                self.__leave(tr)
+        else:
+            ad = ()
+        self.__enabled = st
+
         for tr in ad:
-            tte = tr.rand(self.Parameters)  # verify
-            for mo in self.Modifiers.on(tr):
-                tte = mo.modify(tte)
-            self.Transitions[tr] = tte + ti
+            self.__draw(tr, ti)
         self.drop_next()
 
+    def __draw(self, tr, ti):
+        tte = self.Modifiers.modify(tr, tr.rand(self.Parameters, self.RNG, self.Buffers))
+        hz = self.Modifiers.hazard_on(tr)
+        if hz is None:
+            self.Transitions[tr] = tte + ti
+        else:
+            self.Transitions.pop(tr, None)
+            if self.Clocked is None:
+                self.Clocked = dict()
+            self.Clocked[tr] = hz, hz.join(self, tr, tte, ti)
+
+    def __leave(self, tr):
+        self.Transitions.pop(tr, None)
+        self.__unclock(tr)
+
+    def __unclock(self, tr):
+        if self.Clocked:
+            try:
+                hz, entry = self.Clocked.pop(tr)
+            except KeyError:
+                return
+            hz.leave(entry)
+
+    def leave_hazards(self, ti=None):
+        """
+        Withdraw the transitions timed by hazard clocks or by an aggregate-rate engine
+        :param ti: time of leaving; the engine keeps its time if None
+        """
+        if self.Clocked:
+            for hz, entry in self.Clocked.values():
+                hz.leave(entry)
+            self.Clocked.clear()
+        if self.Engine is not None:
+            self.Engine.remove(self, ti)
+
+    def use_engine(self, engine, ti):
+        """
+        Leave the transitions to an aggregate-rate engine, or take them back if engine is None
+        :param engine: aggregate-rate engine
+        :type engine: GillespieEngine
+        :param ti: time
+        """
+        self.Transitions.clear()
+        self.leave_hazards()
+        self.Engine = engine
+        self.__enabled = None
+        self.update_time(ti)
+
     def append_modifier(self, name, mod):
         """
         Append a modifier
@@ -95,12 +222,13 @@ class StSpAgent(GenericAgent):
         :type ti: float
         """
         mod = self.Modifiers[m]
-        if mod.Target in self.Transitions:
-            tr = mod.Target
-            tte = tr.rand(self.Parameters)
-            for mo in self.Modifiers.on(tr):
-                tte = mo.modify(tte)
-            self.Transitions[tr] = tte + ti
+        if self.Engine is not None:
+            self.Engine.place(self, ti)
+            return
+        tr = mod.Target
+        if tr in self.Transitions or (self.Clocked and tr in self.Clocked):
+            self.__unclock(tr)
+            self.__draw(tr, ti)
             self.drop_next()
 
     def isa(self, st):
@@ -111,19 +239,25 @@ class StSpAgent(GenericAgent):
 
     def clone(self, dc_new=None):
         if dc_new:
-            ag_new = StSpAgent(self.Name, dc_new[self.State.Name])
+            ag_new = StSpAgent(self.Id, dc_new[self.State.Name])
             for tr, tte in self.Transitions.items():
                 ag_new.Transitions[dc_new.Transitions[tr.Name]] = tte
+            for tr, (hz, entry) in (self.Clocked or dict()).items():
+                ag_new.Transitions[dc_new.Transitions[tr.Name]] = hz.time_of(entry[0])
         else:
-            ag_new = StSpAgent(self.Name, self.State)
+            ag_new = StSpAgent(self.Id, self.State)
 
+        ag_new.Prefix = self.Prefix
         ag_new.Attributes.update(self.Attributes)
+        ag_new.RNG = self.RNG
         return ag_new
 
     def to_json(self):
         js = GenericAgent.to_json(self)
         js['State'] = self.State.Name
         js['Transitions'] = {tr.Name: tte for tr, tte in self.Transitions.items()}
+        if self.Clocked:
+            js['Transitions'].update({tr.Name: hz.time_of(entry[0]) for tr, (hz, entry) in self.Clocked.items()})
         js['Modifiers'] = self.Modifiers.to_json()
         return js
 
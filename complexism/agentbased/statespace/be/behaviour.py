@@ -23,3 +23,19 @@ class PassiveModBehaviour(PassiveBehaviour, metaclass=ABCMeta):
 
     def register(self, ag, ti):
         ag.append_modifier(self.Name, self.ProtoModifier.clone())
+
+
+def shock_global(be, model, ti):
+    """
+    Pass the value of a behaviour to its global rate modifier and re-time the agents
+    :param be: behaviour with a global rate modifier
+    :param model: model of the agents
+    :param ti: time
+    """
+    mod = be.ProtoModifier
+    if mod.Hazard is None:
+        mod.Value = be.Value
+        for ag in model.agents:
+            ag.modify(be.Name, ti)
+    else:
+        mod.Hazard.update(ti, be.Value)
@@ -1,5 +1,4 @@
 import numpy as np
-import numpy.random as rd
 from complexism.element import StepTicker, ScheduleTicker, Event
 from complexism.agentbased import ActiveBehaviour, PassiveBehaviour
 from .trigger import StateEnterTrigger
@@ -28,7 +27,7 @@ class Reincarnation(PassiveBehaviour):
         pass
 
     def impulse_change(self, model, ag, ti, args_pre=None, args_post=None):
-        model.kill(ag.Name, ti)
+        model.kill(ag.Id, ti)
         model.birth(n=1, ti=ti, st=self.S_birth)
         self.BirthN += 1
 
@@ -59,7 +58,7 @@ class Cohort(PassiveBehaviour):
         pass
 
     def impulse_change(self, model, ag, ti, args_pre=None, args_post=None):
-        model.kill(ag.Name, ti, self.Name)
+        model.kill(ag.Id, ti, self.Name)
         self.DeathN += 1
 
     def fill(self, obs, model, ti):
@@ -98,7 +97,7 @@ class LifeRate(ActiveBehaviour):
         if n <= 0:
             return
         prob = 1 - np.exp(-self.BirthRate * self.Dt)
-        n = rd.binomial(n, prob)
+        n = model.RNG.binomial(n, prob)
 
         self.BirthN += n
         model.birth(n=n, ti=ti, st=self.S_birth)
@@ -107,7 +106,7 @@ class LifeRate(ActiveBehaviour):
         pass
 
     def impulse_change(self, model, ag, ti, args_pre=None, args_post=None):
-        model.kill(ag.Name, ti)
+        model.kill(ag.Id, ti)
 
     def fill(self, obs, model, ti):
         obs[self.Name] = self.BirthN
@@ -140,7 +139,7 @@ class LifeS(ActiveBehaviour):
         rate = self.Rate * (1 - n / self.Cap)
         prob = 1 - np.exp(-rate * self.Dt)
         if prob > 0:
-            n = rd.binomial(n, prob)
+            n = model.RNG.binomial(n, prob)
 
             model.birth(n=n, ti=ti, st=self.S_birth)
 
@@ -148,7 +147,7 @@ class LifeS(ActiveBehaviour):
         pass
 
     def impulse_change(self, model, ag, ti, args_pre=None, args_post=None):
-        model.kill(ag.Name, ti)
+        model.kill(ag.Id, ti)
 
     def fill(self, obs, model, ti):
         obs[self.Name] = self.Rate * (1 - len(model) / self.Cap)
@@ -176,6 +175,8 @@ class BirthAgeingDeathLeeCarter(ActiveModBehaviour):
     def initialise(self, ti, model):
         ti = max(ti, self.LeeCarter.YearStart)
         self.__update_data(ti)
+        if 'Sex' not in model.Population.Indices:
+            model.Population.add_index('Sex')
         ActiveModBehaviour.initialise(self, ti, model)
         self.__shock(model, ti)
 
@@ -199,8 +200,8 @@ class BirthAgeingDeathLeeCarter(ActiveModBehaviour):
                 if ag['Age'] >= 100:
                     to_delete.append(ag)
 
+            model.kill_many([ag.Id for ag in to_delete], ti)
             for ag in to_delete:
-                model.kill(ag.Name, ti)
                 model.Observer.record(ag, 'Die', ti)
 
             # Birth
@@ -209,7 +210,7 @@ class BirthAgeingDeathLeeCarter(ActiveModBehaviour):
             if n <= 0:
                 return
             prob = 1 - np.exp(-br['Female'])
-            ags = model.birth(n=rd.binomial(n, prob), ti=ti, st=self.S_birth)
+            ags = model.birth(n=model.RNG.binomial(n, prob), ti=ti, st=self.S_birth)
             for ag in ags:
                 ag['Sex'] = 'Female'
                 ag['Age'] = 0
@@ -217,7 +218,7 @@ class BirthAgeingDeathLeeCarter(ActiveModBehaviour):
             if n <= 0:
                 return
             prob = 1 - np.exp(-br['Male'])
-            ags = model.birth(n=rd.binomial(n, prob), ti=ti, st=self.S_birth)
+            ags = model.birth(n=model.RNG.binomial(n, prob), ti=ti, st=self.S_birth)
             for ag in ags:
                 ag['Sex'] = 'Male'
                 ag['Age'] = 0
@@ -230,10 +231,10 @@ class BirthAgeingDeathLeeCarter(ActiveModBehaviour):
     def register(self, ag, ti):
         ActiveModBehaviour.register(self, ag, ti)
         if 'Sex' not in ag.Attributes:
-            ag['Sex'], ag['Age'] = self.SexAgeSam()
+            ag['Sex'], ag['Age'] = self.SexAgeSam(rng=ag.RNG)
 
     def impulse_change(self, model, ag, ti, args_pre=None, args_post=None):
-        model.kill(ag.Name, ti)
+        model.kill(ag.Id, ti)
 
     def match(self, be_src, ags_src, ags_new, ti):
         pass
@@ -244,7 +245,7 @@ class BirthAgeingDeathLeeCarter(ActiveModBehaviour):
         except ZeroDivisionError:
             obs['SexRatio'] = float('inf')
 
-        ages = [ag['Age'] for ag in model.agents]
+        ages = model.Population.column('Age')
 
         obs['AvgAge'] = np.mean(ages)
 
@@ -276,6 +277,8 @@ class CohortLeeCarter(ActiveModBehaviour):
     def initialise(self, ti, model):
         ti = max(ti, self.LeeCarter.YearStart)
         self.__update_data(ti)
+        if 'Sex' not in model.Population.Indices:
+            model.Population.add_index('Sex')
         ActiveModBehaviour.initialise(self, ti, model)
         self.__shock(model, ti)
 
@@ -299,8 +302,8 @@ class CohortLeeCarter(ActiveModBehaviour):
                 if ag['Age'] >= 100:
                     to_delete.append(ag)
 
+            model.kill_many([ag.Id for ag in to_delete], ti)
             for ag in to_delete:
-                model.kill(ag.Name, ti)
                 model.Observer.record(ag, 'Die', ti)
 
             self.__shock(model, ti)
@@ -310,18 +313,18 @@ class CohortLeeCarter(ActiveModBehaviour):
     def register(self, ag, ti):
         ActiveModBehaviour.register(self, ag, ti)
         if 'Sex' not in ag.Attributes:
-            ag['Sex'], ag['Age'] = self.SexAgeSam()
+            ag['Sex'], ag['Age'] = self.SexAgeSam(rng=ag.RNG)
         elif 'Age' not in ag.Attributes:
             if ag['Sex'] == 'Female':
-                ag['Age'] = self.FemaleAgeSam()
+                ag['Age'] = self.FemaleAgeSam(rng=ag.RNG)
             else:
-                ag['Age'] = self.MaleAgeSam()
+                ag['Age'] = self.MaleAgeSam(rng=ag.RNG)
 
             dr = self.DeathRates[ag['Sex']][ag['Age']]
             ag.shock(ti, None, self.Name, value=dr)
 
     def impulse_change(self, model, ag, ti, args_pre=None, args_post=None):
-        model.kill(ag.Name, ti)
+        model.kill(ag.Id, ti)
 
     def match(self, be_src, ags_src, ags_new, ti):
         pass
@@ -332,7 +335,7 @@ class CohortLeeCarter(ActiveModBehaviour):
         except ZeroDivisionError:
             obs['SexRatio'] = float('inf')
 
-        ages = [ag['Age'] for ag in model.agents]
+        ages = model.Population.column('Age')
 
         obs['AvgAge'] = np.mean(ages)
 
@@ -1,8 +1,7 @@
 from abc import ABCMeta, abstractmethod
-import numpy.random as rd
 from complexism.element import Event, StepTicker
 from ..modifier import GloRateModifier, LocRateModifier, BuffModifier, NerfModifier
-from .behaviour import PassiveModBehaviour, ActiveModBehaviour
+from .behaviour import PassiveModBehaviour, ActiveModBehaviour, shock_global
 from .trigger import StateTrigger
 __author__ = 'TimeWz667'
 __all__ = ['ExternalShock',
@@ -38,9 +37,7 @@ class ExternalShock(PassiveModBehaviour):
         obs[self.Name] = self.Value
 
     def __shock(self, model, ti):
-        self.ProtoModifier.Value = self.Value
-        for ag in model.agents:
-            ag.modify(self.Name, ti)
+        shock_global(self, model, ti)
 
 
 class GlobalShock(PassiveModBehaviour, metaclass=ABCMeta):
@@ -63,14 +60,26 @@ class GlobalShock(PassiveModBehaviour, metaclass=ABCMeta):
         self.Value = self._evaluate(model)
         self.__shock(model, ti)
 
+    def impulse_changes(self, model, changes, ti):
+        self.Value = self._evaluate(model)
+        self.__shock(model, ti)
+
     def impulse_enter(self, model, ag, ti, args=None):
         self.Value += self._difference(model, ag)
         self.__shock(model, ti)
 
+    def impulse_enters(self, model, entries, ti):
+        self.Value = self._evaluate(model)
+        self.__shock(model, ti)
+
     def impulse_exit(self, model, ag, ti, args=None):
         self.Value -= self._difference(model, ag)
         self.__shock(model, ti)
 
+    def impulse_exits(self, model, entries, ti):
+        self.Value = self._evaluate(model)
+        self.__shock(model, ti)
+
     def match(self, be_src, ags_src, ags_new, ti):
         self.Value = be_src.Value
         for ag in ags_new.values():
@@ -88,9 +97,7 @@ class GlobalShock(PassiveModBehaviour, metaclass=ABCMeta):
         pass
 
     def __shock(self, model, ti):
-        self.ProtoModifier.Value = self.Value
-        for ag in model.agents:
-            ag.modify(self.Name, ti)
+        shock_global(self, model, ti)
 
 
 class GlobalShockFast(ActiveModBehaviour):
@@ -128,9 +135,7 @@ class GlobalShockFast(ActiveModBehaviour):
 
     def __shock(self, model, ti):
         if self.ProtoModifier.Value is not self.Value:
-            self.ProtoModifier.Value = self.Value
-            for ag in model.agents:
-                ag.modify(self.Name, ti)
+            shock_global(self, model, ti)
             model.disclose('update value', self.Name)
 
     @abstractmethod
@@ -353,13 +358,13 @@ class SwitchOn(PassiveModBehaviour, metaclass=ABCMeta):
     def initialise(self, ti, model):
         for ag in model.agents:
             if self.S_src in ag.State:
-                self.__shock(ag, ti)
+                self.__shock(model, ag, ti)
 
     def impulse_change(self, model, ag, ti, args_pre=None, args_post=None):
-        self.__shock(ag, ti)
+        self.__shock(model, ag, ti)
 
     def impulse_enter(self, model, ag, ti, args=None):
-        self.__shock(ag, ti)
+        self.__shock(model, ag, ti)
 
     def impulse_exit(self, model, ag, ti, args=None):
         ag.shock(ti, self.Name, self.Name, False)
@@ -375,10 +380,10 @@ class SwitchOn(PassiveModBehaviour, metaclass=ABCMeta):
         except ZeroDivisionError:
             obs[self.Name] = 0
 
-    def __shock(self, ag, ti):
+    def __shock(self, model, ag, ti):
         self.Decision += 1
 
-        if rd.random() < self.Prob:
+        if model.RNG.random() < self.Prob:
             ag.shock(ti, self.Name, self.Name, value=True)
             self.Buff += 1
         else:
@@ -399,13 +404,13 @@ class SwitchOff(PassiveModBehaviour, metaclass=ABCMeta):
     def initialise(self, ti, model):
         for ag in model.agents:
             if self.S_src in ag.State:
-                self.__shock(ag, ti)
+                self.__shock(model, ag, ti)
 
     def impulse_change(self, model, ag, ti, args_pre=None, args_post=None):
-        self.__shock(ag, ti)
+        self.__shock(model, ag, ti)
 
     def impulse_enter(self, model, ag, ti, args=None):
-        self.__shock(ag, ti)
+        self.__shock(model, ag, ti)
 
     def impulse_exit(self, model, ag, ti, args=None):
         ag.shock(ti, self.Name, self.Name, False)
@@ -421,9 +426,9 @@ class SwitchOff(PassiveModBehaviour, metaclass=ABCMeta):
         except ZeroDivisionError:
             obs[self.Name] = 0
 
-    def __shock(self, ag, ti):
+    def __shock(self, model, ag, ti):
         self.Decision += 1
-        if rd.random() < self.Prob:
+        if model.RNG.random() < self.Prob:
             ag.shock(ti, self.Name, self.Name, value=True)
             self.Nerf += 1
         else:
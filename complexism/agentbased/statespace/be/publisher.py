@@ -25,12 +25,22 @@ class StateTrack(PassiveBehaviour):
         else:
             self.__change_value(model, -1)
 
+    def impulse_changes(self, model, changes, ti):
+        dv = sum(1 if self.S_src in ag else -1 for ag, _, _ in changes)
+        self.__change_value(model, dv)
+
     def impulse_enter(self, model, ag, ti, args=None):
         self.__change_value(model, 1)
 
+    def impulse_enters(self, model, entries, ti):
+        self.__change_value(model, len(entries))
+
     def impulse_exit(self, model, ag, ti, args=None):
         self.__change_value(model, -1)
 
+    def impulse_exits(self, model, entries, ti):
+        self.__change_value(model, -len(entries))
+
     def __evaluate(self, model):
         return model.Population.count(st=self.S_src)
 
@@ -76,6 +86,15 @@ class StateRatioTrack(PassiveBehaviour):
         self.ValueDen = model.Population.count(st=self.S_den)
 
     def impulse_change(self, model, ag, ti, args_pre=None, args_post=None):
+        self.__count_change(args_pre, args_post)
+        model.disclose('update value', self.Name, v=self.ValueNum/self.ValueDen)
+
+    def impulse_changes(self, model, changes, ti):
+        for _, f, t in changes:
+            self.__count_change(f, t)
+        model.disclose('update value', self.Name, v=self.ValueNum/self.ValueDen)
+
+    def __count_change(self, args_pre, args_post):
         a0, b0 = args_pre
         a1, b1 = args_post
         if a0 and not a1:
@@ -87,7 +106,6 @@ class StateRatioTrack(PassiveBehaviour):
             self.ValueDen -= 1
         elif b1 and not b0:
             self.ValueDen += 1
-        model.disclose('update value', self.Name, v=self.ValueNum/self.ValueDen)
 
     def impulse_enter(self, model, ag, ti, args=None):
         a, b = args
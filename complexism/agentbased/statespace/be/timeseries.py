@@ -2,7 +2,7 @@ import scipy.interpolate as ipl
 from abc import ABCMeta, abstractmethod
 from complexism.element import Event, ScheduleTicker, StepTicker
 from ..modifier import GloRateModifier
-from .behaviour import ActiveModBehaviour
+from .behaviour import ActiveModBehaviour, shock_global
 
 __author__ = 'TimeWz667'
 __all__ = ['AbsTimeVarying',
@@ -34,9 +34,7 @@ class AbsTimeVarying(ActiveModBehaviour, metaclass=ABCMeta):
 
     def _shock(self, model, ti):
         v0, self.Value = self.Value, self._find_value(ti)
-        self.ProtoModifier.Value = self.Value
-        for ag in model.agents:
-            ag.modify(self.Name, ti)
+        shock_global(self, model, ti)
         model.disclose('update value from {} to {}'.format(v0, self.Value),
                        self.Name, v0=v0, v1=self.Value)
 
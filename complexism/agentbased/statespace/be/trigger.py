@@ -6,6 +6,18 @@ __all__ = ['TransitionTrigger',
            'StateTrigger', 'StateEnterTrigger', 'StateExitTrigger', 'DoubleStateTrigger']
 
 
+def _check_states(st, ags):
+    # agents in the same state share the result
+    checked, res = dict(), list()
+    for ag in ags:
+        try:
+            chk = checked[ag.State]
+        except KeyError:
+            chk = checked[ag.State] = st in ag.State
+        res.append(chk or st in ag.Attributes)
+    return res
+
+
 class TransitionTrigger(Trigger):
     def __init__(self, tr):
         self.Transition = tr
@@ -33,9 +45,15 @@ class StateTrigger(Trigger):
     def check_enter(self, ag):
         return self.__check(ag)
 
+    def check_enters(self, ags):
+        return _check_states(self.State, ags)
+
     def check_exit(self, ag):
         return self.__check(ag)
 
+    def check_exits(self, ags):
+        return _check_states(self.State, ags)
+
 
 class StateEnterTrigger(Trigger):
     def __init__(self, st):
@@ -56,6 +74,9 @@ class StateEnterTrigger(Trigger):
     def check_enter(self, ag):
         return self.__check(ag)
 
+    def check_enters(self, ags):
+        return _check_states(self.State, ags)
+
 
 class StateExitTrigger(Trigger):
     def __init__(self, st):
@@ -76,6 +97,9 @@ class StateExitTrigger(Trigger):
     def check_exit(self, ag):
         return self.__check(ag)
 
+    def check_exits(self, ags):
+        return _check_states(self.State, ags)
+
 
 class DoubleStateTrigger(Trigger):
     def __init__(self, st1, st2):
@@ -2,6 +2,7 @@ import epidag as dag
 from epidag.factory import get_workshop
 import complexism as cx
 from complexism.mcore import AbsModelBlueprint
+from complexism.element import DefaultScheduler
 from .abmstsp import StSpAgentBasedModel, StSpY0
 from .breeder import StSpBreeder
 
@@ -114,7 +115,8 @@ class BlueprintStSpABM(AbsModelBlueprint):
         ag = self.Population['Agent']
         eve = StSpBreeder(ag['Prefix'], ag['Group'], pc, ss)
         pop = cx.Population(eve)
-        model = StSpAgentBasedModel(name, pc, pop)
+        sc = kwargs['scheduler'] if 'scheduler' in kwargs else DefaultScheduler
+        model = StSpAgentBasedModel(name, pc, pop, scheduler=sc)
         model.Class = self.Class
 
         # Set resources
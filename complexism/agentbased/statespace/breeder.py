@@ -1,8 +1,45 @@
+from collections import Counter
 from complexism.agentbased import GenericBreeder
 import complexism.dcore as ss
 from .agent import StSpAgent
 
 __author__ = 'TimeWz667'
+__all__ = ['StateTally', 'StSpBreeder']
+
+
+class StateTally:
+    def __init__(self, dc):
+        """
+        Live numbers of agents in each state of a dynamic core, superstates included
+        :param dc: dynamic core
+        """
+        self.DCore = dc
+        self.Counts = {st: 0 for st in dc.States.values()}
+        self.Belongs = dict()
+
+    def __belongs(self, st):
+        try:
+            return self.Belongs[st]
+        except KeyError:
+            sts = self.Belongs[st] = [s for s in self.DCore.States.values() if s in st]
+            return sts
+
+    def add(self, st, n=1):
+        for s in self.__belongs(st):
+            self.Counts[s] += n
+
+    def remove(self, st, n=1):
+        self.add(st, -n)
+
+    def move(self, st0, st1):
+        if st0 is not st1:
+            self.remove(st0)
+            self.add(st1)
+
+    def count(self, st):
+        if isinstance(st, str):
+            st = self.DCore[st]
+        return self.Counts.get(st, 0)
 
 
 class StSpBreeder(GenericBreeder):
@@ -14,6 +51,40 @@ class StSpBreeder(GenericBreeder):
             self.DCore = dc.generate_model(name, **self.PCore.get_samplers())
 
         self.WStates = {wd: self.DCore[wd] for wd in self.DCore.WellDefinedStates}
+        self.Tally = StateTally(self.DCore)
+        self.Engine = None
+        self.Buffers = dict()
+
+    def set_rng(self, rng):
+        GenericBreeder.set_rng(self, rng)
+        self.Buffers.clear()
+
+    def attach(self, ag):
+        ag.Tally = self.Tally
+        ag.Engine = self.Engine
+        ag.Buffers = self.Buffers
+        self.Tally.add(ag.State)
+
+    def detach(self, ag, ti=None):
+        ag.Tally = None
+        ag.Buffers = None
+        ag.leave_hazards(ti)
+        self.Tally.remove(ag.State)
+
+    def initialise_many(self, ags, ti=0, model=None):
+        if self.Engine is None:
+            n_trs = Counter()
+            for st, n in Counter(ag.State for ag in ags).items():
+                for tr in dict.fromkeys(st.next_transitions()):
+                    n_trs[tr] += n
+            for tr, n in n_trs.items():
+                tr.reserve(n, self.RNG, self.Buffers)
+        GenericBreeder.initialise_many(self, ags, ti, model)
+
+    def count_population(self, ags, **kwargs):
+        if len(kwargs) == 1 and 'st' in kwargs:
+            return self.Tally.count(kwargs['st'])
+        return self.count(ags, **kwargs)
 
     def _filter_attributes(self, kw):
         st = kw['st']
@@ -0,0 +1,227 @@
+from complexism.element import Event
+from complexism.mcore import ModelAtom
+from .modifier import GloRateModifier, LocRateModifier, NerfModifier
+
+__author__ = 'TimeWz667'
+__all__ = ['GillespieEngine', 'find_obstacles']
+
+
+def find_obstacles(model):
+    """
+    Find what keeps a state-space agent-based model from being simulated by aggregate rates
+    :param model: state-space agent-based model
+    :return: list of reasons; empty if the model is eligible
+    """
+    obs = list()
+    for tr in model.DCore.Transitions.values():
+        if tr.get_rate() is None:
+            obs.append('Transition {} is not exponential with a fixed rate'.format(tr.Name))
+    for name, be in model.Behaviours.items():
+        mod = getattr(be, 'ProtoModifier', None)
+        if mod is not None and not isinstance(mod, (GloRateModifier, LocRateModifier, NerfModifier)):
+            obs.append('Behaviour {} does not scale rates'.format(name))
+    return obs
+
+
+class AgentGroup:
+    __slots__ = ('Key', 'Rates', 'Agents', 'Index')
+
+    def __init__(self, key):
+        """
+        Agents in the same state with the same rates of transitions
+        :param key: state, ((transition, rate, True if scaled by the shared modifiers), ...)
+        """
+        self.Key = key
+        self.Rates = key[1]
+        self.Agents = list()
+        self.Index = dict()
+
+    def __len__(self):
+        return len(self.Agents)
+
+    def add(self, ag):
+        self.Index[ag.Id] = len(self.Agents)
+        self.Agents.append(ag)
+
+    def remove(self, ag):
+        i = self.Index.pop(ag.Id)
+        last = self.Agents.pop()
+        if last is not ag:
+            self.Agents[i] = last
+            self.Index[last.Id] = i
+
+
+class SharedRate:
+    __slots__ = ('Engine', 'Modifier')
+
+    def __init__(self, engine, mod):
+        """
+        Global rate modifier taken over by an aggregate-rate engine, updated as a hazard clock
+        :param engine: aggregate-rate engine
+        :param mod: global rate modifier
+        """
+        self.Engine = engine
+        self.Modifier = mod
+
+    def update(self, ti, value):
+        """
+        Change the value of the modifier
+        :param ti: time
+        :param value: new value
+        """
+        self.Engine.update_modifier(ti, self.Modifier, value)
+
+
+class GillespieEngine(ModelAtom):
+    def __init__(self, name, rng=None):
+        """
+        Aggregate-rate engine of exponential transitions. Agents are grouped by states and rates of transitions,
+        and the next event is found by the direct method over the groups, with the agent taken uniformly
+        from the group. The event is requested in the name of the agent.
+        :param name: name of the engine
+        :param rng: random number generator
+        """
+        ModelAtom.__init__(self, name)
+        self.RNG = rng
+        self.Time = 0
+        self.Groups = dict()
+        self.Locations = dict()
+        self.Shared = dict()
+        self.BaseRates = dict()
+        self.Enabled = dict()
+        self.Chosen = None
+
+    @property
+    def Id(self):
+        return self.Chosen.Id if self.Chosen is not None else self.Name
+
+    def __len__(self):
+        return len(self.Locations)
+
+    def attach_modifier(self, mod):
+        """
+        Take over a global rate modifier, of which the value scales the rate of all the agents
+        :param mod: global rate modifier
+        :type mod: GloRateModifier
+        """
+        mod.Hazard = SharedRate(self, mod)
+        self.Shared.setdefault(mod.Target, list()).append(mod)
+
+    def detach_modifiers(self):
+        for mods in self.Shared.values():
+            for mod in mods:
+                mod.Hazard = None
+        self.Shared = dict()
+
+    def update_modifier(self, ti, mod, value):
+        """
+        Change the value of a global rate modifier
+        :param ti: time
+        :param mod: global rate modifier
+        :param value: new value
+        """
+        mod.Value = value
+        self.Time = ti
+        self.drop_next()
+
+    def __rate(self, tr):
+        try:
+            return self.BaseRates[tr]
+        except KeyError:
+            rate = self.BaseRates[tr] = tr.get_rate()
+            if rate is None:
+                raise ValueError('Transition {} is not exponential with a fixed rate'.format(tr.Name))
+            return rate
+
+    def __key(self, ag):
+        st = ag.State
+        try:
+            trs = self.Enabled[st]
+        except KeyError:
+            trs = self.Enabled[st] = tuple(dict.fromkeys(st.next_transitions()))
+        mods, rates = ag.Modifiers, list()
+        for tr in trs:
+            f = mods.scale(tr) if mods.on(tr) else 1
+            if f is None:
+                raise ValueError('Modifiers on {} of {} do not scale the rate'.format(tr.Name, ag.Id))
+            rates.append((tr, self.__rate(tr) * f, mods.hazard_on(tr) is self))
+        return st, tuple(rates)
+
+    def place(self, ag, ti):
+        """
+        Put an agent into the group of its state and rates
+        :param ag: agent
+        :param ti: time
+        """
+        key = self.__key(ag)
+        g = self.Locations.get(ag.Id)
+        if g is None or g.Key != key:
+            if g is not None:
+                self.__leave(g, ag)
+            try:
+                g = self.Groups[key]
+            except KeyError:
+                g = self.Groups[key] = AgentGroup(key)
+            g.add(ag)
+            self.Locations[ag.Id] = g
+        self.Time = ti
+        self.drop_next()
+
+    def remove(self, ag, ti=None):
+        """
+        Take an agent out of the engine
+        :param ag: agent
+        :param ti: time; the next event is drawn again from it, or from the time of the last change if None
+        """
+        g = self.Locations.pop(ag.Id, None)
+        if g is not None:
+            self.__leave(g, ag)
+            if ti is not None:
+                self.Time = max(ti, self.Time)
+            self.drop_next()
+
+    def __leave(self, g, ag):
+        g.remove(ag)
+        if not g.Agents:
+            del self.Groups[g.Key]
+
+    def find_next(self):
+        self.Chosen = None
+        scales = dict()
+        for tr, mods in self.Shared.items():
+            f = 1
+            for mod in mods:
+                f *= max(mod.Value, 0)
+            scales[tr] = f
+
+        total, cands = 0, list()
+        for g in self.Groups.values():
+            n = len(g.Agents)
+            for tr, rate, shared in g.Rates:
+                r = n * rate * (scales.get(tr, 1) if shared else 1)
+                if r > 0:
+                    total += r
+                    cands.append((r, g, tr))
+        if total <= 0:
+            return Event.NullEvent
+
+        dt = self.RNG.exponential(1 / total)
+        u = self.RNG.random() * total
+        for r, g, tr in cands:
+            u -= r
+            if u < 0:
+                break
+        self.Chosen = g.Agents[self.RNG.integers(len(g.Agents))]
+        return Event(tr, self.Time + dt, tr.Name)
+
+    def execute_event(self):
+        pass
+
+    def initialise(self, ti, model):
+        self.Time = ti
+
+    def reset(self, ti, model):
+        self.Time = ti
+
+    def __repr__(self):
+        return 'GillespieEngine({}, Agents: {}, Groups: {})'.format(self.Name, len(self), len(self.Groups))
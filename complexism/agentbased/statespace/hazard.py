@@ -0,0 +1,126 @@
+from heapq import heappush, heappop, heapify
+from complexism.element import Event
+from complexism.mcore import ModelAtom
+
+__author__ = 'TimeWz667'
+__all__ = ['HazardClock']
+
+
+class HazardClock(ModelAtom):
+    def __init__(self, name, mod, ti=0):
+        """
+        Shared clock of the cumulative value of a global rate modifier. An agent joins with a time to event drawn
+        at unit value, and its transition happens when the cumulative value since joining reaches the time;
+        a change of the value re-times all the agents at once. The clock is scheduled as an atom of which the
+        next event is the earliest transition of the agents, requested in the name of the agent.
+        :param name: name of the clock
+        :param mod: global rate modifier
+        :type mod: GloRateModifier
+        :param ti: time
+        """
+        ModelAtom.__init__(self, name)
+        self.Modifier = mod
+        self.TimeLast = ti
+        self.CumLast = 0
+        self.Queue = list()
+        self.NumDropped = 0
+        self.Count = 0
+
+    @property
+    def Id(self):
+        top = self.__top()
+        return top[2].Id if top is not None else self.Name
+
+    def __len__(self):
+        return len(self.Queue) - self.NumDropped
+
+    def __top(self):
+        q = self.Queue
+        while q and q[0][2] is None:
+            heappop(q)
+            self.NumDropped -= 1
+        return q[0] if q else None
+
+    def cumulate(self, ti):
+        """
+        Cumulative value of the modifier
+        :param ti: time, not earlier than the last update
+        :return: cumulative value
+        """
+        if ti > self.TimeLast:
+            return self.CumLast + max(self.Modifier.Value, 0) * (ti - self.TimeLast)
+        return self.CumLast
+
+    def time_of(self, cum):
+        """
+        Time when the cumulative value reaches a level under the current value
+        :param cum: level of cumulative value
+        :return: time
+        """
+        v = self.Modifier.Value
+        if v <= 0:
+            return float('inf')
+        return self.TimeLast + (cum - self.CumLast) / v
+
+    def update(self, ti, value):
+        """
+        Change the value of the modifier
+        :param ti: time
+        :param value: new value
+        """
+        self.CumLast = self.cumulate(ti)
+        self.TimeLast = max(ti, self.TimeLast)
+        self.Modifier.Value = value
+        self.drop_next()
+
+    def join(self, ag, tr, tte, ti):
+        """
+        Queue a transition of an agent
+        :param ag: agent
+        :param tr: transition
+        :param tte: time to event at unit value
+        :param ti: time
+        :return: entry of the transition
+        """
+        top = self.__top()
+        entry = [self.cumulate(ti) + tte, self.Count, ag, tr]
+        self.Count += 1
+        heappush(self.Queue, entry)
+        if top is None or entry[0] < top[0]:
+            self.drop_next()
+        return entry
+
+    def leave(self, entry):
+        """
+        Withdraw a transition queued
+        :param entry: entry of the transition
+        """
+        if entry[2] is None:
+            return
+        top = self.__top()
+        entry[2] = None
+        self.NumDropped += 1
+        if self.NumDropped > len(self.Queue) / 2:
+            self.Queue = [e for e in self.Queue if e[2] is not None]
+            heapify(self.Queue)
+            self.NumDropped = 0
+        if entry is top:
+            self.drop_next()
+
+    def find_next(self):
+        top = self.__top()
+        if top is None:
+            return Event.NullEvent
+        return Event(top[3], self.time_of(top[0]), top[3].Name)
+
+    def execute_event(self):
+        pass
+
+    def initialise(self, ti, model):
+        self.TimeLast = ti
+
+    def reset(self, ti, model):
+        self.TimeLast = ti
+
+    def __repr__(self):
+        return 'HazardClock({}, Agents: {})'.format(self.Name, len(self))
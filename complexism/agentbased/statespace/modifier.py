@@ -4,19 +4,57 @@ from collections import OrderedDict
 __author__ = 'TimeWz667'
 
 
+def _compose_rate(val, comb):
+    const, divs = comb
+    if val <= 0:
+        return float('inf'), ()
+    if const is not None:
+        return const / val, ()
+    return None, divs + (val,)
+
+
+def _clock_of(mod):
+    # an aggregate-rate engine takes over shared modifiers through handles, so the engine is the clock
+    hz = getattr(mod, 'Hazard', None)
+    return getattr(hz, 'Engine', hz)
+
+
 class AbsModifier(metaclass=ABCMeta):
+    __slots__ = ('__target', '__value', 'Owner')
+    Shared = False
+
     def __init__(self, tar, val=float('inf')):
         self.__target = tar
-        self.Value = val
+        self.Owner = None
+        self.__value = val
 
     @property
     def Target(self):
         return self.__target
 
+    @property
+    def Value(self):
+        return self.__value
+
+    @Value.setter
+    def Value(self, val):
+        self.__value = val
+        if self.Owner is not None:
+            self.Owner.invalidate(self.__target)
+
     @abstractmethod
     def modify(self, tte):
         pass
 
+    def compose(self, comb):
+        """
+        Compose the modification with the preceding ones
+        :param comb: (constant, divisors); the time to event becomes the constant if it is not None,
+        or is divided by the divisors in order
+        :return: composed modification; None if the modification can not be composed
+        """
+        return None
+
     @abstractmethod
     def update(self, **kwargs):
         pass
@@ -30,6 +68,8 @@ class AbsModifier(metaclass=ABCMeta):
 
 
 class DirectModifier(AbsModifier):
+    __slots__ = ()
+
     def __init__(self, tar, val=float('inf')):
         AbsModifier.__init__(self, tar, val)
 
@@ -38,6 +78,9 @@ class DirectModifier(AbsModifier):
             return float('inf')
         return self.Value
 
+    def compose(self, comb):
+        return (self.Value if self.Value > 0 else float('inf')), ()
+
     def update(self, value, **kwargs):
         if self.Value is not value:
             self.Value = value
@@ -50,6 +93,8 @@ class DirectModifier(AbsModifier):
 
 
 class LocRateModifier(AbsModifier):
+    __slots__ = ()
+
     def __init__(self,  tar, val=float('inf')):
         AbsModifier.__init__(self, tar, val)
 
@@ -59,6 +104,9 @@ class LocRateModifier(AbsModifier):
 
         return tte/self.Value
 
+    def compose(self, comb):
+        return _compose_rate(self.Value, comb)
+
     def update(self, value, **kwargs):
         if self.Value is not value:
             self.Value = value
@@ -71,8 +119,28 @@ class LocRateModifier(AbsModifier):
 
 
 class GloRateModifier(AbsModifier):
+    __slots__ = ('__hazard', 'Version')
+    Shared = True
+
     def __init__(self, tar):
         AbsModifier.__init__(self, tar)
+        self.__hazard = None
+        self.Version = 0
+
+    @AbsModifier.Value.setter
+    def Value(self, val):
+        # shared by agents, so the change is found by its version rather than pushed to the owners
+        AbsModifier.Value.fset(self, val)
+        self.Version += 1
+
+    @property
+    def Hazard(self):
+        return self.__hazard
+
+    @Hazard.setter
+    def Hazard(self, hz):
+        self.__hazard = hz
+        self.Version += 1
 
     def modify(self, tte):
         if self.Value <= 0:
@@ -80,6 +148,9 @@ class GloRateModifier(AbsModifier):
 
         return tte/self.Value
 
+    def compose(self, comb):
+        return _compose_rate(self.Value, comb)
+
     def update(self, value, **kwargs):
         if self.Value is not value:
             self.Value = value
@@ -92,6 +163,8 @@ class GloRateModifier(AbsModifier):
 
 
 class NerfModifier(AbsModifier):
+    __slots__ = ()
+
     def __init__(self, tar, val=False):
         AbsModifier.__init__(self, tar, val)
 
@@ -101,6 +174,9 @@ class NerfModifier(AbsModifier):
         else:
             return tte
 
+    def compose(self, comb):
+        return (float('inf'), ()) if self.Value else comb
+
     def update(self, value, **kwargs):
         val = bool(value)
         if self.Value ^ val:
@@ -114,6 +190,8 @@ class NerfModifier(AbsModifier):
 
 
 class BuffModifier(AbsModifier):
+    __slots__ = ()
+
     def __init__(self, tar, val=True):
         AbsModifier.__init__(self, tar, val)
 
@@ -123,6 +201,9 @@ class BuffModifier(AbsModifier):
         else:
             return tte
 
+    def compose(self, comb):
+        return (0, ()) if self.Value else comb
+
     def update(self, value, **kwargs):
         val = bool(value)
         if self.Value ^ val:
@@ -137,16 +218,135 @@ class BuffModifier(AbsModifier):
 
 class ModifierSet:
     def __init__(self):
+        """
+        Modifiers of an agent, indexed by target transitions. The composed modification on each transition is
+        cached until the value of a modifier on it changes; changes of shared modifiers are found by their versions.
+        """
         self.Mods = OrderedDict()
+        self.Targets = dict()
+        self.Shared = dict()
+        self.Combined = dict()
 
     def __setitem__(self, name, mod):
+        old = self.Mods.get(name)
         self.Mods[name] = mod
+        if not mod.Shared:
+            mod.Owner = self
+
+        mods = self.Targets.setdefault(mod.Target, list())
+        if old is not None and old.Target is mod.Target:
+            # replaced in place, so the order of composition is kept
+            mods.insert(self.__discard(old), mod)
+        else:
+            if old is not None:
+                self.__discard(old)
+                self.Mods.move_to_end(name)
+            mods.append(mod)
+        if mod.Shared:
+            self.Shared.setdefault(mod.Target, list()).append(mod)
+        self.Combined.pop(mod.Target, None)
+
+    def __discard(self, mod):
+        tr = mod.Target
+        mods = self.Targets[tr]
+        i = next(i for i, m in enumerate(mods) if m is mod)
+        del mods[i]
+        if mod.Shared:
+            shared = self.Shared[tr]
+            del shared[next(j for j, m in enumerate(shared) if m is mod)]
+        self.Combined.pop(tr, None)
+        return i
 
     def __getitem__(self, name):
         return self.Mods[name]
 
     def on(self, tr):
-        return [mod for mod in self.Mods.values() if mod.Target == tr]
+        return self.Targets.get(tr, list())
+
+    def invalidate(self, tr):
+        """
+        Drop the cached modification on a transition
+        :param tr: target transition
+        """
+        self.Combined.pop(tr, None)
+
+    def __combine(self, tr):
+        comb, hazard = (None, ()), None
+        for mod in self.on(tr):
+            hz = _clock_of(mod)
+            if hz is not None:
+                if hazard is not None and hz is not hazard:
+                    raise ValueError('More than one lazy modifier on {}'.format(tr.Name))
+                hazard = hz
+                continue
+            if hazard is not None:
+                probe = mod.compose((None, ()))
+                if probe is not None and probe == mod.compose((1, ())):
+                    # overridden regardless of the preceding modifiers
+                    hazard = None
+            if comb is not None:
+                comb = mod.compose(comb)
+        return comb, hazard
+
+    def __version(self, tr):
+        # versions only increase, so their sum changes with any of them
+        ver = 0
+        for mod in self.Shared.get(tr, ()):
+            ver += mod.Version
+        return ver
+
+    def __lookup(self, tr):
+        comb = self.Combined.get(tr)
+        if comb is None or comb[2] != self.__version(tr):
+            comb = self.Combined[tr] = self.__combine(tr) + (self.__version(tr),)
+        return comb
+
+    def hazard_on(self, tr):
+        """
+        Find the hazard clock re-timing the transition lazily
+        :param tr: transition
+        :return: hazard clock; None if the transition is timed directly
+        """
+        return self.__lookup(tr)[1]
+
+    def scale(self, tr):
+        """
+        Factor of the modifiers on the rate of an exponential transition, with the modifiers timed by
+        a hazard clock left out
+        :param tr: transition
+        :return: factor; None if the modification is not proportional to the time to event
+        """
+        comb = self.__lookup(tr)[0]
+        if comb is None:
+            return None
+        const, divs = comb
+        if const is None:
+            f = 1
+            for div in divs:
+                f *= div
+            return f
+        return 0 if const == float('inf') else None
+
+    def modify(self, tr, tte):
+        """
+        Modify a time to event by all the modifiers on the transition, in order of appending.
+        The modifier with a hazard clock is left to the clock.
+        :param tr: transition
+        :param tte: time to event
+        :return: modified time to event
+        """
+        comb, hazard, _ = self.__lookup(tr)
+        if comb is None:
+            for mod in self.on(tr):
+                if hazard is None or _clock_of(mod) is not hazard:
+                    tte = mod.modify(tte)
+            return tte
+        const, divs = comb
+        if const is not None:
+            return const
+        for div in divs:
+            tte = tte / div
+        return tte
 
     def __repr__(self):
         return ', '.join(['{}={}'.format(k, v.Value) for k, v in self.Mods.items()])
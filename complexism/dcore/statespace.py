@@ -1,4 +1,7 @@
+import numpy as np
+from epidag.bayesnet.distribution import AbsDistribution
 from complexism.element import Event
+from complexism.misc.prob import sample_actor
 from .dynamics import AbsDynamicModel, Stock
 from abc import ABCMeta, abstractmethod
 
@@ -6,6 +9,32 @@ __author__ = 'TimeWz667'
 __all__ = ['Transition', 'State', 'AbsStateSpaceModel']
 
 
+def _find_frozen_rv(dist):
+    """
+    Find the frozen scipy distribution wrapped in a parameter-free distribution
+    :param dist: distribution, or an actor of distribution
+    :return: frozen distribution if found, None otherwise
+    """
+    while dist is not None and not hasattr(dist, 'random_state'):
+        dist = getattr(dist, 'Dist', None)
+    return dist
+
+
+def _find_frozen(dist):
+    """
+    Find the frozen scipy distribution and the parameter-free distribution wrapping it
+    :param dist: distribution, or an actor of distribution
+    :return: wrapper which samples n values by sample(n) (None if not found), frozen distribution;
+    None if no frozen distribution
+    """
+    wrapper = None
+    while dist is not None and not hasattr(dist, 'random_state'):
+        wrapper, dist = dist, getattr(dist, 'Dist', None)
+    if dist is None:
+        return None
+    return (wrapper if isinstance(wrapper, AbsDistribution) else None), dist
+
+
 class Transition:
     def __init__(self, name, st, dist):
         """
@@ -19,16 +48,95 @@ class Transition:
         self.Name = name
         self.Dist = dist
         self.State = st
+        self.BufferSize = 0
 
-    def rand(self, attr=None):
+    def set_buffer(self, size):
+        """
+        Draw times to event of a parameter-free distribution in vectorised batches, and serve them one by one
+        :param size: number of draws in a batch; 0 for drawing one at a time
+        """
+        self.BufferSize = int(size)
+
+    def __draw(self, src, n, rng):
+        wrapper, rv = src
+        if rng is not None or wrapper is None:
+            vs = rv.rvs(size=n, random_state=rng)
+        else:
+            vs = wrapper.sample(n)
+        return np.atleast_1d(vs)
+
+    def __buffer(self, rv, buffers):
+        try:
+            buf = buffers[self]
+        except KeyError:
+            buf = buffers[self] = [rv, list()]
+        if buf[0] is not rv:
+            # the distribution has been updated by an intervention
+            buf[0], buf[1] = rv, list()
+        return buf[1]
+
+    def rand(self, attr=None, rng=None, buffers=None):
         """
         Randomly sample a time to event
         :param attr: parent nodes
         :type attr: dict
+        :param rng: random number generator, the global state used if None
+        :type rng: numpy.random.Generator
+        :param buffers: times to event drawn from rng in advance, keyed by transition; not buffered if None
+        :type buffers: dict
         :return: time to event
         :rtype: float
         """
-        return self.Dist.sample(attr)
+        if self.BufferSize > 1 and buffers is not None:
+            src = _find_frozen(self.Dist)
+            if src is not None:
+                buf = self.__buffer(src[1], buffers)
+                if not buf:
+                    buf.extend(self.__draw(src, self.BufferSize, rng).tolist()[::-1])
+                return buf.pop()
+        return sample_actor(self.Dist, attr, rng)
+
+    def rand_many(self, n, attr=None, rng=None):
+        """
+        Randomly sample times to event at once
+        :param n: number of samples
+        :param attr: parent nodes
+        :param rng: random number generator, the global state used if None
+        :return: times to event
+        :rtype: np.ndarray
+        """
+        src = _find_frozen(self.Dist)
+        if src is None:
+            return np.array([sample_actor(self.Dist, attr, rng) for _ in range(n)], dtype=float)
+        return self.__draw(src, n, rng)
+
+    def reserve(self, n, rng=None, buffers=None):
+        """
+        Make sure at least n times to event buffered, drawn by a single call if needed
+        :param n: number of times to event to be used
+        :param rng: random number generator, the global state used if None
+        :param buffers: times to event drawn from rng in advance, keyed by transition
+        """
+        if self.BufferSize <= 1 or buffers is None:
+            return
+        src = _find_frozen(self.Dist)
+        if src is None:
+            return
+        buf = self.__buffer(src[1], buffers)
+        if len(buf) < n:
+            vs = self.__draw(src, max(n - len(buf), self.BufferSize), rng).tolist()
+            vs.reverse()
+            buf[:0] = vs
+
+    def get_rate(self):
+        """
+        Constant rate of the transition
+        :return: rate if the time to event is exponential without agent-level parameters; None otherwise
+        """
+        rv = _find_frozen_rv(self.Dist)
+        if rv is None or getattr(rv.dist, 'name', None) != 'expon' or rv.support()[0] != 0:
+            return None
+        return 1 / rv.mean()
 
     def __repr__(self):
         return 'Tr(Name: {}, To: {}, By: {})'.format(self.Name, self.State, self.Dist)
@@ -106,6 +214,7 @@ class AbsStateSpaceModel(AbsDynamicModel, metaclass=ABCMeta):
     """
     def __init__(self, name, js):
         AbsDynamicModel.__init__(self, name, js)
+        self.TransitionDiffs = dict()
 
     def compose_stock(self, key):
         return self.get_state_space()[key]
@@ -133,3 +242,28 @@ class AbsStateSpaceModel(AbsDynamicModel, metaclass=ABCMeta):
     @abstractmethod
     def isa(self, s0, s1):
         pass
+
+    def set_batch_sampling(self, size):
+        """
+        Sample times to event of parameter-free transitions in vectorised batches
+        :param size: number of draws in a batch; 0 for drawing one at a time
+        """
+        for tr in self.get_transition_space().values():
+            tr.set_buffer(size)
+
+    def get_transition_diff(self, fr, to):
+        """
+        Transitions disabled and enabled by moving from a state to another, cached for each pair of states
+        :param fr: state before
+        :param to: state after
+        :return: transitions disabled, transitions enabled in the order of the transitions of 'to'
+        :rtype: (tuple, tuple)
+        """
+        try:
+            return self.TransitionDiffs[fr, to]
+        except KeyError:
+            trs_fr = dict.fromkeys(self.get_transitions(fr))
+            trs_to = dict.fromkeys(self.get_transitions(to))
+            diff = tuple(tr for tr in trs_fr if tr not in trs_to), tuple(tr for tr in trs_to if tr not in trs_fr)
+            self.TransitionDiffs[fr, to] = diff
+            return diff
@@ -1,3 +1,4 @@
 from .event import *
+from .address import *
 from .scheduler import *
 from .ticker import *
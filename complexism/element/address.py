@@ -0,0 +1,86 @@
+__author__ = 'TimeWz667'
+__all__ = ['Address']
+
+
+class Address:
+    """
+    Interned address of a request or a disclosure, from the source (lowest) to the group (uppermost) model.
+    An address is a node linked to its lower address, so scaling up or down shares the path and
+    the same path is always represented by the same object.
+    """
+    __slots__ = ('Group', 'Lower', 'Source', 'Distance', '__uppers', '__where', '__address')
+
+    Roots = dict()
+
+    def __init__(self, group, lower=None):
+        self.Group = group
+        self.Lower = lower
+        self.Source = lower.Source if lower else group
+        self.Distance = lower.Distance + 1 if lower else 1
+        self.__uppers = dict()
+        self.__where = None
+        self.__address = None
+
+    @staticmethod
+    def root(loc):
+        try:
+            return Address.Roots[loc]
+        except KeyError:
+            adr = Address.Roots[loc] = Address(loc)
+            return adr
+
+    @staticmethod
+    def from_path(where):
+        """
+        Find the interned address of a path
+        :param where: location, sequence of locations or an address
+        :return: address
+        :rtype: Address
+        """
+        if isinstance(where, Address):
+            return where
+        if isinstance(where, str):
+            return Address.root(where)
+        adr = Address.root(where[0])
+        for loc in where[1:]:
+            adr = adr.up_scale(loc)
+        return adr
+
+    def up_scale(self, loc):
+        """
+        Append upper location into address
+        :param loc: upper position
+        :return: extended address
+        """
+        try:
+            return self.__uppers[loc]
+        except KeyError:
+            adr = self.__uppers[loc] = Address(loc, self)
+            return adr
+
+    def down_scale(self):
+        """
+        Remove the uppermost location
+        :return: upper location and the lower address
+        """
+        return self.Group, self.Lower
+
+    @property
+    def Where(self):
+        if self.__where is None:
+            self.__where = (self.Lower.Where if self.Lower else ()) + (self.Group,)
+        return self.__where
+
+    def __str__(self):
+        if self.__address is None:
+            self.__address = '@'.join(self.Where)
+        return self.__address
+
+    def __repr__(self):
+        return 'Address({})'.format(str(self))
+
+    def __len__(self):
+        return self.Distance
+
+    def __reduce__(self):
+        return Address.from_path, (self.Where,)
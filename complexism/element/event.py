@@ -3,6 +3,8 @@ __all__ = ['Event']
 
 
 class Event:
+    __slots__ = ('Time', 'Todo', '__message')
+
     NullEvent = None
 
     def __init__(self, td, ti, msg=None):
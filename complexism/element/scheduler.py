@@ -1,7 +1,9 @@
 from abc import ABCMeta, abstractmethod
 from collections import Counter
 import heapq
+from types import MappingProxyType
 from .event import Event
+from .address import Address
 __author__ = 'TimeWz667'
 __all__ = ['get_scheduler', 'DefaultScheduler', 'Request', 'Disclosure']
 
@@ -9,32 +11,46 @@ __all__ = ['get_scheduler', 'DefaultScheduler', 'Request', 'Disclosure']
 DefaultScheduler = 'Looping'
 
 
+def _restore_disclosure(what, who, path, kwargs):
+    dis = Disclosure.__new__(Disclosure)
+    dis.What, dis.Who, dis.Path, dis.Arguments = what, who, path, MappingProxyType(kwargs)
+    return dis
+
+
 class Disclosure:
+    __slots__ = ('What', 'Who', 'Path', 'Arguments')
+
     def __init__(self, what, who, where, **kwargs):
         self.What = str(what)
         self.Who = who
-        self.Where = [where] if isinstance(where, str) else where
-        self.Arguments = dict(kwargs)
+        self.Path = Address.from_path(where)
+        self.Arguments = MappingProxyType(kwargs)
 
     def __getitem__(self, item):
         return self.Arguments[item]
 
+    def __reduce__(self):
+        return _restore_disclosure, (self.What, self.Who, self.Path, dict(self.Arguments))
+
+    def __relocate(self, path):
+        dis = Disclosure.__new__(Disclosure)
+        dis.What, dis.Who, dis.Path, dis.Arguments = self.What, self.Who, path, self.Arguments
+        return dis
+
     def up_scale(self, adr):
         """
         Append upper address into address
         :param adr: upper position
         :return: extended disclosure
         """
-        new_adr = self.Where + [adr]
-        return Disclosure(self.What, self.Who, new_adr, **self.Arguments)
+        return self.__relocate(self.Path.up_scale(adr))
 
     def sibling_scale(self):
         """
         Append a sibling indicator into address
         :return: extended disclosure
         """
-        new_adr = self.Where + ['^']
-        return Disclosure(self.What, self.Who, new_adr, **self.Arguments)
+        return self.__relocate(self.Path.up_scale('^'))
 
     def down_scale(self):
         """
@@ -42,27 +58,30 @@ class Disclosure:
         :return: upper address and reformed request
         :rtype: tuple
         """
-        new_adr = self.Where[:-1]
-        return self.Where[-1], Disclosure(self.What, self.Who, new_adr, **self.Arguments)
+        return self.Path.Group, self.__relocate(self.Path.Lower)
+
+    @property
+    def Where(self):
+        return self.Path.Where
 
     @property
     def Distance(self):
-        return len(self.Where)
+        return self.Path.Distance
 
     def is_sibling(self):
-        return self.Where[-1] == '^' and len(self.Where) is 2
+        return self.Path.Group == '^' and self.Path.Distance == 2
 
     @property
     def Address(self):
-        return '@'.join(self.Where)
+        return str(self.Path)
 
     @property
     def Group(self):
-        return self.Where[-1]
+        return self.Path.Group
 
     @property
     def Source(self):
-        return self.Where[0]
+        return self.Path.Source
 
     def __repr__(self):
         if self.Arguments:
@@ -81,11 +100,13 @@ class Disclosure:
 
 
 class Request:
+    __slots__ = ('Who', 'Path', 'Event')
+
     NullRequest = None
 
     def __init__(self, evt: Event, who, where):
         self.Who = who
-        self.Where = [where] if isinstance(where, str) else where
+        self.Path = Address.from_path(where)
         self.Event = evt
 
     @property
@@ -100,16 +121,20 @@ class Request:
     def What(self):
         return self.Event.Todo
 
+    @property
+    def Where(self):
+        return self.Path.Where
+
     @property
     def Address(self):
-        return '@'.join(self.Where)
+        return str(self.Path)
 
     @property
     def Group(self):
-        return self.Where[-1]
+        return self.Path.Group
 
     def to_disclosure(self):
-        return Disclosure(self.Message, self.Who, self.Where)
+        return Disclosure(self.Message, self.Who, self.Path)
 
     def __repr__(self):
         return 'Request({} want to do {} in {} when t={:.3f})'.format(self.Who, self.Message, self.Address, self.When)
@@ -123,8 +148,7 @@ class Request:
         :param adr: upper position
         :return: extended request
         """
-        new_adr = self.Where + [adr]
-        return Request(self.Event, self.Who, new_adr)
+        return Request(self.Event, self.Who, self.Path.up_scale(adr))
 
     def down_scale(self):
         """
@@ -133,11 +157,10 @@ class Request:
         """
         if self.reached():
             raise AttributeError('It is the lowest scale')
-        new_adr = self.Where[:-1]
-        return self.Where[-1], Request(self.Event, self.Who, new_adr)
+        return self.Path.Group, Request(self.Event, self.Who, self.Path.Lower)
 
     def reached(self):
-        return len(self.Where) is 1
+        return self.Path.Distance == 1
 
     def __gt__(self, ot):
         return self.When > ot.When
@@ -158,6 +181,10 @@ def get_scheduler(loc, tp=None):
         return PriorityQueueScheduler(loc)
     elif tp == 'Looping':
         return LoopingScheduler(loc)
+    elif tp == 'IndexedHeap':
+        return IndexedHeapScheduler(loc)
+    elif tp == 'Calendar':
+        return CalendarQueueScheduler(loc)
     else:
         raise TypeError('Unknown scheduler type')
 
@@ -173,14 +200,45 @@ class AbsScheduler(metaclass=ABCMeta):
         self.Disclosures = list()
         self.NumAtoms = 0
         self.Counter = Counter()
+        self.Dirty = True
+        self.Parent = None
+        self.DirtyLowers = set()
 
     def __len__(self):
         return len(self.Requests) + len(self.Disclosures)
 
+    def mark_dirty(self):
+        """
+        Flag that the next requests may have changed and notify the upper scheduler
+        """
+        if not self.Dirty:
+            self.Dirty = True
+            if self.Parent is not None:
+                self.Parent.mark_lower_dirty(self.Location)
+
+    def mark_lower_dirty(self, loc):
+        """
+        Flag that the schedule of a lower model has changed
+        :param loc: location of the lower scheduler
+        """
+        self.DirtyLowers.add(loc)
+        self.mark_dirty()
+
+    def clean(self):
+        self.Dirty = False
+
     def add_atom(self, atom):
         self.join_scheduler(atom)
         atom.set_scheduler(self)
         self.NumAtoms += 1
+        self.mark_dirty()
+
+    def add_atoms(self, atoms):
+        for atom in atoms:
+            self.join_scheduler(atom)
+            atom.set_scheduler(self)
+        self.NumAtoms += len(atoms)
+        self.mark_dirty()
 
     def remove_atom(self, atom):
         atom.drop_next()
@@ -188,6 +246,16 @@ class AbsScheduler(metaclass=ABCMeta):
         self.leave_scheduler(atom)
         self.pop_from_upcoming(atom)
         self.NumAtoms -= 1
+        self.mark_dirty()
+
+    def remove_atoms(self, atoms):
+        for atom in atoms:
+            atom.drop_next()
+            atom.detach_scheduler()
+            self.leave_scheduler(atom)
+            self.pop_from_upcoming(atom)
+        self.NumAtoms -= len(atoms)
+        self.mark_dirty()
 
     @abstractmethod
     def join_scheduler(self, atom):
@@ -214,6 +282,15 @@ class AbsScheduler(metaclass=ABCMeta):
         self.add_atom(atom)
         self.await(atom)
 
+    def add_scheduler_atoms(self, atoms):
+        """
+        Add atoms at once, which are queued together when the schedule is next updated
+        :param atoms: list of atoms
+        """
+        self.add_atoms(atoms)
+        for atom in atoms:
+            self.await(atom)
+
     @abstractmethod
     def reschedule_all(self):
         pass
@@ -229,7 +306,7 @@ class AbsScheduler(metaclass=ABCMeta):
     def extract_current_request(self):
         for atom in self.Upcoming:
             event = atom.Next
-            self.AtomRequests[atom] = Request(event, atom.Name, self.Location)
+            self.AtomRequests[atom] = Request(event, atom.Id, self.Location)
 
     def check_current_requests(self):
         if self.NumAtoms <= 0:
@@ -276,6 +353,7 @@ class AbsScheduler(metaclass=ABCMeta):
 
     def append_request_from_source(self, event, who):
         # todo validate
+        self.mark_dirty()
         if event.Time < self.GloTime:
             self.Requests = [Request(event, who, self.Location)]
             self.GloTime = event.Time
@@ -308,6 +386,7 @@ class AbsScheduler(metaclass=ABCMeta):
         :param dss: message to be exposed
         """
         self.Disclosures.append(dss)
+        self.mark_dirty()
 
     def append_disclosure_from_source(self, msg, who, **kwargs):
         dss = Disclosure(msg, who, self.Location, **kwargs)
@@ -341,6 +420,7 @@ class AbsScheduler(metaclass=ABCMeta):
         self.AtomRequests = dict()
         self.Upcoming.clear()
         self.OwnTime = float('inf')
+        self.mark_dirty()
 
     def cycle_completed(self):
         """
@@ -359,26 +439,28 @@ class AbsScheduler(metaclass=ABCMeta):
 class LoopingScheduler(AbsScheduler):
     def __init__(self, location):
         AbsScheduler.__init__(self, location)
-        self.Atoms = list()
+        self.Atoms = dict()
         self.Waiting = set()
 
     def join_scheduler(self, atom):
-        self.Atoms.append(atom)
+        self.Atoms[atom] = None
         self.Waiting.add(atom)
 
     def leave_scheduler(self, atom):
-        self.Atoms.remove(atom)
+        del self.Atoms[atom]
         self.Waiting.remove(atom)
 
     def await(self, atom):
         self.Waiting.add(atom)
         self.pop_from_upcoming(atom)
+        self.mark_dirty()
 
     def reschedule_all(self):
         self.Upcoming.clear()
         self.OwnTime = float('inf')
         self.reschedule_set(self.Atoms)
         self.Waiting.clear()
+        self.mark_dirty()
 
     def reschedule_waiting(self):
         if self.Upcoming:
@@ -425,6 +507,7 @@ class PriorityQueueScheduler(AbsScheduler):
     def await(self, atom):
         self.Waiting.add(atom)
         self.pop_from_upcoming(atom)
+        self.mark_dirty()
 
     def reschedule_all(self):
         self.Upcoming.clear()
@@ -433,18 +516,20 @@ class PriorityQueueScheduler(AbsScheduler):
         self.Waiting.update(a for _, a, _ in self.Queue)
         self.Queue = list()
         self.reschedule_waiting()
+        self.mark_dirty()
 
     def reschedule_waiting(self):
-        atoms = list(self.Waiting)
-        for atom in atoms:
-            event = atom.Next
-            tte = event.Time
-            entry = (tte, atom, event)
-            heapq.heappush(self.Queue, entry)
+        entries = [(atom.Next.Time, atom, atom.Next) for atom in self.Waiting]
+        if len(entries) > len(self.Queue):
+            self.Queue += entries
+            heapq.heapify(self.Queue)
+        else:
+            for entry in entries:
+                heapq.heappush(self.Queue, entry)
 
-            if tte < self.OwnTime:
-                self.Upcoming.clear()
-                self.OwnTime = float('Inf')
+        if entries and min(entries, key=lambda e: e[0])[0] < self.OwnTime:
+            self.Upcoming.clear()
+            self.OwnTime = float('Inf')
 
         self.Counter['Requeuing'] += len(self.Waiting)
         self.Waiting.clear()
@@ -488,3 +573,249 @@ class PriorityQueueScheduler(AbsScheduler):
                 return t
         else:
             return float('inf')
+
+
+class IndexedHeapScheduler(AbsScheduler):
+    def __init__(self, location):
+        AbsScheduler.__init__(self, location)
+        self.Heap = list()
+        self.Slots = dict()
+        self.Waiting = set()
+
+    def join_scheduler(self, atom):
+        self.Waiting.add(atom)
+
+    def leave_scheduler(self, atom):
+        self.Waiting.discard(atom)
+        try:
+            i = self.Slots.pop(atom)
+        except KeyError:
+            return
+
+        last = self.Heap.pop()
+        if i < len(self.Heap):
+            self.Heap[i] = last
+            self.Slots[last[1]] = i
+            self.__sift(i)
+
+    def await(self, atom):
+        self.Waiting.add(atom)
+        self.pop_from_upcoming(atom)
+        self.mark_dirty()
+
+    def reschedule_all(self):
+        self.Waiting.update(self.Slots.keys())
+        self.Heap = [[atom.Next.Time, atom] for atom in self.Waiting]
+        self.Heap.sort(key=lambda x: x[0])
+        self.Slots = {atom: i for i, (_, atom) in enumerate(self.Heap)}
+
+        self.Counter['Requeuing'] += len(self.Waiting)
+        self.Waiting.clear()
+        self.find_upcoming_atoms()
+        self.mark_dirty()
+
+    def reschedule_waiting(self):
+        if len(self.Waiting) > len(self.Heap):
+            # many atoms at once, e.g. a bulk birth; re-ordering the whole heap is cheaper
+            for atom in self.Waiting:
+                try:
+                    self.Heap[self.Slots[atom]][0] = atom.Next.Time
+                except KeyError:
+                    self.Heap.append([atom.Next.Time, atom])
+            self.Heap.sort(key=lambda x: x[0])
+            self.Slots = {atom: i for i, (_, atom) in enumerate(self.Heap)}
+        else:
+            for atom in self.Waiting:
+                tte = atom.Next.Time
+                try:
+                    i = self.Slots[atom]
+                    self.Heap[i][0] = tte
+                except KeyError:
+                    i = len(self.Heap)
+                    self.Heap.append([tte, atom])
+                    self.Slots[atom] = i
+                self.__sift(i)
+
+        self.Counter['Requeuing'] += len(self.Waiting)
+        self.Waiting.clear()
+        self.find_upcoming_atoms()
+
+    def find_upcoming_atoms(self):
+        self.Upcoming.clear()
+        if not self.Heap:
+            self.OwnTime = float('inf')
+            return
+
+        self.OwnTime = ti = self.Heap[0][0]
+        if ti == float('inf'):
+            return
+
+        # collect every atom tied with the root; the tied entries form a subtree at the top
+        to_check = [0]
+        n = len(self.Heap)
+        while to_check:
+            i = to_check.pop()
+            t, atom = self.Heap[i]
+            if t == ti:
+                self.Upcoming.add(atom)
+                to_check += [j for j in (2 * i + 1, 2 * i + 2) if j < n]
+
+    def __sift(self, i):
+        heap, slots = self.Heap, self.Slots
+        entry = heap[i]
+        t = entry[0]
+
+        # move up
+        while i > 0:
+            j = (i - 1) >> 1
+            parent = heap[j]
+            if t < parent[0]:
+                heap[i] = parent
+                slots[parent[1]] = i
+                i = j
+            else:
+                break
+
+        # move down
+        n = len(heap)
+        while True:
+            j = 2 * i + 1
+            if j >= n:
+                break
+            if j + 1 < n and heap[j + 1][0] < heap[j][0]:
+                j += 1
+            child = heap[j]
+            if child[0] < t:
+                heap[i] = child
+                slots[child[1]] = i
+                i = j
+            else:
+                break
+
+        heap[i] = entry
+        slots[entry[1]] = i
+
+
+class CalendarQueueScheduler(AbsScheduler):
+    MinBuckets = 2
+    SampleSize = 25
+
+    def __init__(self, location, width=1):
+        AbsScheduler.__init__(self, location)
+        self.Width = width
+        self.Buckets = [dict() for _ in range(CalendarQueueScheduler.MinBuckets)]
+        self.Slots = dict()
+        self.Idle = set()
+        self.Waiting = set()
+        self.Size = 0
+        self.Cursor = float('inf')
+
+    def join_scheduler(self, atom):
+        self.Waiting.add(atom)
+
+    def leave_scheduler(self, atom):
+        self.Waiting.discard(atom)
+        if atom in self.Slots:
+            self.__delete(atom)
+            self.__resize()
+
+    def await(self, atom):
+        self.Waiting.add(atom)
+        self.pop_from_upcoming(atom)
+        self.mark_dirty()
+
+    def reschedule_all(self):
+        self.Waiting.update(self.Slots.keys())
+        self.Slots = dict()
+        self.Idle.clear()
+        for atom in self.Waiting:
+            tte = atom.Next.Time
+            if tte == float('inf'):
+                self.Idle.add(atom)
+                self.Slots[atom] = None
+            else:
+                self.Slots[atom] = tte
+        self.Counter['Requeuing'] += len(self.Waiting)
+        self.Waiting.clear()
+
+        nb = CalendarQueueScheduler.MinBuckets
+        while 2 * nb < len(self.Slots) - len(self.Idle):
+            nb *= 2
+        self.__rebuild(nb)
+        self.find_upcoming_atoms()
+        self.mark_dirty()
+
+    def reschedule_waiting(self):
+        for atom in self.Waiting:
+            if atom in self.Slots:
+                self.__delete(atom)
+            self.__insert(atom, atom.Next.Time)
+        self.Counter['Requeuing'] += len(self.Waiting)
+        self.Waiting.clear()
+
+        self.__resize()
+        self.find_upcoming_atoms()
+
+    def find_upcoming_atoms(self):
+        self.Upcoming.clear()
+        if not self.Size:
+            self.OwnTime = float('inf')
+            return
+
+        nb, w = len(self.Buckets), self.Width
+        day = int(self.Cursor // w)
+        for d in range(day, day + nb):
+            bucket = self.Buckets[d % nb]
+            ti = min((t for t in bucket.values() if t // w == d), default=float('inf'))
+            if ti < float('inf'):
+                break
+        else:
+            # nothing within a year of the cursor; fall back to a direct search
+            ti = min(min(b.values()) for b in self.Buckets if b)
+            bucket = self.Buckets[int(ti // w) % nb]
+
+        self.Cursor = self.OwnTime = ti
+        self.Upcoming.update(atom for atom, t in bucket.items() if t == ti)
+
+    def __insert(self, atom, tte):
+        if tte == float('inf'):
+            self.Idle.add(atom)
+            self.Slots[atom] = None
+            return
+        self.Buckets[int(tte // self.Width) % len(self.Buckets)][atom] = tte
+        self.Slots[atom] = tte
+        self.Size += 1
+        if tte < self.Cursor:
+            self.Cursor = tte
+
+    def __delete(self, atom):
+        tte = self.Slots.pop(atom)
+        if tte is None:
+            self.Idle.discard(atom)
+        else:
+            del self.Buckets[int(tte // self.Width) % len(self.Buckets)][atom]
+            self.Size -= 1
+
+    def __resize(self):
+        nb = len(self.Buckets)
+        while self.Size > 2 * nb:
+            nb *= 2
+        while self.Size < nb / 2 and nb > CalendarQueueScheduler.MinBuckets:
+            nb //= 2
+        if nb != len(self.Buckets):
+            self.__rebuild(nb)
+
+    def __rebuild(self, nb):
+        ts = [t for t in self.Slots.values() if t is not None]
+        self.Size = len(ts)
+        self.Cursor = min(ts, default=float('inf'))
+
+        # bucket width from the mean separation of the earliest events
+        ts = sorted(set(heapq.nsmallest(CalendarQueueScheduler.SampleSize, ts)))
+        if len(ts) > 1:
+            self.Width = 3 * (ts[-1] - ts[0]) / (len(ts) - 1)
+
+        self.Buckets = [dict() for _ in range(max(nb, CalendarQueueScheduler.MinBuckets))]
+        for atom, tte in self.Slots.items():
+            if tte is not None:
+                self.Buckets[int(tte // self.Width) % len(self.Buckets)][atom] = tte
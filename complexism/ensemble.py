@@ -0,0 +1,101 @@
+import multiprocessing as mp
+import traceback
+from collections import namedtuple
+import numpy as np
+import numpy.random as rd
+from complexism.fn import simulate
+
+__author__ = 'TimeWz667'
+__all__ = ['Replicate', 'generate_seeds', 'iter_ensemble', 'simulate_ensemble']
+
+
+Replicate = namedtuple('Replicate', ('Index', 'Seed', 'Output', 'Error'))
+
+_Director = None
+
+
+def generate_seeds(n, seed=None):
+    """
+    Generate independent seeds for replicates
+    :param n: number of replicates
+    :param seed: seed of the ensemble
+    :return: list of seeds
+    """
+    return [int(ss.generate_state(1)[0]) for ss in np.random.SeedSequence(seed).spawn(n)]
+
+
+def _initialise_worker(da):
+    global _Director
+    _Director = da
+
+
+def _run_replicate(job):
+    i, seed, sim_model, pars, y0, fr, to, dt, mid = job
+    try:
+        rd.seed(seed)
+        if isinstance(pars, dict):
+            model = _Director.generate_model('{}_{}'.format(sim_model, i), sim_model, **pars)
+        else:
+            model = _Director.generate_model('{}_{}'.format(sim_model, i), sim_model, pc=pars)
+        if model is None:
+            raise ValueError('Undefined parameter information')
+        y0 = y0 if y0 is not None else _Director.get_y0s(sim_model)
+        out = simulate(model, y0, fr, to, dt, seed=seed, mid=mid)
+        return Replicate(i, seed, out, None)
+    except Exception:
+        return Replicate(i, seed, None, traceback.format_exc())
+
+
+def iter_ensemble(da, sim_model, y0, fr, to, dt=1, pars=None, seeds=None, n=None, seed=None, mid=False,
+                  n_core=None):
+    """
+    Simulate replicates of a model blueprint in parallel, and yield the replicates as they are finished.
+    Each replicate is reproducible from its own seed whatever the number of workers.
+    :param da: director with the model blueprint
+    :param sim_model: name of simulation model blueprint
+    :param y0: initial values, generated from the blueprint for each replicate if None
+    :param fr: initial time point
+    :param to: end time
+    :param dt: observation interval
+    :param pars: a parameter core, keyword arguments of da.generate_model (e.g. {'bn': 'pSIR'}), or a list of them
+    :param seeds: list of seeds of replicates
+    :param n: number of replicates if seeds not given
+    :param seed: seed for generating seeds of replicates
+    :param mid: output middle point observation
+    :param n_core: number of worker processes, all available cores if None; 1 for running in this process
+    :return: generator of Replicate(Index, Seed, Output, Error)
+    """
+    if seeds is None:
+        if n is None:
+            n = len(pars) if isinstance(pars, list) else 1
+        seeds = generate_seeds(n, seed)
+    n = len(seeds)
+    if not isinstance(pars, list):
+        pars = [pars] * n
+    if len(pars) != n:
+        raise ValueError('Numbers of parameter sets and seeds do not match')
+
+    jobs = [(i, s, sim_model, p, y0, fr, to, dt, mid) for i, (p, s) in enumerate(zip(pars, seeds))]
+
+    n_core = n_core if n_core else mp.cpu_count()
+    if n_core <= 1 or n <= 1:
+        _initialise_worker(da)
+        for job in jobs:
+            yield _run_replicate(job)
+        return
+
+    with mp.Pool(min(n_core, n), initializer=_initialise_worker, initargs=(da,)) as pool:
+        for rep in pool.imap_unordered(_run_replicate, jobs):
+            yield rep
+
+
+def simulate_ensemble(da, sim_model, y0, fr, to, dt=1, pars=None, seeds=None, n=None, seed=None, mid=False,
+                      n_core=None):
+    """
+    Simulate replicates of a model blueprint in parallel
+    :return: list of Replicate ordered by index
+    """
+    reps = list(iter_ensemble(da, sim_model, y0, fr, to, dt, pars=pars, seeds=seeds, n=n, seed=seed, mid=mid,
+                              n_core=n_core))
+    reps.sort(key=lambda r: r.Index)
+    return reps
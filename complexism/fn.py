@@ -13,7 +13,7 @@ __all__ = [
     'new_dbp', 'read_dbp_json', 'read_dbp_script', 'save_dbp',
     'new_mbp', # 'read_mbp_json', 'save_mbp',
     # 'new_lyo', 'read_lyo_json', 'save_lyo',
-    'simulate', 'update'
+    'simulate', 'update', 'fork'
 ]
 
 
@@ -120,7 +120,7 @@ def save_mbp(mbp, path):
 #     save_json(layout.to_json(), path)
 
 
-def simulate(model, y0, fr, to, dt=1, seed=None, mid=False, log=True):
+def simulate(model, y0, fr, to, dt=1, seed=None, mid=False, log=False):
     """
     Simulate a dynamic model with initial values (y0)
     :param model: dynamic model
@@ -130,7 +130,7 @@ def simulate(model, y0, fr, to, dt=1, seed=None, mid=False, log=True):
     :param dt: observation interval
     :param seed: seed for random number generation
     :param mid: output middle point observation
-    :param log: keep log or not
+    :param log: keep a binary event log or not, or an EventLog to be written in
     :return: data of simulation
     """
     if model.TimeEnd:
@@ -140,13 +140,13 @@ def simulate(model, y0, fr, to, dt=1, seed=None, mid=False, log=True):
     return model.output(mid=mid)
 
 
-def update(model, to, dt=1, log=True):
+def update(model, to, dt=1, log=False):
     """
     Update a dynamic to a certain time point
     :param model: dynamic model which has been initialised
     :param to: end time
     :param dt: observation interval
-    :param log: keep log or not
+    :param log: keep a binary event log or not, or an EventLog to be written in
     :return: data of simulation
     """
     sim = Simulator(model, keep_log=log, new_log=False)
@@ -154,3 +154,20 @@ def update(model, to, dt=1, log=True):
     if to > sim.Time:
         sim.update(to, dt)
     return model.output()
+
+
+def fork(model, scenarios, to, dt=1, mid=False, n_core=None):
+    """
+    Continue a dynamic model in scenarios branched from its current state
+    :param model: dynamic model which has been initialised
+    :param scenarios: dict of scenario name and intervention, either a function fn(model, ti) or keyword arguments
+     of model.shock
+    :param to: end time
+    :param dt: observation interval
+    :param mid: output middle point observation
+    :param n_core: maximum number of scenarios running at once, all available cores if None
+    :return: dict of scenario name and data of simulation
+    """
+    sim = Simulator(model)
+    sim.Time = model.TimeEnd
+    return sim.fork(scenarios, to, dt, mid=mid, n_core=n_core)
@@ -1,3 +1,4 @@
+from .obssink import *
 from .observer import *
 from .selector import *
 from .impchecker import *
@@ -6,7 +7,9 @@ from .communicator import *
 from .validator import *
 from .y0 import *
 from .modelnode import *
+from .eventlog import *
 from .simulator import *
+from .checkpoint import *
 from .blueprint import *
 
 __author__ = 'TimeWz667'
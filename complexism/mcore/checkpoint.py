@@ -0,0 +1,105 @@
+import copyreg
+import gzip
+import io
+import pickle
+import types
+import numpy.random as rd
+
+__author__ = 'TimeWz667'
+__all__ = ['save_checkpoint', 'load_checkpoint', 'dumps_checkpoint', 'loads_checkpoint']
+
+
+CheckpointVersion = 1
+
+
+def _instance_dict(obj):
+    for cls in type(obj).__mro__:
+        d = cls.__dict__.get('__dict__')
+        if isinstance(d, types.GetSetDescriptorType):
+            return d.__get__(obj)
+    return dict()
+
+
+def _reduce_shadowed(obj):
+    # attributes are restored by setattr, as the state of slots
+    return copyreg.__newobj__, (type(obj),), (None, dict(_instance_dict(obj)))
+
+
+class _DispatchTable(dict):
+    """
+    Reducers of classes of which __dict__ is shadowed by a method (e.g. ParameterCore of epidag);
+    such objects can be pickled but not unpickled in the default way
+    """
+    def __missing__(self, cls):
+        for c in cls.__mro__:
+            if '__dict__' in c.__dict__:
+                if isinstance(c.__dict__['__dict__'], types.FunctionType):
+                    self[cls] = _reduce_shadowed
+                    return _reduce_shadowed
+                break
+        raise KeyError(cls)
+
+
+class _Pickler(pickle.Pickler):
+    dispatch_table = _DispatchTable(copyreg.dispatch_table)
+
+
+def _pack(model):
+    return {
+        'Version': CheckpointVersion,
+        'Time': model.TimeEnd,
+        'Model': model,
+        'GlobalRNG': rd.get_state()
+    }
+
+
+def _unpack(js, restore_rng):
+    if js.get('Version') != CheckpointVersion:
+        raise ValueError('Unknown checkpoint version')
+    if restore_rng:
+        rd.set_state(js['GlobalRNG'])
+    return js['Model']
+
+
+def dumps_checkpoint(model):
+    """
+    Serialise a model tree with its states and random number generators to bytes
+    :param model: model to be saved
+    :return: checkpoint
+    :rtype: bytes
+    """
+    buf = io.BytesIO()
+    _Pickler(buf, protocol=pickle.HIGHEST_PROTOCOL).dump(_pack(model))
+    return gzip.compress(buf.getvalue(), compresslevel=6)
+
+
+def loads_checkpoint(bs, restore_rng=True):
+    """
+    Restore a model tree from bytes
+    :param bs: checkpoint
+    :param restore_rng: True if the global state of numpy.random should be restored
+    :return: the model, ready to be updated
+    """
+    return _unpack(pickle.loads(gzip.decompress(bs)), restore_rng)
+
+
+def save_checkpoint(model, path):
+    """
+    Save a model tree with its states and random number generators to a compressed binary file.
+    The model can be restored by load_checkpoint and continued by complexism.update
+    :param model: model to be saved
+    :param path: path of the checkpoint file
+    """
+    with gzip.open(path, 'wb', compresslevel=6) as f:
+        _Pickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(_pack(model))
+
+
+def load_checkpoint(path, restore_rng=True):
+    """
+    Restore a model tree from a checkpoint file
+    :param path: path of the checkpoint file
+    :param restore_rng: True if the global state of numpy.random should be restored
+    :return: the model, ready to be updated
+    """
+    with gzip.open(path, 'rb') as f:
+        return _unpack(pickle.load(f), restore_rng)
@@ -0,0 +1,174 @@
+import json
+import os
+import struct
+import numpy as np
+import pandas as pd
+from complexism.element import Address
+
+__author__ = 'TimeWz667'
+__all__ = ['EventLog', 'read_event_log']
+
+
+RecordFormat = struct.Struct('<dBIII')
+RecordType = np.dtype([('Time', '<f8'), ('Kind', 'u1'), ('Who', '<u4'), ('Event', '<u4'), ('Address', '<u4')])
+Kinds = ['Request', 'Disclosure']
+
+
+class EventLog:
+    def __init__(self, path=None, new=True, buffer_size=65536, namer=None):
+        """
+        Binary log of requests and disclosures. Each record is a fixed-width tuple of
+        (time, kind, who, event, address) where the last three are codes of symbol tables.
+        Symbols are appended to a sidecar file of json lines when new ones are flushed, and requesters are
+        named when flushed or read; nothing is formatted while recording.
+        :param path: path of the log file, the log is kept in memory if None
+        :param new: True if an existing log file should be replaced
+        :param buffer_size: size of buffer in bytes before written to file
+        :param namer: function(who, address) giving the name of a requester whose Who is an id keyed in its model;
+        the Who is taken as the name if None
+        """
+        self.Path = path
+        self.BufferSize = buffer_size
+        self.Buffer = bytearray()
+        self.Namer = namer
+        # requesters are keyed by (who, address), since ids are unique only within a model
+        self.Who, self.Event, self.Address = dict(), dict(), dict()
+        self.Keys = {'Who': list(), 'Event': list(), 'Address': list()}
+        self.Names = list()
+        self.NumWritten = {'Who': 0, 'Event': 0, 'Address': 0}
+
+        if path:
+            if new or not os.path.exists(path):
+                for p in [path, self.SymbolPath]:
+                    with open(p, 'wb'):
+                        pass
+            else:
+                self.__load_symbols()
+
+    @property
+    def SymbolPath(self):
+        return '{}.sym'.format(self.Path)
+
+    @staticmethod
+    def __code(table, keys, key):
+        try:
+            return table[key]
+        except KeyError:
+            code = table[key] = len(keys)
+            keys.append(key)
+            return code
+
+    def record_requests(self, requests, ti):
+        code, pack, buf, keys = EventLog.__code, RecordFormat.pack, self.Buffer, self.Keys
+        who, evt, adr = keys['Who'], keys['Event'], keys['Address']
+        for req in requests:
+            buf += pack(ti, 0, code(self.Who, who, (req.Who, req.Path)), code(self.Event, evt, req.Message),
+                        code(self.Address, adr, req.Path))
+        if self.Path and len(buf) >= self.BufferSize:
+            self.flush()
+
+    def record_disclosures(self, disclosures, ti):
+        code, pack, buf, keys = EventLog.__code, RecordFormat.pack, self.Buffer, self.Keys
+        who, evt, adr = keys['Who'], keys['Event'], keys['Address']
+        for dis in disclosures:
+            buf += pack(ti, 1, code(self.Who, who, (dis.Who, dis.Path)), code(self.Event, evt, dis.What),
+                        code(self.Address, adr, dis.Path))
+        if self.Path and len(buf) >= self.BufferSize:
+            self.flush()
+
+    def flush(self):
+        if not self.Path:
+            return
+        lines = self.__new_symbols()
+        if lines:
+            with open(self.SymbolPath, 'a') as f:
+                f.writelines(lines)
+        with open(self.Path, 'ab') as f:
+            f.write(self.Buffer)
+        self.Buffer = bytearray()
+
+    def __name(self):
+        keys, names = self.Keys['Who'], self.Names
+        for w, p in keys[len(names):]:
+            names.append(str(self.Namer(w, p) if self.Namer else w))
+        return names
+
+    def __new_symbols(self):
+        # only the symbols coded since the last flush, one json line each
+        self.__name()
+        lines = list()
+        for k, keys in self.Keys.items():
+            n = self.NumWritten[k]
+            for i in range(n, len(keys)):
+                if k == 'Who':
+                    w, p = keys[i]
+                    # typed keys, so an integer id and a string name stay apart when the log is reopened
+                    sym = [k, w if isinstance(w, int) else str(w), str(p), self.Names[i]]
+                else:
+                    sym = [k, str(keys[i])]
+                lines.append(json.dumps(sym) + '\n')
+            self.NumWritten[k] = len(keys)
+        return lines
+
+    def __load_symbols(self):
+        try:
+            with open(self.SymbolPath, 'r') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+        for line in lines:
+            sym = json.loads(line)
+            k = sym[0]
+            if k == 'Who':
+                key = sym[1], Address.from_path(sym[2].split('@'))
+                self.Names.append(sym[3])
+            elif k == 'Address':
+                key = Address.from_path(sym[1].split('@'))
+            else:
+                key = sym[1]
+            EventLog.__code(getattr(self, k), self.Keys[k], key)
+            self.NumWritten[k] += 1
+
+    def to_data(self):
+        """
+        Read the log as a data frame
+        :return: data frame with columns Time, Kind, Who, Event and Address
+        :rtype: pd.DataFrame
+        """
+        if self.Path:
+            self.flush()
+            return read_event_log(self.Path)
+        records = np.frombuffer(bytes(self.Buffer), dtype=RecordType)
+        symbols = {k: [str(v) for v in self.Keys[k]] for k in ['Event', 'Address']}
+        symbols['Who'] = self.__name()
+        return _decode(records, symbols)
+
+    def __len__(self):
+        n = len(self.Buffer)
+        if self.Path:
+            n += os.path.getsize(self.Path)
+        return n // RecordFormat.size
+
+
+def _decode(records, symbols):
+    dat = pd.DataFrame({'Time': records['Time']})
+    dat['Kind'] = np.array(Kinds, dtype=object)[records['Kind']]
+    for k in ['Who', 'Event', 'Address']:
+        dat[k] = np.array(symbols[k], dtype=object)[records[k]]
+    return dat
+
+
+def read_event_log(path):
+    """
+    Read a binary event log into a data frame
+    :param path: path of the log file
+    :return: data frame with columns Time, Kind, Who, Event and Address
+    :rtype: pd.DataFrame
+    """
+    records = np.fromfile(path, dtype=RecordType)
+    symbols = {'Who': list(), 'Event': list(), 'Address': list()}
+    with open('{}.sym'.format(path), 'r') as f:
+        for line in f:
+            sym = json.loads(line)
+            symbols[sym[0]].append(sym[-1] if sym[0] == 'Who' else sym[1])
+    return _decode(records, symbols)
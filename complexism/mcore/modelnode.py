@@ -1,4 +1,6 @@
 from abc import ABCMeta, abstractmethod
+from heapq import heappush, heappop, heapify
+import numpy.random as rd
 from complexism.element import Event, get_scheduler, DefaultScheduler
 from complexism.mcore import Observer, DefaultObserver, ModelSelector, EventListenerSet, LeafY0, BranchY0
 from complexism.misc.counter import count
@@ -16,6 +18,13 @@ class ModelAtom(metaclass=ABCMeta):
         self.__next = Event.NullEvent
         self.__scheduler = None
 
+    @property
+    def Id(self):
+        """
+        Key of the atom in requests of its model
+        """
+        return self.Name
+
     def __getitem__(self, item):
         try:
             return self.Parameters[item]
@@ -121,6 +130,10 @@ class ModelAtom(metaclass=ABCMeta):
         return True
 
     def __lt__(self, other):
+        # integer ids order agents by breeding without formatting their names
+        i, j = self.Id, other.Id
+        if isinstance(i, int) and isinstance(j, int) and i != j:
+            return i < j
         return self.Name < other.Name
 
     def to_json(self):
@@ -186,6 +199,16 @@ class AbsModel(metaclass=ABCMeta):
         self.Parameters = pars
         self.Environment = dict()
         self.TimeEnd = None
+        self.__rng = None
+
+    @property
+    def RNG(self):
+        """
+        Random number generator of the model, seeded from fresh entropy if no seed has been set
+        """
+        if self.__rng is None:
+            AbsModel.set_seed(self)
+        return self.__rng
 
     def __getitem__(self, item):
         try:
@@ -205,10 +228,29 @@ class AbsModel(metaclass=ABCMeta):
     def get_sampler(self, s):
         return self.Parameters.get_sampler(s)
 
+    def set_seed(self, seed=None):
+        """
+        Give the model an independent stream of random numbers
+        :param seed: seed of the stream, an integer or a numpy.random.SeedSequence
+        :return: the seed sequence of the stream
+        :rtype: rd.SeedSequence
+        """
+        ss = seed if isinstance(seed, rd.SeedSequence) else rd.SeedSequence(seed)
+        self.__rng = rd.default_rng(ss)
+        return ss
+
     @abstractmethod
     def get_atom(self, a):
         pass
 
+    def name_of(self, who):
+        """
+        Name of an atom from its key in requests
+        :param who: key of the atom
+        :return: name
+        """
+        return who
+
     def initialise(self, ti=None, y0=None):
         if y0:
             y0 = self.check_y0(y0)
@@ -339,8 +381,16 @@ class AbsModel(metaclass=ABCMeta):
 
 
 class LeafModel(AbsModel, metaclass=ABCMeta):
-    def __init__(self, name, pars=None, obs: Observer=None, y0_class=None):
-        AbsModel.__init__(self, name, pars, obs, y0_class if y0_class else LeafY0)
+    def __init__(self, name, pars=None, obs: Observer=None, y0_class=None, scheduler=DefaultScheduler):
+        AbsModel.__init__(self, name, pars, obs, y0_class if y0_class else LeafY0, scheduler)
+        self.BatchExecution = False
+
+    def set_batch_execution(self, on=True):
+        """
+        Execute requests sharing a timestamp together
+        :param on: True if requests are executed in batches
+        """
+        self.BatchExecution = on
 
     def collect_requests(self):
         self.Scheduler.find_next()
@@ -358,10 +408,21 @@ class LeafModel(AbsModel, metaclass=ABCMeta):
 
     def execute_requests(self):
         if self.Scheduler.is_executable():
-            for request in self.Scheduler.Requests:
-                self.do_request(request)
+            if self.BatchExecution and len(self.Scheduler.Requests) > 1:
+                self.do_requests(self.Scheduler.Requests)
+            else:
+                for request in self.Scheduler.Requests:
+                    self.do_request(request)
             self.Scheduler.execution_completed()
 
+    def do_requests(self, requests):
+        """
+        Execute requests with the same timestamp in a batch
+        :param requests: list of requests
+        """
+        for request in requests:
+            self.do_request(request)
+
     def collect_disclosure(self):
         self.Scheduler.reduce_disclosures(self)
         return self.Scheduler.pop_disclosures()
@@ -375,19 +436,69 @@ class LeafModel(AbsModel, metaclass=ABCMeta):
 
 
 class BranchModel(AbsModel, metaclass=ABCMeta):
-    def __init__(self, name, pars=None, obs=None, y0_class=None):
-        AbsModel.__init__(self, name, pars, obs, y0_class if y0_class else BranchY0)
+    def __init__(self, name, pars=None, obs=None, y0_class=None, scheduler=DefaultScheduler):
+        AbsModel.__init__(self, name, pars, obs, y0_class if y0_class else BranchY0, scheduler)
+        self.__orders = dict()
+        self.__entries = dict()
+        self.__queue = list()
+        self.__touched = set()
+        self.__active = list()
 
     def preset(self, ti):
+        self.__link_lowers()
         for v in self.all_models().values():
             v.preset(ti)
         self.Scheduler.reschedule_all()
 
     def reset(self, ti):
+        self.__link_lowers()
         for v in self.all_models().values():
             v.reset(ti)
         self.Scheduler.reschedule_all()
 
+    def __link_lowers(self):
+        """
+        Attach the schedulers of lower models to this one, all lower models are marked as dirty
+        """
+        self.__orders = dict()
+        self.__entries = dict()
+        self.__queue = list()
+        for i, (k, v) in enumerate(self.all_models().items()):
+            self.__orders[k] = i
+            v.Scheduler.Parent = self.Scheduler
+            self.Scheduler.mark_lower_dirty(k)
+
+    def __set_lower_time(self, k, ti):
+        if k in self.__entries and self.__entries[k][0] == ti:
+            return
+        # the previous entry of k, if any, is left in the queue and skipped as stale
+        entry = [ti, self.__orders[k], k]
+        self.__entries[k] = entry
+        heappush(self.__queue, entry)
+        if len(self.__queue) > 2 * len(self.__entries) + 16:
+            self.__queue = list(self.__entries.values())
+            heapify(self.__queue)
+
+    def __find_upcoming_lowers(self):
+        queue, entries = self.__queue, self.__entries
+        while queue and queue[0] is not entries[queue[0][2]]:
+            heappop(queue)
+        if not queue or queue[0][0] == float('inf'):
+            return list()
+
+        ti = queue[0][0]
+        found, stack = list(), [0]
+        while stack:
+            i = stack.pop()
+            entry = queue[i]
+            if entry[0] != ti:
+                continue
+            if entry is entries[entry[2]]:
+                found.append(entry)
+            stack += [j for j in (2 * i + 1, 2 * i + 2) if j < len(queue)]
+        found.sort(key=lambda e: e[1])
+        return [e[2] for e in found]
+
     def check_y0(self, y0s):
         if not isinstance(y0s, self.ClassY0):
             if issubclass(type(y0s), BranchY0):
@@ -414,6 +525,19 @@ class BranchModel(AbsModel, metaclass=ABCMeta):
     def get_model(self, k):
         pass
 
+    def set_seed(self, seed=None):
+        """
+        Give the model and each of its lower models an independent stream of random numbers, spawned from the seed
+        :param seed: seed of the stream, an integer or a numpy.random.SeedSequence
+        :return: the seed sequence of the stream
+        :rtype: rd.SeedSequence
+        """
+        ss = AbsModel.set_seed(self, seed)
+        models = sorted(self.all_models().items(), key=lambda kv: kv[0])
+        for (_, m), s in zip(models, ss.spawn(len(models))):
+            m.set_seed(s)
+        return ss
+
     def select(self, mod):
         return self.get_model(mod)
 
@@ -421,31 +545,49 @@ class BranchModel(AbsModel, metaclass=ABCMeta):
         return ModelSelector(self.all_models()).select_all(sel)
 
     def collect_requests(self):
-        self.Scheduler.find_next()
-        for v in self.all_models().values():
+        sc = self.Scheduler
+        sc.find_next()
+        models = self.all_models()
+        if len(models) != len(self.__orders):
+            self.__link_lowers()
+
+        # only lower models whose schedules have changed are polled
+        dirty, sc.DirtyLowers = sc.DirtyLowers, set()
+        for k in dirty:
+            v = models[k]
             v.collect_requests()
-            self.Scheduler.append_lower_schedule(v.Scheduler)
-        return self.Scheduler.Requests
+            v.Scheduler.clean()
+            self.__set_lower_time(k, v.Scheduler.GloTime)
+        self.__touched.update(dirty)
+
+        for k in self.__find_upcoming_lowers():
+            v = models[k]
+            if k not in dirty:
+                v.collect_requests()
+                self.__touched.add(k)
+            sc.append_lower_schedule(v.Scheduler)
+        return sc.Requests
 
     def validate_requests(self):
         pass  # todo
 
     def synchronise_request_time(self, time):
         self.Scheduler.GloTime = time
-        for v in self.all_models().values():
-            v.synchronise_request_time(time)
+        for k in self.__active:
+            self.select(k).synchronise_request_time(time)
 
     def fetch_requests(self, rs):
         self.Scheduler.fetch_requests(rs)
 
         res = self.Scheduler.pop_lower_requests()
+        self.__active = sorted(res.keys(), key=lambda k: self.__orders[k])
 
         for k, v in res.items():
             self.select(k).fetch_requests(v)
 
     def execute_requests(self):
-        for v in self.all_models().values():
-            v.execute_requests()
+        for k in self.__active:
+            self.select(k).execute_requests()
 
         if self.Scheduler.is_executable():
             for request in self.Scheduler.Requests:
@@ -455,8 +597,8 @@ class BranchModel(AbsModel, metaclass=ABCMeta):
     def collect_disclosure(self):
         self.Scheduler.reduce_disclosures(self)
         dss = self.Scheduler.pop_disclosures()
-        for v in self.all_models().values():
-            ds = v.collect_disclosure()
+        for k in sorted(self.Scheduler.DirtyLowers, key=lambda k: self.__orders[k]):
+            ds = self.select(k).collect_disclosure()
             ds = [d.up_scale(self.Name) for d in ds]
             dss += ds
         return dss
@@ -490,8 +632,10 @@ class BranchModel(AbsModel, metaclass=ABCMeta):
         return cs
 
     def exit_cycle(self):
-        for v in self.all_models().values():
-            v.exit_cycle()
+        for k in self.__touched | self.Scheduler.DirtyLowers:
+            self.select(k).exit_cycle()
+        self.__touched = set()
+        self.__active = list()
         AbsModel.exit_cycle(self)
 
     def print_schedule(self):
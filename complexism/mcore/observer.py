@@ -1,21 +1,193 @@
+import numpy as np
 import pandas as pd
 from abc import ABCMeta, abstractmethod
 from collections import OrderedDict
 __author__ = 'TimeWz667'
 
 
+class ColumnarTimeSeries:
+    def __init__(self, capacity=64, sink=None, chunk_size=1024):
+        """
+        Time series of observations stored as a growable array per key.
+        Keys not observed at a time point are filled with 0.
+        With a sink, time points are flushed to it in chunks and only the latest one is kept in memory.
+        :param capacity: initial number of time points allocated
+        :param sink: destination of flushed observations
+        :type sink: AbsObservationSink
+        :param chunk_size: number of time points per flush
+        """
+        self.Sink = sink
+        self.ChunkSize = chunk_size
+        self.Offset = 0
+        if sink is not None:
+            sink.clear()
+            capacity = min(capacity, chunk_size + 1)
+        self.Columns = OrderedDict()
+        self.Types = dict()
+        self.Starts = dict()
+        self.Gapped = set()
+        self.Heads = list()
+        self.Size = 0
+        self.Capacity = capacity
+        self.__data = None
+
+    def __len__(self):
+        return self.Offset + self.Size
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('Time point out of range')
+        i -= self.Offset
+        if i < 0:
+            raise IndexError('Time point flushed to the sink')
+        return OrderedDict((k, col[i].item() if col.dtype != object else col[i]) for k, col in self.Columns.items())
+
+    def __iter__(self):
+        """
+        Iterate time points kept in memory
+        """
+        for i in range(self.Offset, len(self)):
+            yield self[i]
+
+    def append(self, entry):
+        i = self.Size
+        if i >= self.Capacity:
+            self.Capacity *= 2
+            for k, col in self.Columns.items():
+                new = np.zeros(self.Capacity, dtype=col.dtype)
+                new[:i] = col[:i]
+                self.Columns[k] = new
+
+        for k, v in entry.items():
+            try:
+                col = self.Columns[k]
+            except KeyError:
+                col = self.__new_column(k, v)
+            if type(v) is not self.Types[k]:
+                col = self.__cast_column(k, v)
+            col[i] = v
+
+        if len(entry) < len(self.Columns):
+            self.Gapped.update(k for k in self.Columns if k not in entry)
+        if len(self.Heads) < 2:
+            self.Heads.append(list(entry.keys()))
+        self.Size += 1
+        self.__data = None
+        if self.Sink is not None and self.Size > self.ChunkSize:
+            self.flush(keep=1)
+
+    def flush(self, keep=0):
+        """
+        Write time points to the sink
+        :param keep: number of the latest time points kept in memory
+        """
+        n = self.Size - keep
+        if self.Sink is None or n <= 0:
+            return
+        self.Sink.write(OrderedDict((k, col[:n]) for k, col in self.Columns.items()), n)
+        for col in self.Columns.values():
+            col[:keep] = col[n: self.Size]
+            col[keep: self.Size] = 0
+        self.Offset += n
+        self.Size = keep
+
+    def __new_column(self, k, v):
+        dt = np.asarray(v).dtype
+        if dt.kind not in 'biuf':
+            dt = np.dtype(object)
+        col = self.Columns[k] = np.zeros(self.Capacity, dtype=dt)
+        self.Types[k] = type(v)
+        self.Starts[k] = len(self)
+        return col
+
+    def __cast_column(self, k, v):
+        col = self.Columns[k]
+        dt = np.asarray(v).dtype
+        dt = np.result_type(col.dtype, dt) if dt.kind in 'biuf' and col.dtype.kind in 'biuf' else np.dtype(object)
+        if dt != col.dtype:
+            col = self.Columns[k] = col.astype(dt)
+        self.Types[k] = type(v)
+        return col
+
+    def to_data(self, skip=0):
+        """
+        Build a data frame of the time series, the data frame is kept until new observations come,
+        so it should not be modified by callers
+        :param skip: number of time points skipped at the beginning
+        :return: data frame indexed by Time
+        :rtype: pd.DataFrame
+        """
+        if self.__data is not None and self.__data[0] == skip:
+            return self.__data[1]
+
+        columns = OrderedDict((k, col[:self.Size]) for k, col in self.Columns.items())
+        if self.Offset:
+            _, flushed = self.Sink.read_columns()
+            for k, col in columns.items():
+                pre = flushed[k] if k in flushed else np.zeros(self.Offset, dtype=col.dtype)
+                columns[k] = np.concatenate([pre, col])
+
+        dat = self.__to_frame(columns, skip, skip)
+        self.__data = skip, dat
+        return dat
+
+    def iter_data(self, skip=0):
+        """
+        Iterate the time series chunk by chunk, from the sink and then from memory
+        :param skip: number of time points skipped at the beginning
+        :return: generator of data frames indexed by Time
+        """
+        chunks = self.Sink.iter_chunks() if self.Offset else list()
+        i = 0
+        for chk in chunks:
+            n = len(chk['Time'])
+            if i + n > skip:
+                yield self.__to_frame(chk, max(skip - i, 0), skip)
+            i += n
+        if self.Size:
+            columns = OrderedDict((k, col[:self.Size]) for k, col in self.Columns.items())
+            yield self.__to_frame(columns, max(skip - i, 0), skip)
+
+    def __to_frame(self, columns, start, skip):
+        keys = list(self.Columns.keys())
+        if 0 < skip < len(self.Heads):
+            # order of columns as if the time series began at the first time point kept
+            head = self.Heads[skip]
+            keys = head + [k for k in keys if k not in head]
+
+        n = len(columns['Time']) - start
+        dat = OrderedDict()
+        for k in keys:
+            dt = self.Columns[k].dtype
+            col = columns[k][start:] if k in columns else np.zeros(n, dtype=dt)
+            if col.dtype.kind == 'f':
+                col = np.where(np.isnan(col), 0, col)
+            elif (k in self.Gapped or self.Starts[k] > skip) and col.dtype.kind in 'biu':
+                col = col.astype(float)
+            dat[k] = col
+        dat = pd.DataFrame(dat, copy=False)
+        return dat.set_index('Time')
+
+
 class Observer(metaclass=ABCMeta):
-    def __init__(self, ext=True):
+    def __init__(self, ext=True, columnar=True):
         self.Last = OrderedDict()
         self.Flow = OrderedDict()
         self.Mid = OrderedDict()
         self.StockNames = None
         self.FlowNames = None
-        self.TimeSeries = list()
-        self.TimeSeriesMid = list()
+        self.Columnar = columnar
+        self.Sink, self.SinkMid, self.ChunkSize = None, None, 1024
+        self.TimeSeries = None
+        self.TimeSeriesMid = None
         self.__ObsDt = 1
         self.ExtMid = ext
         self.Snapshot = dict()
+        self.renew()
 
     @property
     def ObservationalInterval(self):
@@ -32,9 +204,33 @@ class Observer(metaclass=ABCMeta):
         except KeyError:
             return 0
 
+    def set_columnar(self, on=True):
+        """
+        Store observations in arrays per key (default), or in a list of dictionaries per time point
+        :param on: True for columnar storage
+        """
+        self.Columnar = on
+        self.renew()
+
+    def set_sink(self, sink, sink_mid=None, chunk_size=1024):
+        """
+        Stream observations to files during simulation, keeping only the latest time point in memory
+        :param sink: sink of observations
+        :type sink: AbsObservationSink
+        :param sink_mid: sink of middle point observations, kept in memory if None
+        :type sink_mid: AbsObservationSink
+        :param chunk_size: number of time points per flush
+        """
+        self.Sink, self.SinkMid, self.ChunkSize = sink, sink_mid, chunk_size
+        self.set_columnar(True)
+
     def renew(self):
-        self.TimeSeries = list()
-        self.TimeSeriesMid = list()
+        if self.Columnar:
+            self.TimeSeries = ColumnarTimeSeries(sink=self.Sink, chunk_size=self.ChunkSize)
+            self.TimeSeriesMid = ColumnarTimeSeries(sink=self.SinkMid, chunk_size=self.ChunkSize)
+        else:
+            self.TimeSeries = list()
+            self.TimeSeriesMid = list()
 
     def __new_session(self, ti):
         self.Last = OrderedDict()
@@ -118,7 +314,7 @@ class Observer(metaclass=ABCMeta):
     def get_entry(self, i):
         try:
             return self.TimeSeries[i]
-        except KeyError:
+        except IndexError:
             return None
 
     def get_entry_at(self, ti):
@@ -129,13 +325,31 @@ class Observer(metaclass=ABCMeta):
 
     @property
     def Observations(self):
+        if isinstance(self.TimeSeries, ColumnarTimeSeries):
+            return self.TimeSeries.to_data().copy()
         dat = pd.DataFrame(self.TimeSeries)
         dat = dat.set_index('Time')
         dat = dat.fillna(0)
         return dat
 
+    def __interpolate_mid(self):
+        # mid points of the time series read back as a whole, since flushed time points can not be indexed
+        ts = self.TimeSeries
+        dat = ts.to_data().reset_index()
+        mid = OrderedDict()
+        for k in dat.columns:
+            vs = dat[k].values
+            col = (vs[:-1] + vs[1:]) / 2
+            # zero before the key observed, as the keys of the former time point are taken
+            col[:ts.Starts.get(k, 0)] = 0
+            mid[k] = col
+        return pd.DataFrame(mid).set_index('Time')
+
     @property
     def AdjustedObservations(self):
+        if not self.ExtMid and isinstance(self.TimeSeries, ColumnarTimeSeries):
+            return self.__interpolate_mid()
+
         if not (self.ExtMid or len(self.TimeSeriesMid) is len(self.TimeSeries)):
             self.TimeSeriesMid = list()
             self.TimeSeriesMid.append(None)
@@ -145,19 +359,45 @@ class Observer(metaclass=ABCMeta):
                     ent[k] = (f[k] + t[k])/2
                 self.TimeSeriesMid.append(ent)
 
+        if isinstance(self.TimeSeriesMid, ColumnarTimeSeries):
+            return self.TimeSeriesMid.to_data(skip=1).copy()
         dat = pd.DataFrame(self.TimeSeriesMid[1:])
         dat = dat.set_index('Time')
         dat = dat.fillna(0)
         return dat
 
+    def __streamed(self, mid):
+        ts = self.TimeSeriesMid if mid else self.TimeSeries
+        if isinstance(ts, ColumnarTimeSeries) and ts.Sink is not None and (self.ExtMid or not mid):
+            return ts.iter_data(skip=1 if mid else 0)
+        return None
+
     def output_csv(self, file, mid=False):
-        if mid:
+        chunks = self.__streamed(mid)
+        if chunks is not None:
+            for i, dat in enumerate(chunks):
+                dat.to_csv(file, mode='a' if i else 'w', header=not i)
+        elif mid:
             self.AdjustedObservations.to_csv(file)
         else:
             self.Observations.to_csv(file)
 
     def output_json(self, file, mid=False):
-        if mid:
+        chunks = self.__streamed(mid)
+        if chunks is not None:
+            f = open(file, 'w') if isinstance(file, str) else file
+            try:
+                f.write('[')
+                sep = ''
+                for dat in chunks:
+                    if len(dat):
+                        f.write(sep + dat.to_json(orient='records')[1:-1])
+                        sep = ','
+                f.write(']')
+            finally:
+                if f is not file:
+                    f.close()
+        elif mid:
             self.AdjustedObservations.to_json(file, orient='records')
         else:
             self.Observations.to_json(file, orient='records')
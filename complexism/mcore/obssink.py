@@ -0,0 +1,163 @@
+import json
+import os
+import struct
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+__author__ = 'TimeWz667'
+__all__ = ['AbsObservationSink', 'CsvObservationSink', 'BinaryObservationSink', 'read_observations']
+
+
+HeaderSize = struct.Struct('<I')
+
+
+class AbsObservationSink(metaclass=ABCMeta):
+    def __init__(self, path):
+        """
+        Destination of observations flushed during simulation
+        :param path: path of the file
+        """
+        self.Path = path
+
+    def clear(self):
+        """
+        Remove observations written before
+        """
+        if os.path.exists(self.Path):
+            os.remove(self.Path)
+
+    @abstractmethod
+    def write(self, columns, n):
+        """
+        Append a chunk of observations
+        :param columns: dict of key and an array of n values
+        :param n: number of time points
+        """
+        pass
+
+    @abstractmethod
+    def iter_chunks(self):
+        """
+        Iterate chunks of observations written
+        :return: generator of dicts of key and array
+        """
+        pass
+
+    def keys(self):
+        """
+        :return: list of observed keys in order of appearance
+        """
+        keys = OrderedDict()
+        for chk in self.iter_chunks():
+            keys.update(dict.fromkeys(chk))
+        return list(keys)
+
+    def read_columns(self):
+        """
+        Read all the observations written. Keys absent from some chunks are filled with 0.
+        :return: number of time points, dict of key and array
+        :rtype: (int, OrderedDict)
+        """
+        chunks = list(self.iter_chunks())
+        ns = [len(next(iter(chk.values()))) for chk in chunks]
+        columns = OrderedDict()
+        for chk in chunks:
+            for k, v in chk.items():
+                if k not in columns:
+                    columns[k] = v.dtype
+        for k, dt in columns.items():
+            columns[k] = np.concatenate([chk[k] if k in chk else np.zeros(n, dtype=dt) for chk, n in zip(chunks, ns)]) \
+                if chunks else np.zeros(0, dtype=dt)
+        return sum(ns), columns
+
+
+class CsvObservationSink(AbsObservationSink):
+    def __init__(self, path, chunk_read=4096):
+        """
+        Observations appended to a csv file. The keys observed are fixed by the first chunk written.
+        :param path: path of the csv file
+        :param chunk_read: number of rows per chunk when read back
+        """
+        AbsObservationSink.__init__(self, path)
+        self.Header = None
+        self.ChunkRead = chunk_read
+
+    def clear(self):
+        AbsObservationSink.clear(self)
+        self.Header = None
+
+    def write(self, columns, n):
+        if self.Header is None:
+            self.Header = list(columns.keys())
+        elif any(k not in self.Header for k in columns):
+            raise ValueError('Keys not in the header of {}'.format(self.Path))
+        dat = pd.DataFrame(OrderedDict((k, columns[k] if k in columns else np.zeros(n)) for k in self.Header))
+        dat.to_csv(self.Path, mode='a', header=not os.path.exists(self.Path), index=False)
+
+    def keys(self):
+        return list(self.Header) if self.Header else list()
+
+    def iter_chunks(self):
+        if not os.path.exists(self.Path):
+            return
+        for dat in pd.read_csv(self.Path, chunksize=self.ChunkRead):
+            yield OrderedDict((k, dat[k].values) for k in dat.columns)
+
+
+class BinaryObservationSink(AbsObservationSink):
+    def __init__(self, path):
+        """
+        Observations appended to a binary file of chunks, which can be read without pandas by read_observations.
+        Each chunk is a json header of keys and data types followed by the raw array of each key.
+        :param path: path of the file
+        """
+        AbsObservationSink.__init__(self, path)
+
+    def write(self, columns, n):
+        header, body = {'n': n, 'keys': list(columns.keys()), 'columns': list(), 'objects': dict()}, list()
+        for k, col in columns.items():
+            col = np.ascontiguousarray(col[:n])
+            if col.dtype == object:
+                header['objects'][k] = col.tolist()
+            else:
+                header['columns'].append([k, col.dtype.str])
+                body.append(col.tobytes())
+        header = json.dumps(header).encode()
+        with open(self.Path, 'ab') as f:
+            f.write(HeaderSize.pack(len(header)))
+            f.write(header)
+            for bs in body:
+                f.write(bs)
+
+    def iter_chunks(self):
+        return _iter_binary_chunks(self.Path)
+
+
+def _iter_binary_chunks(path):
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb') as f:
+        while True:
+            bs = f.read(HeaderSize.size)
+            if not bs:
+                return
+            header = json.loads(f.read(HeaderSize.unpack(bs)[0]).decode())
+            n, chk = header['n'], dict()
+            for k, dt in header['columns']:
+                dt = np.dtype(dt)
+                chk[k] = np.frombuffer(f.read(dt.itemsize * n), dtype=dt)
+            for k, vs in header['objects'].items():
+                chk[k] = np.array(vs, dtype=object)
+            yield OrderedDict((k, chk[k]) for k in header['keys'])
+
+
+def read_observations(path):
+    """
+    Read observations written by BinaryObservationSink
+    :param path: path of the file
+    :return: dict of key and array
+    :rtype: OrderedDict
+    """
+    return BinaryObservationSink(path).read_columns()[1]
@@ -1,37 +1,36 @@
-import numpy.random as rd
+import multiprocessing as mp
+import traceback
 import numpy as np
-import logging
+from .eventlog import EventLog
+from .checkpoint import dumps_checkpoint, loads_checkpoint
 
 __author__ = 'TimeWz667'
 __all__ = ['Simulator']
 
 
-class PseudoLogger:
-    def info(self, msg):
-        pass
-
-
 class Simulator:
-    def __init__(self, model, seed=None, keep_log=True, new_log=True):
+    def __init__(self, model, seed=None, keep_log=False, new_log=True):
+        """
+        :param model: model to be simulated
+        :param seed: seed for random number generation; the model and its lower models draw from streams spawned from it
+        :param keep_log: True for keeping a binary event log, <ModelName>.evt; or an EventLog to be written in
+        :param new_log: True if the existing log should be replaced
+        """
         self.Model = model
-        if seed:
-            rd.seed(seed)
+        if seed is not None:
+            model.set_seed(seed)
         self.Time = 0
 
         self.Models = dict()
 
-        if keep_log:
-            self.Logger = logging.getLogger(__name__)
-            if new_log:
-                file = '{}.log'.format(self.Model.Name)
-                with open(file, 'w'):
-                    pass
-                self.Logger.setLevel(logging.INFO)
-                fh = logging.FileHandler(file)
-                fh.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
-                self.Logger.addHandler(fh)
+        if isinstance(keep_log, EventLog):
+            self.Log = keep_log
+        elif keep_log:
+            self.Log = EventLog('{}.evt'.format(self.Model.Name), new=new_log)
         else:
-            self.Logger = PseudoLogger()
+            self.Log = None
+        if self.Log is not None and self.Log.Namer is None:
+            self.Log.Namer = self._name_of
 
     def simulate(self, y0, fr, to, dt):
         self.Time = fr
@@ -54,6 +53,79 @@ class Simulator:
             self.step((f+t)/2, t)
             self.Model.update_observations(t)
             self.Model.push_observations(t)
+        if self.Log is not None:
+            self.Log.flush()
+
+    def fork(self, scenarios, forward, dt, mid=False, n_core=None):
+        """
+        Branch the simulation from the current state into scenarios, each of which is continued to the end time.
+        Scenarios run in forked processes sharing the memory of the current state copy-on-write, so the common
+        history is neither re-simulated nor copied; the model of this simulator is left at the current state.
+        Where fork is not supported, scenarios run one by one on copies restored from a checkpoint.
+        Event logs are not kept in scenarios.
+        :param scenarios: dict of scenario name and intervention, either a function fn(model, ti) or keyword arguments
+         of model.shock, e.g. {'action': 'FOI', 'value': 0.2}
+        :param forward: end time
+        :param dt: observation interval
+        :param mid: output middle point observation
+        :param n_core: maximum number of scenarios running at once, all available cores if None
+        :return: dict of scenario name and output
+        """
+        if self.Log is not None:
+            self.Log.flush()
+
+        if 'fork' not in mp.get_all_start_methods():
+            bs = dumps_checkpoint(self.Model)
+            outputs = dict()
+            for k, intervention in scenarios.items():
+                sim = Simulator(loads_checkpoint(bs, restore_rng=False))
+                sim.Time = self.Time
+                outputs[k] = sim.__run_scenario(intervention, forward, dt, mid)
+            return outputs
+
+        ctx = mp.get_context('fork')
+        n_core = n_core if n_core else mp.cpu_count()
+        items = list(scenarios.items())
+        outputs, errors = dict(), dict()
+        for i in range(0, len(items), n_core):
+            jobs = list()
+            for k, intervention in items[i: i + n_core]:
+                recv, send = ctx.Pipe(duplex=False)
+                proc = ctx.Process(target=self.__fork_scenario, args=(send, intervention, forward, dt, mid))
+                proc.start()
+                send.close()
+                jobs.append((k, recv, proc))
+            for k, recv, proc in jobs:
+                try:
+                    succeeded, res = recv.recv()
+                except EOFError:
+                    succeeded, res = False, 'Process exited unexpectedly'
+                proc.join()
+                if succeeded:
+                    outputs[k] = res
+                else:
+                    errors[k] = res
+        if errors:
+            raise RuntimeError('\n'.join('Scenario {} failed\n{}'.format(*it) for it in errors.items()))
+        return outputs
+
+    def __fork_scenario(self, send, intervention, forward, dt, mid):
+        self.Log = None
+        try:
+            send.send((True, self.__run_scenario(intervention, forward, dt, mid)))
+        except Exception:
+            send.send((False, traceback.format_exc()))
+        finally:
+            send.close()
+
+    def __run_scenario(self, intervention, forward, dt, mid):
+        if callable(intervention):
+            intervention(self.Model, self.Time)
+        elif intervention:
+            self.Model.shock(self.Time, **intervention)
+        if forward > self.Time:
+            self.update(forward, dt)
+        return self.Model.output(mid=mid)
 
     def step(self, t, end):
         tx = t
@@ -64,8 +136,8 @@ class Simulator:
             if ti > end:
                 break
             tx = ti
-            for req in requests:
-                self.Logger.info(str(req))
+            if self.Log is not None:
+                self.Log.record_requests(requests, ti)
             self.Model.fetch_requests(requests)
             self.Model.synchronise_request_time(ti)
             self.Model.execute_requests()
@@ -82,25 +154,31 @@ class Simulator:
         else:
             ds = list()
         ds += self.Model.collect_disclosure()
-        ds = [d for d in ds if d.Where[0] != self.Model.Name]
-        for d in ds:
-            self.Logger.info(str(d))
+        ds = [d for d in ds if d.Source != self.Model.Name]
+        if self.Log is not None:
+            self.Log.record_disclosures(ds, time)
 
         while len(ds) > 0:
             ds_ms = [(d.down_scale()[1], self._find_model(d)) for d in ds]
             self.Model.fetch_disclosures(ds_ms, time)
 
             ds = self.Model.collect_disclosure()
-            ds = [d for d in ds if d.Where[0] != self.Model.Name]
-            for d in ds:
-                self.Logger.info(str(d))
+            ds = [d for d in ds if d.Source != self.Model.Name]
+            if self.Log is not None:
+                self.Log.record_disclosures(ds, time)
+
+    def _name_of(self, who, path):
+        return self._model_at(path).name_of(who)
 
     def _find_model(self, dis):
-        adr = dis.Address
+        return self._model_at(dis.Path)
+
+    def _model_at(self, path):
+        adr = str(path)
         try:
             return self.Models[adr]
         except KeyError:
-            where = dis.Where
+            where = path.Where
             where = list(where[:-1])
             where.reverse()
             mod = self.Model
@@ -5,7 +5,7 @@ from collections import Counter
 
 
 __author__ = 'TimeWz667'
-__all__ = ['count', 'start_counting', 'stop_counting', 'get_counting_results']
+__all__ = ['count', 'tick', 'start_counting', 'stop_counting', 'get_counting_results']
 
 
 class EventCount:
@@ -13,8 +13,8 @@ class EventCount:
         self.Name = name
         self.Counts = Counter()
 
-    def tick(self, event='Event'):
-        self.Counts[event] += 1
+    def tick(self, event='Event', n=1):
+        self.Counts[event] += n
 
     def to_data(self):
         return Counter({'{}:{}'.format(self.Name, k): v for k, v in self.Counts.items()})
@@ -59,8 +59,8 @@ class EventCounter:
             dat.update(functools.reduce(lambda x, y: x+y, cnt))
         self.Data.append(dat)
 
-    def tick(self, k, event='Event'):
-        self[k].tick(event)
+    def tick(self, k, event='Event', n=1):
+        self[k].tick(event, n)
 
     def output(self):
         return pd.DataFrame(self.Data)
@@ -81,10 +81,10 @@ class EventCounter:
         cnt.start()
 
     @staticmethod
-    def g_tick(k, event='Event'):
+    def g_tick(k, event='Event', n=1):
         cnt = EventCounter.ActivateCounter
         if cnt.Recording:
-            cnt.tick(k, event)
+            cnt.tick(k, event, n)
 
     @staticmethod
     def g_stop():
@@ -97,6 +97,7 @@ EventCounter.ActivateCounter = EventCounter.DefaultCounter = EventCounter('Defau
 
 start_counting = EventCounter.g_start
 stop_counting = EventCounter.g_stop
+tick = EventCounter.g_tick
 
 
 def get_counting_results(name=None):
@@ -151,7 +151,7 @@ class DemographyTotal(AbsDemography):
         """
         Get a sampler for sampling population given a year
         :param year: year of request
-        :return: sampler fn(n=1)
+        :return: sampler fn(n=1, rng=None)
         """
         pass
 
@@ -289,7 +289,7 @@ class DemographySex(AbsDemography):
         """
         Get a sampler for sampling population given a year
         :param year: year of request
-        :return: sampler fn(n=1)
+        :return: sampler fn(n=1, rng=None)
         """
         pop_f = self.Population['Female'](year)
         pop_m = self.Population['Male'](year)
@@ -298,12 +298,13 @@ class DemographySex(AbsDemography):
         pf = pop_f / n_all
         pm = pop_m / n_all
 
-        def fn(n=1):
+        def fn(n=1, rng=None):
+            rng = rng if rng is not None else rd
             if n is 1:
-                sam = rd.choice(['Female', 'Male'], 1, p=[pf, pm])
+                sam = rng.choice(['Female', 'Male'], 1, p=[pf, pm])
                 return sam[0]
             else:
-                sam = rd.choice(['Female', 'Male'], n, p=[pf, pm])
+                sam = rng.choice(['Female', 'Male'], n, p=[pf, pm])
                 return sam
 
         return fn
@@ -540,7 +541,7 @@ class DemographyLeeCarter(AbsDemography):
         Get a sampler for sampling population given a year
         :param year: year of request
         :param sex: sex of request none for both
-        :return: sampler fn(n=1)
+        :return: sampler fn(n=1, rng=None)
         """
         if sex == 'Female':
             tab_f = self.AgeStr['Female'][year]
@@ -549,11 +550,12 @@ class DemographyLeeCarter(AbsDemography):
             pr = list(tab_f)
             ages = list(range(len(pr)))
 
-            def fn(n=1):
+            def fn(n=1, rng=None):
+                rng = rng if rng is not None else rd
                 if n is 1:
-                    return rd.choice(ages, 1, p=pr)[0]
+                    return rng.choice(ages, 1, p=pr)[0]
                 else:
-                    return rd.choice(ages, n, p=pr)
+                    return rng.choice(ages, n, p=pr)
 
         elif sex == 'Male':
             tab_m = self.AgeStr['Male'][year]
@@ -562,11 +564,12 @@ class DemographyLeeCarter(AbsDemography):
             pr = list(tab_m)
             ages = list(range(len(pr)))
 
-            def fn(n=1):
+            def fn(n=1, rng=None):
+                rng = rng if rng is not None else rd
                 if n is 1:
-                    return rd.choice(ages, 1, p=pr)[0]
+                    return rng.choice(ages, 1, p=pr)[0]
                 else:
-                    return rd.choice(ages, n, p=pr)
+                    return rng.choice(ages, n, p=pr)
         else:
             tab_f = self.AgeStr['Female'][year]
             tab_m = self.AgeStr['Male'][year]
@@ -577,12 +580,13 @@ class DemographyLeeCarter(AbsDemography):
             pr = list(tab_f) + list(tab_m)
             atr = [('Female', a) for a in self.Ages] + [('Male', a) for a in self.Ages]
 
-            def fn(n=1):
+            def fn(n=1, rng=None):
+                rng = rng if rng is not None else rd
                 if n is 1:
-                    sam = rd.choice(range(len(pr)), 1, p=pr)
+                    sam = rng.choice(range(len(pr)), 1, p=pr)
                     return atr[sam[0]]
                 else:
-                    sam = rd.choice(range(len(pr)), n, p=pr)
+                    sam = rng.choice(range(len(pr)), n, p=pr)
                     return [atr[i] for i in sam]
 
         return fn
@@ -1,7 +1,11 @@
 from numpy.random import choice
 import numpy as np
+import epidag.bayesnet.distribution as dst
+from epidag.bayesnet.loci import DistributionLoci
+from epidag.simulation.actor import CompoundActor, SingleActor, FrozenSingleActor, FrozenSingleFunctionActor, Sampler
 
 __author__ = 'TimeWz667'
+__all__ = ['CategoricalRV', 'sample_distribution', 'sample_loci', 'sample_actor']
 
 
 class CategoricalRV:
@@ -27,3 +31,81 @@ class CategoricalRV:
 
     def get_xs(self):
         return self.xp
+
+
+def sample_distribution(dist, rng=None, n=None):
+    """
+    Sample a distribution of epidag, or a frozen scipy distribution
+    :param dist: distribution
+    :param rng: random number generator, the global state used if None
+    :type rng: numpy.random.Generator
+    :param n: number of values; a single value if None
+    :return: a value, or an array of n values
+    """
+    if rng is None:
+        if hasattr(dist, 'random_state'):
+            return dist.rvs(size=n)
+        return dist.sample() if n is None else np.atleast_1d(dist.sample(n))
+
+    if isinstance(dist, dst.SpInteger):
+        v = dist.Dist.rvs(size=n, random_state=rng)
+        return round(v) if n is None else np.round(v)
+    if isinstance(dist, dst.SpDouble):
+        return dist.Dist.rvs(size=n, random_state=rng)
+    if hasattr(dist, 'random_state'):
+        return dist.rvs(size=n, random_state=rng)
+    if isinstance(dist, dst.Const):
+        return dist.K if n is None else np.full(n, dist.K)
+    if isinstance(dist, dst.CategoricalRV):
+        return rng.choice(dist.cat, size=n, p=dist.p)
+    if isinstance(dist, dst.EmpiricalRV):
+        return dist.Fn(rng.random(n))
+    raise TypeError('Unknown distribution: {}'.format(dist))
+
+
+def sample_loci(loci, pas, rng=None):
+    """
+    Sample a node of a Bayesian network given its parents
+    :param loci: node
+    :param pas: values of parent nodes
+    :param rng: random number generator, the global state used if None
+    :return: value of the node
+    """
+    if rng is not None and isinstance(loci, DistributionLoci):
+        return sample_distribution(loci.get_distribution(pas), rng)
+    return loci.sample(pas)
+
+
+def sample_actor(actor, pas=None, rng=None):
+    """
+    Sample a simulation actor of epidag
+    :param actor: actor, sampler of actor, or distribution
+    :param pas: parameters where the parents of the actor found
+    :param rng: random number generator, the global state used if None
+    :return: value sampled
+    """
+    if isinstance(actor, Sampler):
+        return sample_actor(actor.Actor, actor.Loc, rng)
+    if isinstance(actor, dst.AbsDistribution):
+        return sample_distribution(actor, rng)
+    if rng is None:
+        return actor.sample(pas)
+
+    if isinstance(actor, FrozenSingleActor):
+        return sample_distribution(actor.Dist, rng)
+    if isinstance(actor, FrozenSingleFunctionActor):
+        return sample_loci(actor.Loci, actor.Pars, rng)
+    if isinstance(actor, SingleActor):
+        parents = {p: pas[p] for p in actor.Parents}
+        return sample_loci(actor.Loci, parents, rng)
+    if isinstance(actor, CompoundActor):
+        parents = dict()
+        for p in actor.Parents:
+            try:
+                parents[p] = pas[p]
+            except KeyError:
+                pass
+        for loc in actor.Flow:
+            parents[loc.Name] = sample_loci(loc, parents, rng)
+        return sample_loci(actor.Loci, parents, rng)
+    raise TypeError('Unknown actor: {}'.format(actor))
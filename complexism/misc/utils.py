@@ -25,6 +25,24 @@ class NameGenerator:
         i, self.Index = self.Index, self.Index + self.By
         return '{}{}'.format(self.Prefix, i)
 
+    def get_next_index(self):
+        i, self.Index = self.Index, self.Index + self.By
+        return i
+
+    def find_index(self, name):
+        """
+        Index of a name generated
+        :param name: name
+        :return: index
+        :rtype: int
+        """
+        if isinstance(name, str) and name.startswith(self.Prefix):
+            try:
+                return int(name[len(self.Prefix):])
+            except ValueError:
+                pass
+        raise KeyError(name)
+
     def to_json(self):
         return {
             'Prefix': self.Prefix,
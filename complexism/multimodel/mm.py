@@ -1,6 +1,7 @@
 from collections import OrderedDict, namedtuple
 from complexism.misc.counter import count
 from complexism.mcore import BranchModel, Observer, BranchY0
+from complexism.element import DefaultScheduler
 
 
 __author__ = 'TimeWz667'
@@ -50,8 +51,8 @@ class ObsMultiModel(Observer):
 
 
 class MultiModel(BranchModel):
-    def __init__(self, name, pars=None):
-        BranchModel.__init__(self, name, pars=pars, obs=ObsMultiModel(), y0_class=BranchY0)
+    def __init__(self, name, pars=None, scheduler=DefaultScheduler):
+        BranchModel.__init__(self, name, pars=pars, obs=ObsMultiModel(), y0_class=BranchY0, scheduler=scheduler)
         self.Children = dict()
         self.Actors = OrderedDict()
 
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+import complexism as cx
+
+
+Scripts = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'example', 'scripts')
+
+
+class CheckpointTestCase(unittest.TestCase):
+    def setUp(self):
+        da = cx.Director()
+        da.load_bayes_net(os.path.join(Scripts, 'pDzAB.txt'))
+        da.load_state_space_model(os.path.join(Scripts, 'DzAB.txt'))
+        abm = da.new_sim_model('AB', 'StSpABM')
+        abm.set_agent(dynamics='DzAB', prefix='Ag')
+        abm.set_observations(states=['ab', 'aB', 'Ab', 'AB'])
+        self.Model = da.generate_model('M1', 'AB', bn='pDzAB')
+        cx.simulate(self.Model, [{'n': 50, 'attributes': {'st': 'ab'}}], 0, 3, seed=1)
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'M1.ckp')
+            cx.save_checkpoint(self.Model, path)
+            out = cx.update(self.Model, 6)
+
+            model = cx.load_checkpoint(path)
+            self.assertEqual(model.TimeEnd, 3)
+            self.assertTrue(cx.update(model, 6).equals(out))
+
+    def test_bytes(self):
+        bs = cx.dumps_checkpoint(self.Model)
+        m1, m2 = cx.loads_checkpoint(bs), cx.loads_checkpoint(bs)
+        self.assertIsNot(m1.Population, m2.Population)
+        self.assertTrue(cx.update(m1, 6).equals(cx.update(m2, 6)))
+
+    def test_disclosures(self):
+        self.Model.birth(n=3, ti=3, st='ab')
+        self.assertTrue(self.Model.Scheduler.Disclosures)
+        bs = cx.dumps_checkpoint(self.Model)
+        m1, m2 = cx.loads_checkpoint(bs), cx.loads_checkpoint(bs)
+        dis = m1.Scheduler.Disclosures[0]
+        self.assertEqual(dis.What, self.Model.Scheduler.Disclosures[0].What)
+        self.assertDictEqual(dict(dis.Arguments), dict(self.Model.Scheduler.Disclosures[0].Arguments))
+        self.assertTrue(cx.update(m1, 6).equals(cx.update(m2, 6)))
+
+    def test_fork(self):
+        def immigrate(model, ti):
+            model.birth(n=20, ti=ti, st='ab')
+
+        outs = cx.fork(self.Model, {'Base': None, 'Immigration': immigrate}, 6, n_core=2)
+        self.assertEqual(self.Model.TimeEnd, 3)
+        self.assertEqual(len(self.Model), 50)
+        self.assertTrue(outs['Base'].equals(cx.update(self.Model, 6)))
+        self.assertNotEqual(outs['Base'].iloc[-1].sum(), outs['Immigration'].iloc[-1].sum())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -69,6 +69,31 @@ class RequestTestCase(unittest.TestCase):
 
         self.assertEqual(min(self.Req1, self.Req2), self.Req1)
 
+    def test_interned(self):
+        req11 = self.Req1.up_scale('Taipei')
+        req21 = self.Req2.up_scale('Taipei')
+        self.assertIs(req11.Path, req21.Path)
+        self.assertIs(req11.down_scale()[1].Path, self.Req1.Path)
+        self.assertIs(Address.from_path(['Home', 'Taipei']), req11.Path)
+        self.assertTupleEqual(req11.Where, ('Home', 'Taipei'))
+
+
+class DisclosureTestCase(unittest.TestCase):
+    def setUp(self):
+        self.Dis = Disclosure('infect', 'I', 'Home', v=1)
+
+    def test_scale(self):
+        dis = self.Dis.up_scale('Taipei').sibling_scale()
+        self.assertEqual(dis.Address, 'Home@Taipei@^')
+        self.assertEqual(dis.Source, 'Home')
+        self.assertIs(dis.Arguments, self.Dis.Arguments)
+        self.assertEqual(dis['v'], 1)
+
+        grp, dis = dis.down_scale()
+        self.assertEqual(grp, '^')
+        self.assertEqual(dis.up_scale('^').Distance, 3)
+        self.assertTrue(Disclosure('infect', 'I', ['Home', '^']).is_sibling())
+
 
 class TickerTestCase(unittest.TestCase):
     def setUp(self):
@@ -0,0 +1,39 @@
+import os
+import unittest
+import complexism as cx
+
+
+Scripts = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'example', 'scripts')
+
+
+class EnsembleTestCase(unittest.TestCase):
+    def setUp(self):
+        self.Director = cx.Director()
+        self.Director.load_bayes_net(os.path.join(Scripts, 'pDzAB.txt'))
+        self.Director.load_state_space_model(os.path.join(Scripts, 'DzAB.txt'))
+        abm = self.Director.new_sim_model('AB', 'StSpABM')
+        abm.set_agent(dynamics='DzAB', prefix='Ag')
+        abm.set_observations(states=['ab', 'aB', 'Ab', 'AB'])
+        self.Y0 = [{'n': 50, 'attributes': {'st': 'ab'}}]
+
+    def test_reproducible(self):
+        seeds = cx.generate_seeds(4, seed=1)
+        serial = cx.simulate_ensemble(self.Director, 'AB', self.Y0, 0, 5, pars={'bn': 'pDzAB'}, seeds=seeds,
+                                      n_core=1)
+        parallel = cx.simulate_ensemble(self.Director, 'AB', self.Y0, 0, 5, pars={'bn': 'pDzAB'}, seeds=seeds,
+                                        n_core=2)
+        for s, p in zip(serial, parallel):
+            self.assertIsNone(s.Error)
+            self.assertEqual(s.Seed, p.Seed)
+            self.assertTrue(s.Output.equals(p.Output))
+
+    def test_failure(self):
+        reps = cx.simulate_ensemble(self.Director, 'AB', self.Y0, 0, 2,
+                                    pars=[{'bn': 'pDzAB'}, {'bn': 'Unknown'}], n_core=2)
+        self.assertIsNone(reps[0].Error)
+        self.assertIsNone(reps[1].Output)
+        self.assertIsNotNone(reps[1].Error)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from complexism.element import Event, Request, Disclosure
+from complexism.mcore import EventLog, read_event_log
+
+
+class EventLogTestCase(unittest.TestCase):
+    def setUp(self):
+        self.Requests = [Request(Event('Infect', 1.5), 'Ag1', 'M1'),
+                         Request(Event('Recover', 1.5), 'Ag2', 'M1').up_scale('Country')]
+        self.Disclosures = [Disclosure('infect', 'Ag1', 'M1').up_scale('Country')]
+
+    def test_memory(self):
+        log = EventLog()
+        log.record_requests(self.Requests, 1.5)
+        log.record_disclosures(self.Disclosures, 1.5)
+        self.assertEqual(len(log), 3)
+
+        dat = log.to_data()
+        self.assertListEqual(list(dat.columns), ['Time', 'Kind', 'Who', 'Event', 'Address'])
+        self.assertListEqual(list(dat.Kind), ['Request', 'Request', 'Disclosure'])
+        self.assertListEqual(list(dat.Address), ['M1', 'M1@Country', 'M1@Country'])
+        self.assertListEqual(list(dat.Event), ['Infect', 'Recover', 'infect'])
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'test.evt')
+            log = EventLog(path)
+            log.record_requests(self.Requests, 1.5)
+            log.flush()
+
+            log = EventLog(path, new=False)
+            log.record_requests(self.Requests[1:], 2)
+            log.record_disclosures(self.Disclosures, 2)
+            log.flush()
+
+            dat = read_event_log(path)
+            self.assertEqual(len(dat), 4)
+            self.assertListEqual(list(dat.Time), [1.5, 1.5, 2, 2])
+            self.assertListEqual(list(dat.Who), ['Ag1', 'Ag2', 'Ag2', 'Ag1'])
+            self.assertEqual(len(log.Address), 2)
+
+    def test_ids(self):
+        reqs = [Request(Event('Infect', 1), 3, 'M1'), Request(Event('Infect', 1), '3', 'M1')]
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'test.evt')
+            log = EventLog(path, namer=lambda w, p: 'Ag{}'.format(w) if isinstance(w, int) else w)
+            log.record_requests(reqs, 1)
+            log.flush()
+
+            log = EventLog(path, new=False)
+            log.record_requests(reqs, 2)
+            log.flush()
+            self.assertEqual(len(log.Who), 2)
+            self.assertListEqual(list(read_event_log(path).Who), ['Ag3', '3', 'Ag3', '3'])
+            with open(log.SymbolPath) as f:
+                self.assertEqual(len(f.readlines()), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,8 @@ import unittest
 import complexism as cx
 from complexism.element import Event
 from random import choice
+import numpy as np
+from complexism.agentbased.pop.network import NetworkBA, NetworkProb
 
 
 class TwoDRandomWalker(cx.GenericAgent):
@@ -67,5 +69,39 @@ class GenericAgentTestCase(unittest.TestCase):
         self.assertEqual(self.Walker.TTE, 2)
 
 
+class NetworkRemovalTestCase(unittest.TestCase):
+    def setUp(self):
+        self.Agents = ['Ag{}'.format(i) for i in range(30)]
+        self.Removed = self.Agents[3:25:2]
+
+    def test_ba(self):
+        net = NetworkBA(m=2)
+        net.RNG = np.random.default_rng(1)
+        for ag in self.Agents:
+            net.add_agent(ag)
+        net.remove_agents(self.Removed)
+        net.remove_agent('Ag0')
+
+        rep, at = net._NetworkBA__repeat, net._NetworkBA__at
+        self.assertEqual(len(net.Graph), 30 - len(self.Removed) - 1)
+        self.assertFalse(set(rep) & set(self.Removed + ['Ag0']))
+        self.assertEqual(sum(len(ps) for ps in at.values()), len(rep))
+        for i, ag in enumerate(rep):
+            self.assertIn(i, at[ag])
+        net.add_agent('Ag30')
+        self.assertEqual(net.degree('Ag30'), 2)
+
+    def test_prob(self):
+        net = NetworkProb(p=0.5)
+        net.RNG = np.random.default_rng(1)
+        for ag in self.Agents:
+            net.add_agent(ag)
+        inside = [ag for ag in net.Inside if ag not in self.Removed]
+        net.remove_agents(self.Removed)
+        self.assertListEqual(list(net.Inside), inside)
+        self.assertEqual(len(net.Inside) + len(net.Outside), 30 - len(self.Removed))
+        self.assertEqual(net.degree(inside[0]), len(inside) - 1)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+from complexism.mcore import Observer, BinaryObservationSink, CsvObservationSink, read_observations
+
+
+class ObsCounter(Observer):
+    def read_statics(self, model, tab, ti):
+        tab['N'] = int(ti) * 2
+        if ti >= 2:
+            tab['Late'] = 1
+
+    def update_dynamic_observations(self, model, flow, ti):
+        flow['Inc'] = 0.5 * ti
+
+
+def observe(obs, to):
+    obs.initialise_observations(None, 0)
+    obs.push_observations(0)
+    for ti in range(1, to + 1):
+        obs.update_at_mid_term(None, ti - 0.5)
+        obs.observe_routinely(None, ti)
+        obs.push_observations(ti)
+    return obs
+
+
+class ObserverTestCase(unittest.TestCase):
+    def test_columnar(self):
+        obs = observe(ObsCounter(), 100)
+        self.assertEqual(len(obs.TimeSeries), 101)
+        self.assertDictEqual(dict(obs.TimeSeries[-1]), {'Time': 100, 'N': 200, 'Late': 1, 'Inc': 50})
+        dat = obs.Observations
+        dat['N'] = -1
+        self.assertEqual(obs.Observations['N'].iloc[-1], 200)
+
+    def test_compatible(self):
+        col, dic = observe(ObsCounter(), 10), observe(ObsCounter(columnar=False), 10)
+        self.assertIsInstance(dic.TimeSeries, list)
+        self.assertTrue(col.Observations.equals(dic.Observations))
+        self.assertTrue(col.AdjustedObservations.equals(dic.AdjustedObservations))
+        self.assertListEqual(list(col.AdjustedObservations.columns), list(dic.AdjustedObservations.columns))
+        self.assertDictEqual(dict(col.get_entry_at(3)), dict(dic.get_entry_at(3)))
+
+
+class ObservationSinkTestCase(unittest.TestCase):
+    def setUp(self):
+        self.Dir = tempfile.TemporaryDirectory()
+        self.Memory = observe(ObsCounter(), 100)
+
+    def tearDown(self):
+        self.Dir.cleanup()
+
+    def sink_observe(self, sink):
+        obs = ObsCounter()
+        obs.set_sink(sink(os.path.join(self.Dir.name, 'obs')), sink(os.path.join(self.Dir.name, 'mid')), chunk_size=8)
+        return observe(obs, 100)
+
+    def test_binary(self):
+        obs = self.sink_observe(BinaryObservationSink)
+        self.assertLessEqual(obs.TimeSeries.Size, 8)
+        self.assertEqual(len(obs.TimeSeries), 101)
+        self.assertEqual(obs.TimeSeries[-1]['N'], 200)
+        self.assertTrue(obs.Observations.equals(self.Memory.Observations))
+        self.assertTrue(obs.AdjustedObservations.equals(self.Memory.AdjustedObservations))
+
+        dat = read_observations(os.path.join(self.Dir.name, 'obs'))
+        self.assertListEqual(list(dat['N'][:3]), [0, 2, 4])
+
+    def test_csv(self):
+        obs = self.sink_observe(CsvObservationSink)
+        self.assertTrue(obs.Observations.equals(self.Memory.Observations))
+
+        path_s, path_m = os.path.join(self.Dir.name, 's.csv'), os.path.join(self.Dir.name, 'm.csv')
+        obs.output_csv(path_s, mid=True)
+        self.Memory.output_csv(path_m, mid=True)
+        with open(path_s) as fs, open(path_m) as fm:
+            self.assertEqual(fs.read(), fm.read())
+
+    def test_interpolated_mid(self):
+        obs = ObsCounter(ext=False)
+        obs.set_sink(BinaryObservationSink(os.path.join(self.Dir.name, 'obs')), chunk_size=8)
+        obs = observe(obs, 100)
+        memory = observe(ObsCounter(ext=False, columnar=False), 100)
+        self.assertTrue(obs.AdjustedObservations.equals(memory.AdjustedObservations))
+
+        path_s, path_m = os.path.join(self.Dir.name, 's.csv'), os.path.join(self.Dir.name, 'm.csv')
+        obs.output_csv(path_s, mid=True)
+        memory.output_csv(path_m, mid=True)
+        with open(path_s) as fs, open(path_m) as fm:
+            self.assertEqual(fs.read(), fm.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 import complexism as cx
-from complexism.element import Event
+from complexism.element import Event, get_scheduler
 from complexism.agentbased import SingleIndividualABM, Population
 import complexism.multimodel as mm
 
@@ -51,5 +51,134 @@ class GenericAgentTestCase(unittest.TestCase):
             print('\t',req)
 
 
+class Waiter(cx.GenericAgent):
+    def __init__(self, name, ti):
+        cx.GenericAgent.__init__(self, name)
+        self.Time = ti
+
+    def update_time(self, ti):
+        pass
+
+    def find_next(self):
+        return Event('Wait', self.Time)
+
+    def execute_event(self):
+        pass
+
+    def initialise(self, ti, model, *args, **kwargs):
+        pass
+
+    def reset(self, ti, model, *args, **kwargs):
+        pass
+
+    def delay(self, ti):
+        self.Time = ti
+        self.drop_next()
+
+
+class IndexedHeapSchedulerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.Scheduler = get_scheduler('Test', 'IndexedHeap')
+        self.Atoms = [Waiter('A{}'.format(i), ti) for i, ti in enumerate([5, 3, 8, 3, 9])]
+        for atom in self.Atoms:
+            self.Scheduler.add_atom(atom)
+        self.Scheduler.reschedule_all()
+
+    def test_upcoming(self):
+        self.Scheduler.find_next()
+        self.assertEqual(self.Scheduler.OwnTime, 3)
+        self.assertSetEqual({req.Who for req in self.Scheduler.Requests}, {'A1', 'A3'})
+
+    def test_update_in_place(self):
+        self.Atoms[1].delay(10)
+        self.Atoms[3].delay(4)
+        self.Atoms[4].delay(1)
+        self.Scheduler.find_next()
+        self.assertEqual(self.Scheduler.OwnTime, 1)
+        self.assertSetEqual(set(self.Scheduler.Upcoming), {self.Atoms[4]})
+
+        for i, (t, atom) in enumerate(self.Scheduler.Heap):
+            self.assertIs(self.Scheduler.Slots[atom], i)
+            if i:
+                self.assertLessEqual(self.Scheduler.Heap[(i - 1) // 2][0], t)
+
+    def test_remove(self):
+        self.Scheduler.remove_atom(self.Atoms[1])
+        self.Scheduler.remove_atom(self.Atoms[3])
+        self.Scheduler.find_next()
+        self.assertEqual(self.Scheduler.OwnTime, 5)
+        self.assertEqual(len(self.Scheduler.Heap), 3)
+        self.assertNotIn(self.Atoms[1], self.Scheduler.Slots)
+
+
+class CalendarQueueSchedulerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.Scheduler = get_scheduler('Test', 'Calendar')
+        self.Atoms = [Waiter('A{}'.format(i), ti) for i, ti in enumerate([5, 3, 8, 3, float('inf')])]
+        for atom in self.Atoms:
+            self.Scheduler.add_atom(atom)
+        self.Scheduler.reschedule_all()
+
+    def test_upcoming(self):
+        self.Scheduler.find_next()
+        self.assertEqual(self.Scheduler.OwnTime, 3)
+        self.assertSetEqual({req.Who for req in self.Scheduler.Requests}, {'A1', 'A3'})
+
+    def test_reschedule(self):
+        self.Atoms[1].delay(100)
+        self.Atoms[3].delay(float('inf'))
+        self.Atoms[4].delay(4)
+        self.Scheduler.find_next()
+        self.assertEqual(self.Scheduler.OwnTime, 4)
+        self.assertSetEqual(set(self.Scheduler.Upcoming), {self.Atoms[4]})
+
+    def test_resize(self):
+        atoms = [Waiter('B{}'.format(i), 10 + i * 0.1) for i in range(100)]
+        for atom in atoms:
+            self.Scheduler.add_atom(atom)
+            self.Scheduler.await(atom)
+        self.Scheduler.find_next()
+        self.assertGreaterEqual(len(self.Scheduler.Buckets) * 2, self.Scheduler.Size)
+        self.assertEqual(self.Scheduler.OwnTime, 3)
+
+        for atom in atoms:
+            self.Scheduler.remove_atom(atom)
+        self.Scheduler.find_next()
+        self.assertLessEqual(len(self.Scheduler.Buckets), 2 * self.Scheduler.Size)
+        self.assertEqual(self.Scheduler.OwnTime, 3)
+
+
+class DirtyFlagTestCase(unittest.TestCase):
+    def setUp(self):
+        self.Upper = get_scheduler('Upper')
+        self.Middle = get_scheduler('Middle')
+        self.Lower = get_scheduler('Lower')
+        self.Middle.Parent = self.Upper
+        self.Lower.Parent = self.Middle
+
+        self.Atom = Waiter('A', 5)
+        self.Lower.add_atom(self.Atom)
+        self.Lower.reschedule_all()
+        self.Lower.find_next()
+        for sc in [self.Upper, self.Middle, self.Lower]:
+            sc.clean()
+            sc.DirtyLowers.clear()
+
+    def test_propagation(self):
+        self.Atom.delay(3)
+        self.assertTrue(self.Lower.Dirty)
+        self.assertSetEqual(self.Middle.DirtyLowers, {'Lower'})
+        self.assertSetEqual(self.Upper.DirtyLowers, {'Middle'})
+
+    def test_clean(self):
+        self.Lower.cycle_completed()
+        self.assertFalse(self.Lower.Dirty)
+        self.assertSetEqual(self.Upper.DirtyLowers, set())
+
+        self.Lower.execution_completed()
+        self.assertTrue(self.Lower.Dirty)
+        self.assertSetEqual(self.Middle.DirtyLowers, {'Lower'})
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,8 @@
 import unittest
+import numpy as np
 import complexism as cx
+import complexism.agentbased.statespace as ss
+from complexism.element import Event, Request
 import epidag as dag
 
 
@@ -41,10 +44,56 @@ pc = sm.generate()
 
 dc = cx.read_dbp_script(dsc)
 
+bn_age = cx.read_bn_script('''
+    PCore pAge {
+        beta = 0.4
+        Age ~ unif(20, 60)
+        rate = beta * Age / 40
+        Infect ~ exp(rate)
+        Recov ~ exp(0.5)
+        Die ~ exp(0.02)
+    }
+    ''')
+sm_age = dag.as_simulation_core(bn_age,
+                                hie={'city': ['agent'],
+                                     'agent': ['Age', 'rate', 'Infect', 'Recov', 'Die']})
+
 Name = 'M1'
 proto = pc.breed('proto_agent_{}'.format(Name), 'agent')
 
 
+def make_model(name, pop_class=cx.Population, seed=None, sim=sm):
+    pc_m = sim.generate(name)
+    model = cx.StSpAgentBasedModel(name, pc_m, pop_class(ss.StSpBreeder('Ag', 'agent', pc_m, dc)))
+    if seed is not None:
+        model.set_seed(seed)
+    return model
+
+
+def make_shocked_model(name, seed=1):
+    model = make_model(name, seed=seed)
+    ss.install_behaviour(model, 'FOI', 'FDShock', s_src='Inf', t_tar='Infect')
+    ss.install_behaviour(model, 'NI', 'StateTrack', s_src='Inf')
+    model.initialise(ti=0, y0=[{'n': 10, 'attributes': {'st': 'Sus'}}])
+    model.Scheduler.pop_disclosures()
+    return model
+
+
+def make_observed_model(name):
+    model = make_model(name)
+    ss.install_behaviour(model, 'FOI', 'FDShock', s_src='Inf', t_tar='Infect')
+    model.add_observing_state('Sus')
+    model.add_observing_state('Inf')
+    model.add_observing_transition('Infect')
+    return model
+
+
+def infect(model, n):
+    tr = model.DCore.Transitions['Infect']
+    ags = list(model.agents)[:n]
+    return [Request(Event(tr, 1, 'Infect'), ag.Name, model.Name) for ag in ags]
+
+
 class StateSpaceAgentTestCase(unittest.TestCase):
     def setUp(self):
         self.DC = dc.generate_model(Name, **pc.get_child_actors('agent'))
@@ -83,6 +132,500 @@ class StateSpaceAgentTestCase(unittest.TestCase):
         nxt = self.Agent.Next
         self.assertEqual(nxt.Time, 1000)
 
+    def test_transition_diff(self):
+        trs = self.DC.Transitions
+        rm, ad = self.DC.get_transition_diff(self.DC['Sus'], self.DC['Inf'])
+        self.assertTupleEqual(rm, (trs['Infect'],))
+        self.assertTupleEqual(ad, (trs['Recov'],))
+        self.assertIs(self.DC.get_transition_diff(self.DC['Sus'], self.DC['Inf'])[1], ad)
+
+        queue = ss.TransitionQueue()
+        queue[trs['Infect']], queue[trs['Die']] = 5, 3
+        self.assertTupleEqual(queue.peek(), (trs['Die'], 3))
+        queue[trs['Recov']] = 1
+        self.assertTupleEqual(queue.peek(), (trs['Recov'], 1))
+        del queue[trs['Recov']]
+        queue[trs['Die']] = 8
+        self.assertTupleEqual(queue.peek(), (trs['Infect'], 5))
+
+
+class ModifierSetTestCase(unittest.TestCase):
+    def setUp(self):
+        self.DC = dc.generate_model('Mods', **pc.get_child_actors('agent'))
+        self.Tr = self.DC.Transitions['Infect']
+
+    def test_compose(self):
+        mods = ss.ModifierSet()
+        mods['Rate'] = ss.LocRateModifier(self.Tr, 2)
+        mods['Glo'] = ss.GloRateModifier(self.Tr)
+        mods['Glo'].Value = 4
+        mods['Nerf'] = ss.NerfModifier(self.Tr)
+        mods['Die'] = ss.LocRateModifier(self.DC.Transitions['Die'], 10)
+        self.assertEqual(len(mods.on(self.Tr)), 3)
+        self.assertEqual(mods.modify(self.Tr, 8), 1)
+
+        mods['Nerf'].update(value=True)
+        self.assertNotIn(self.Tr, mods.Combined)
+        self.assertEqual(mods.modify(self.Tr, 8), float('inf'))
+        mods['Nerf'].update(value=False)
+        self.assertEqual(mods.modify(self.Tr, 8), 1)
+
+        mods['Glo'].Value = 1
+        self.assertEqual(mods.modify(self.Tr, 8), 4)
+        self.assertEqual(mods.modify(self.DC.Transitions['Die'], 10), 1)
+
+        mods['Buff'] = ss.BuffModifier(self.Tr)
+        self.assertEqual(mods.modify(self.Tr, 8), 0)
+
+    def test_scale(self):
+        mods = ss.ModifierSet()
+        mods['Rate'] = ss.LocRateModifier(self.Tr, 2)
+        mods['Nerf'] = ss.NerfModifier(self.Tr)
+        self.assertEqual(mods.scale(self.Tr), 2)
+        mods['Nerf'].update(value=True)
+        self.assertEqual(mods.scale(self.Tr), 0)
+        mods['Direct'] = ss.DirectModifier(self.Tr, 3)
+        self.assertIsNone(mods.scale(self.Tr))
+
+    def test_replace(self):
+        die = self.DC.Transitions['Die']
+        mods = ss.ModifierSet()
+        mods['Rate'] = ss.LocRateModifier(self.Tr, 2)
+        mods['Glo'] = ss.GloRateModifier(self.Tr)
+        mods['Glo'].Value = 1
+        mods['Nerf'] = ss.NerfModifier(self.Tr)
+        self.assertEqual(mods.modify(self.Tr, 8), 4)
+
+        mods['Rate'] = ss.DirectModifier(self.Tr, 3)
+        self.assertListEqual(mods.on(self.Tr), [mods['Rate'], mods['Glo'], mods['Nerf']])
+        self.assertEqual(mods.modify(self.Tr, 8), 3)
+
+        mods['Glo'] = ss.GloRateModifier(die)
+        mods['Glo'].Value = 5
+        self.assertListEqual(mods.on(self.Tr), [mods['Rate'], mods['Nerf']])
+        self.assertListEqual(mods.Shared[self.Tr], list())
+        self.assertListEqual(mods.Shared[die], [mods['Glo']])
+        self.assertEqual(mods.modify(die, 10), 2)
+        self.assertListEqual(list(mods.Mods), ['Rate', 'Nerf', 'Glo'])
+
+
+class BatchExecutionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.Sequential = make_shocked_model('Seq')
+        self.Batched = make_shocked_model('Bat')
+        self.Batched.set_batch_execution()
+
+    def test_batch(self):
+        for req in infect(self.Sequential, 4):
+            self.Sequential.do_request(req)
+        self.Batched.do_requests(infect(self.Batched, 4))
+
+        for model in [self.Sequential, self.Batched]:
+            self.assertEqual(model.Population.count(st='Inf'), 4)
+            self.assertEqual(model.Behaviours['NI'].Value, 4)
+            self.assertAlmostEqual(model.Behaviours['FOI'].Value, 0.4)
+
+        self.assertEqual(len(self.Sequential.Scheduler.Disclosures), 4)
+        self.assertEqual(len(self.Batched.Scheduler.Disclosures), 1)
+        self.assertEqual(self.Batched.Scheduler.Disclosures[0]['v1'], 4)
+
+
+class StateTallyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.Model = make_shocked_model('Tally')
+
+    def assertTally(self, pop):
+        for st in ['Sus', 'Inf', 'Rec', 'Alive', 'Dead']:
+            self.assertEqual(pop.count(st=st), pop.Eve.count(pop.Agents.values(), st=st))
+
+    def test_tally(self):
+        pop = self.Model.Population
+        self.assertEqual(pop.count(st='Alive'), 10)
+        self.Model.do_requests(infect(self.Model, 3))
+        self.assertEqual(pop.count(st='Inf'), 3)
+        self.assertTally(pop)
+
+        ag = next(ag for ag in self.Model.agents if 'Inf' in ag.State.Name)
+        self.Model.kill(ag.Name, 1)
+        self.Model.birth(1, 1, st='Inf')
+        self.assertEqual(pop.count(st='Inf'), 3)
+        self.assertEqual(pop.count(st='Alive'), 10)
+        self.assertTally(pop)
+
+
+class BulkBirthTestCase(unittest.TestCase):
+    def test_birth_many(self):
+        model = make_shocked_model('Bulk')
+        n_atoms = model.Scheduler.NumAtoms
+        ags = model.birth_many(5, 1, st='Inf')
+        self.assertEqual(len(ags), 5)
+        self.assertEqual(model.Scheduler.NumAtoms, n_atoms + 5)
+        self.assertEqual(model.Behaviours['NI'].Value, 5)
+        self.assertAlmostEqual(model.Behaviours['FOI'].Value, 5 / 15)
+        self.assertTrue(all('FOI' in ag.Modifiers.Mods for ag in model.agents))
+        self.assertTrue(all(ag.Next.Time > 1 for ag in ags))
+
+        dis = model.Scheduler.pop_disclosures()
+        self.assertEqual(dis[-1]['n'], 5)
+
+        model.Scheduler.find_next()
+        self.assertLess(model.Scheduler.OwnTime, float('inf'))
+
+    def test_kill_many(self):
+        model = make_shocked_model('Bulk')
+        ags = model.birth_many(4, 1, st='Inf', Sex='F', Age=30)
+        model.Scheduler.pop_disclosures()
+        n_atoms = model.Scheduler.NumAtoms
+
+        model.kill_many([ag.Name for ag in ags[:3]], 2)
+        self.assertEqual(len(model), 11)
+        self.assertEqual(model.Scheduler.NumAtoms, n_atoms - 3)
+        self.assertEqual(model.Population.count(st='Inf'), 1)
+        self.assertEqual(model.Behaviours['NI'].Value, 1)
+        self.assertAlmostEqual(model.Behaviours['FOI'].Value, 1 / 11)
+
+        dis = model.Scheduler.pop_disclosures()[-1]
+        self.assertEqual(dis['n'], 3)
+        self.assertDictEqual(dis['Sex'], {'F': 3})
+        self.assertEqual(dis['Age'], 30)
+
+
+class FlowCounterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.Model = make_shocked_model('Flow')
+        self.Model.add_observing_transition('Infect')
+        self.Model.add_observing_event('Die')
+
+    def observe(self):
+        flow = dict()
+        self.Model.Observer.update_dynamic_observations(self.Model, flow, 1)
+        return flow
+
+    def test_flow(self):
+        obs = self.Model.Observer
+        self.Model.do_requests(infect(self.Model, 3))
+        obs.record(next(iter(self.Model.agents)), 'Die', 1)
+        self.assertListEqual(obs.Records, list())
+        self.assertDictEqual(self.observe(), {'Infect': 3, 'Die': 1})
+        self.assertDictEqual(self.observe(), {'Infect': 0, 'Die': 0})
+
+    def test_records(self):
+        obs = self.Model.Observer
+        obs.keep_records()
+        self.Model.do_requests(infect(self.Model, 2))
+        self.assertEqual(len(obs.Records), 2)
+        self.assertEqual(obs.Records[0].Todo.Name, 'Infect')
+        self.assertEqual(obs.Records[0].Ag, 'Ag1')
+        self.assertDictEqual(self.observe(), {'Infect': 2, 'Die': 0})
+        self.assertListEqual(obs.Records, list())
+
+
+class RandomStreamTestCase(unittest.TestCase):
+    @staticmethod
+    def next_times(model):
+        model.initialise(ti=0, y0=[{'n': 10, 'attributes': {'st': 'Sus'}}])
+        return [ag.Next.Time for ag in model.agents]
+
+    def test_interleaved(self):
+        m1, m2, m3 = make_model('M1', seed=5), make_model('M2', seed=5), make_model('M3', seed=6)
+        ts1 = self.next_times(m1)
+        ts3 = self.next_times(m3)
+        ts2 = self.next_times(m2)
+        self.assertListEqual(ts1, ts2)
+        self.assertNotEqual(ts1, ts3)
+
+    def test_interleaved_parameters(self):
+        for shared in [False, True]:
+            with self.subTest(shared=shared):
+                ms = [make_model(name, seed=seed, sim=sm_age) for name, seed in [('M1', 5), ('M2', 5), ('M3', 6)]]
+                if shared:
+                    for m in ms:
+                        m.Population.Eve.share_parameters()
+
+                np.random.seed(11)
+                u = np.random.random()
+                np.random.seed(11)
+                ts1 = self.next_times(ms[0])
+                ts3 = self.next_times(ms[2])
+                ts2 = self.next_times(ms[1])
+                self.assertListEqual(ts1, ts2)
+                self.assertNotEqual(ts1, ts3)
+                ages = [[ag['Age'] for ag in m.agents] for m in ms]
+                self.assertListEqual(ages[0], ages[1])
+                self.assertNotEqual(ages[0], ages[2])
+                self.assertEqual(np.random.random(), u)
+
+    def test_global_state(self):
+        pc_m = sm.generate('Global')
+        np.random.seed(11)
+        u = np.random.random()
+        np.random.seed(11)
+        model = cx.StSpAgentBasedModel('Global', pc_m, cx.Population(ss.StSpBreeder('Ag', 'agent', pc_m, dc)))
+        self.assertIsNotNone(model.RNG)
+        self.assertEqual(np.random.random(), u)
+
+
+class AttributeIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.Model = make_observed_model('Idx')
+        self.Model.initialise(ti=0, y0=[{'n': 6, 'attributes': {'st': 'Sus', 'Sex': 'F', 'Age': 30}},
+                                        {'n': 4, 'attributes': {'st': 'Inf', 'Sex': 'M', 'Age': 40}}])
+        self.Pop = self.Model.Population
+        self.Pop.add_index('Sex')
+        self.Pop.add_index('Age', 'sorted')
+
+    def test_count(self):
+        pop = self.Pop
+        self.assertEqual(pop.count(Sex='F'), 6)
+        self.assertEqual(pop.count(Sex='M', st='Inf'), 4)
+        self.assertEqual(pop.count(Sex='M', Age=30), 0)
+        self.assertEqual(len(list(pop.first(3, Sex='M'))), 3)
+
+        ag = pop.select(Sex='M')[0]
+        ag['Sex'] = 'F'
+        ag['Age'] += 1
+        self.assertEqual(pop.count(Sex='F'), 7)
+        self.assertEqual(pop.Indices['Age'].count_range(31, 50), 4)
+        self.assertListEqual(pop.select(Sex='F', Age=41), [ag])
+
+        self.Model.kill(ag.Name, 1)
+        self.Model.birth(1, 1, st='Sus', Sex='M')
+        self.assertEqual(pop.count(Sex='F'), 6)
+        self.assertEqual(pop.count(Sex='M'), 4)
+        self.assertEqual(pop.Indices['Age'].count_range(), 9)
+
+
+class IntegerIdTestCase(unittest.TestCase):
+    def test_ids(self):
+        model = make_shocked_model('Ids')
+        pop = model.Population
+        ag = next(iter(model.agents))
+        self.assertIsInstance(ag.Id, int)
+        self.assertEqual(ag.Name, 'Ag{}'.format(ag.Id))
+        self.assertIs(pop[ag.Name], pop[ag.Id])
+
+        model.Scheduler.find_next()
+        self.assertTrue(all(isinstance(req.Who, int) for req in model.Scheduler.Requests))
+
+        model.kill(ag.Name, 1)
+        self.assertNotIn(ag.Id, pop.Agents)
+        self.assertEqual(len(model), 9)
+
+    def test_order(self):
+        model = make_model('Order')
+        ags = model.birth_many(12, 0, st='Sus')
+        self.assertListEqual(sorted(reversed(ags)), ags)
+        self.assertLess(ags[8], ags[9])
+
+    def test_log(self):
+        model = make_observed_model('Log')
+        log = cx.EventLog()
+        cx.simulate(model, [{'n': 20, 'attributes': {'st': 'Sus'}}, {'n': 2, 'attributes': {'st': 'Inf'}}],
+                    0, 3, 1, seed=7, log=log)
+        whos = set(log.to_data().Who)
+        self.assertTrue(whos)
+        self.assertTrue(all(w.startswith('Ag') for w in whos if w not in model.Behaviours))
+
+
+class SharedParametersTestCase(unittest.TestCase):
+    def setUp(self):
+        self.PC = sm_age.generate('Shared')
+
+    def test_lazy(self):
+        eve = ss.StSpBreeder('Ag', 'agent', self.PC, dc)
+        eve.share_parameters()
+        ags = eve.breed(3, st='Sus')
+        pars = ags[0].Parameters
+        self.assertIsNone(pars.Locus)
+        self.assertEqual(pars['beta'], 0.4)
+        self.assertAlmostEqual(pars['rate'], 0.4 * pars['Age'] / 40)
+        self.assertSetEqual(set(pars.Locus), {'Age', 'rate'})
+        self.assertIsNone(ags[1].Parameters.Locus)
+        self.assertDictEqual(self.PC.Children, dict())
+
+    def test_batch(self):
+        eve = ss.StSpBreeder('Ag', 'agent', self.PC, dc)
+        eve.share_parameters(batch=8)
+        ages = [ag['Age'] for ag in eve.breed(10, st='Sus')]
+        self.assertEqual(len(set(ages)), 10)
+        self.assertTrue(all(20 <= a <= 60 for a in ages))
+        self.assertEqual(len(eve.Shared.Buffers['Age'][1]), 6)
+
+    def test_simulation(self):
+        model = cx.StSpAgentBasedModel('Shared', self.PC, cx.Population(ss.StSpBreeder('Ag', 'agent', self.PC, dc)))
+        model.Population.Eve.share_parameters(batch=16)
+        ss.install_behaviour(model, 'FOI', 'FDShock', s_src='Inf', t_tar='Infect')
+        model.add_observing_state('Inf')
+        out = cx.simulate(model, [{'n': 20, 'attributes': {'st': 'Sus'}}, {'n': 2, 'attributes': {'st': 'Inf'}}],
+                          0, 5, 1, seed=7)
+        self.assertEqual(len(out), 6)
+
+
+class BatchSamplingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.DC = dc.generate_model('Sampling', **pc.get_child_actors('agent'))
+        self.DC.set_batch_sampling(16)
+        self.Tr = self.DC.Transitions['Recov']
+
+    def test_buffer(self):
+        rng0, rng1 = np.random.default_rng(3), np.random.default_rng(3)
+        bufs = dict()
+        ts = [self.Tr.rand(rng=rng0, buffers=bufs) for _ in range(20)]
+        self.assertTrue(all(t > 0 for t in ts))
+        self.assertEqual(len(bufs[self.Tr][1]), 12)
+        self.assertListEqual(ts[:16], self.Tr.rand_many(16, rng=rng1).tolist())
+
+        self.Tr.reserve(40, rng0, bufs)
+        self.assertEqual(len(bufs[self.Tr][1]), 40)
+
+    def test_initialise(self):
+        model = make_shocked_model('Sampling')
+        model.DCore.set_batch_sampling(64)
+        ags = model.birth_many(30, 1, st='Sus')
+        self.assertTrue(all(ag.Next.Time > 1 for ag in ags))
+        self.assertEqual(len(model.Population.Eve.Buffers[model.DCore.Transitions['Infect']][1]), 34)
+
+    def test_reseed(self):
+        m1, m2 = make_shocked_model('M1', seed=2), make_shocked_model('M2', seed=2)
+        for m in [m1, m2]:
+            m.DCore.set_batch_sampling(64)
+        ts1 = [ag.Next.Time for ag in m1.birth_many(5, 1, st='Sus')]
+        ts2 = [ag.Next.Time for ag in m2.birth_many(5, 1, st='Sus')]
+        self.assertListEqual(ts1, ts2)
+
+        self.assertEqual(len(m2.Population.Eve.Buffers), 2)
+        m1.set_seed(3)
+        self.assertDictEqual(m1.Population.Eve.Buffers, dict())
+        self.assertEqual(len(m2.Population.Eve.Buffers), 2)
+
+
+class LazyShockTestCase(unittest.TestCase):
+    def setUp(self):
+        self.Model = make_shocked_model('Lazy')
+        self.Model.set_lazy_shock('FOI')
+        self.Tr = self.Model.DCore.Transitions['Infect']
+
+    def test_hazard(self):
+        hz = self.Model.Hazards['FOI']
+        self.assertEqual(len(hz), 10)
+        self.assertTrue(all(self.Tr not in ag.Transitions for ag in self.Model.agents))
+        self.assertEqual(hz.Next.Time, float('inf'))
+
+        entries = {ag.Id: ag.Clocked[self.Tr][1] for ag in self.Model.agents}
+        for req in infect(self.Model, 2):
+            self.Model.do_request(req)
+        self.assertEqual(len(hz), 8)
+        self.assertAlmostEqual(hz.Modifier.Value, 0.2)
+        for ag in self.Model.Population.select(st='Sus'):
+            self.assertIs(ag.Clocked[self.Tr][1], entries[ag.Id])
+
+        nxt = hz.Next
+        self.assertLess(nxt.Time, float('inf'))
+        self.assertEqual(self.Model.Population[hz.Id].Clocked[self.Tr][1][0], min(e[0] for e in hz.Queue if e[2]))
+
+    def test_exponential(self):
+        bn_k = cx.read_bn_script(psc.replace('Infect ~ exp(beta)', 'Infect ~ k(2)'))
+        pc_k = dag.as_simulation_core(bn_k, hie={'city': ['agent'], 'agent': ['Recov', 'Die', 'Infect']}).generate('K')
+        model = cx.StSpAgentBasedModel('K', pc_k, cx.Population(ss.StSpBreeder('Ag', 'agent', pc_k, dc)))
+        ss.install_behaviour(model, 'FOI', 'FDShock', s_src='Inf', t_tar='Infect')
+        self.assertRaises(ValueError, model.set_lazy_shock, 'FOI')
+        self.assertDictEqual(model.Hazards, dict())
+
+    def test_switch(self):
+        self.Model.set_lazy_shock('FOI', on=False)
+        self.assertDictEqual(self.Model.Hazards, dict())
+        self.assertTrue(all(self.Tr in ag.Transitions for ag in self.Model.agents))
+        self.assertTrue(all(not ag.Clocked for ag in self.Model.agents))
+
+    def test_simulation(self):
+        model = make_shocked_model('LazySim')
+        model.set_lazy_shock('FOI')
+        model.add_observing_transition('Die')
+        model.add_observing_state('Dead')
+        out = cx.simulate(model, [{'n': 20, 'attributes': {'st': 'Sus'}}, {'n': 2, 'attributes': {'st': 'Inf'}}],
+                          0, 5, 1, seed=7)
+        self.assertEqual(len(out), 6)
+        self.assertEqual(out['Dead'].iloc[-1], out['Die'].sum())
+
+
+class GillespieTestCase(unittest.TestCase):
+    def setUp(self):
+        self.Model = make_shocked_model('Gil')
+        self.Model.set_aggregate_rates()
+        self.Engine = self.Model.Engine
+        self.Tr = self.Model.DCore.Transitions['Infect']
+
+    def test_obstacles(self):
+        bn_k = cx.read_bn_script(psc.replace('Recov ~ exp(0.5)', 'Recov ~ k(2)'))
+        pc_k = dag.as_simulation_core(bn_k, hie={'city': ['agent'], 'agent': ['Recov', 'Die', 'Infect']}).generate('K')
+        model = cx.StSpAgentBasedModel('K', pc_k, cx.Population(ss.StSpBreeder('Ag', 'agent', pc_k, dc)))
+        self.assertEqual(len(ss.find_obstacles(model)), 1)
+        self.assertRaises(ValueError, model.set_aggregate_rates)
+        self.assertListEqual(ss.find_obstacles(self.Model), list())
+
+    def test_groups(self):
+        self.assertEqual(len(self.Engine), 10)
+        self.assertEqual(len(self.Engine.Groups), 1)
+        self.assertTrue(all(not ag.Transitions for ag in self.Model.agents))
+
+        for req in infect(self.Model, 2):
+            self.Model.do_request(req)
+        self.assertEqual(len(self.Engine.Groups), 2)
+        self.assertAlmostEqual(self.Model.Behaviours['FOI'].ProtoModifier.Value, 0.2)
+
+        nxt = self.Engine.Next
+        self.assertIn(nxt.Todo.Name, ['Infect', 'Recov', 'Die'])
+        self.assertIn(self.Engine.Id, self.Model.Population.Agents)
+
+        mod = self.Model.Behaviours['FOI'].ProtoModifier
+        mod.Hazard.update(2, 0.5)
+        self.assertEqual(mod.Value, 0.5)
+        self.assertEqual(self.Engine.Time, 2)
+        self.assertTrue(all(ag.Modifiers.hazard_on(self.Tr) is self.Engine for ag in self.Model.agents))
+
+        self.Model.set_aggregate_rates(False)
+        self.assertEqual(len(self.Engine), 0)
+        self.assertTrue(all(ag.Transitions for ag in self.Model.agents))
+
+    def test_kill(self):
+        ag = next(iter(self.Model.agents))
+        self.Model.kill(ag.Id, 50)
+        self.assertEqual(len(self.Engine), 9)
+        self.assertGreaterEqual(self.Engine.Next.Time, 50)
+
+    def test_simulation(self):
+        model = make_shocked_model('GilSim')
+        model.set_aggregate_rates()
+        model.add_observing_transition('Die')
+        model.add_observing_state('Dead')
+        out = cx.simulate(model, [{'n': 20, 'attributes': {'st': 'Sus'}}, {'n': 2, 'attributes': {'st': 'Inf'}}],
+                          0, 5, 1, seed=7)
+        self.assertEqual(len(out), 6)
+        self.assertEqual(out['Dead'].iloc[-1], out['Die'].sum())
+
+    @staticmethod
+    def simulate(agg, seed):
+        model = make_observed_model('Ens')
+        model.add_observing_state('Dead')
+        model.add_observing_transition('Die')
+        if agg:
+            model.set_aggregate_rates()
+        return cx.simulate(model, [{'n': 95, 'attributes': {'st': 'Sus'}}, {'n': 5, 'attributes': {'st': 'Inf'}}],
+                           0, 4, 1, seed=seed)
+
+    def test_ensemble(self):
+        n = 10
+        per = [self.simulate(False, seed) for seed in range(n)]
+        agg = [self.simulate(True, seed) for seed in range(n)]
+        self.assertTrue(agg[0].equals(self.simulate(True, 0)))
+        self.assertListEqual(list(agg[0].columns), list(per[0].columns))
+        self.assertListEqual(list(agg[0].index), list(per[0].index))
+
+        for k in per[0].columns:
+            x0, x1 = np.array([o[k] for o in per]), np.array([o[k] for o in agg])
+            se = np.sqrt((x0.var(axis=0, ddof=1) + x1.var(axis=0, ddof=1)) / n)
+            self.assertTrue(np.all(np.abs(x0.mean(axis=0) - x1.mean(axis=0)) <= 4 * se + 1e-9), k)
+
 
 if __name__ == '__main__':
     unittest.main()